@@ -1,3 +1,36 @@
 from .calculator import DueDateCalculator  # noqa: F401
+from .config import CalendarConfig  # noqa: F401
+from .calculator import (  # noqa: F401
+    ENGINE_BITMAP,
+    ENGINE_DAILY,
+    ENGINE_WEEKLY,
+    OFF_HOURS_RAISE,
+    OFF_HOURS_ROLL_BACKWARD,
+    OFF_HOURS_ROLL_FORWARD,
+    REASON_NEGATIVE_TURNAROUND,
+    REASON_OFF_HOURS,
+    REASON_VALID,
+)
+from .holidays import CalendarUnion, HolidayCalendar  # noqa: F401
+from .icalendar import ICalendar  # noqa: F401
+from .layers import CalendarLayer  # noqa: F401
+from .registry import CalendarRegistry, RegistryStats  # noqa: F401
+from .rules import (  # noqa: F401
+    OBSERVED_MONDAY,
+    OBSERVED_NEAREST,
+    EasterOffset,
+    FixedDate,
+    HolidayRule,
+    NthWeekday,
+    RuleCalendar,
+)
+from .snapshot import CalendarSnapshot  # noqa: F401
+from .schedule import WorkSchedule  # noqa: F401
+from .watcher import (  # noqa: F401
+    CalendarVersion,
+    CalendarWatcher,
+    LiveCalculator,
+    Versioned,
+)
 
 __version__ = "1.0.0"
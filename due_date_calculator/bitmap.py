@@ -0,0 +1,346 @@
+import sys
+from array import array
+from bisect import bisect_right
+from datetime import MAXYEAR, datetime, timedelta
+from typing import Dict, List, Mapping, Optional, Sequence
+
+from .holidays import ClosureTable, HolidayCalendar, _bit_count, _first_day_of_year
+from .schedule import (
+    DATE_OVERFLOW_MESSAGE,
+    MICROSECONDS_PER_MINUTE,
+    MICROSECONDS_PER_SECOND,
+    WorkSchedule,
+)
+
+UNALIGNED_BITMAP_MESSAGE = "Bitmap engine requires working hours on whole minutes"
+
+MINUTES_PER_DAY = 24 * 60
+
+# Every year is stored as 366 days, so all bitmaps have the same size
+BYTES_PER_DAY = MINUTES_PER_DAY // 8
+BYTES_PER_YEAR = 366 * BYTES_PER_DAY
+
+# Words of 64 minutes per rank block
+WORDS_PER_BLOCK = 8
+
+
+class MinuteBitmap:
+    """
+    One bit per minute of a year, set for working minutes, with rank and
+    select support.
+
+    The bits are stored in 64-bit words, with a running count of set bits
+    before every block of WORDS_PER_BLOCK words. Rank (working minutes before
+    a minute) reads one block counter and popcounts at most a block of
+    words, select (the minute of the n-th working minute) bisects the block
+    counters and scans one block.
+    """
+
+    def __init__(self, data: bytes):
+        """
+        Args:
+            data (bytes): The bitmap, bit n of the data (least significant bit
+                first) stands for minute n of the year.
+        """
+
+        words = array("Q")
+        words.frombytes(data)
+        if sys.byteorder == "big":
+            words.byteswap()
+        self.words = words
+
+        blocks = array("q", [0])
+        count = 0
+        for index, word in enumerate(words, 1):
+            count += _bit_count(word)
+            if index % WORDS_PER_BLOCK == 0 or index == len(words):
+                blocks.append(count)
+        self.blocks = blocks
+
+    @classmethod
+    def from_words(cls, words: Sequence[int], blocks: Sequence[int]) -> "MinuteBitmap":
+        """
+        Create a bitmap from words and block counters built before, without
+        copying them, e.g. views of a memory-mapped snapshot.
+
+        Args:
+            words (Sequence[int]): The 64-bit words of the bitmap.
+            blocks (Sequence[int]): The running count of set bits before every
+                block of words, and the total count.
+
+        Returns:
+            MinuteBitmap: The bitmap.
+        """
+
+        bitmap = cls.__new__(cls)
+        bitmap.words = words
+        bitmap.blocks = blocks
+
+        return bitmap
+
+    @property
+    def nbytes(self) -> int:
+        """
+        int: The memory held by the words and block counters, in bytes.
+        """
+
+        return self.words.itemsize * len(self.words) + self.blocks.itemsize * len(
+            self.blocks
+        )
+
+    @property
+    def count(self) -> int:
+        """
+        int: The number of working minutes in the year.
+        """
+
+        return self.blocks[-1]
+
+    def rank(self, minute: int) -> int:
+        """
+        Count the working minutes before a minute of the year.
+
+        Args:
+            minute (int): The minute of the year.
+
+        Returns:
+            int: The number of set bits before minute.
+        """
+
+        block = minute // (64 * WORDS_PER_BLOCK)
+        word_index, bit = divmod(minute, 64)
+
+        words = self.words
+        rank = self.blocks[block]
+        for index in range(block * WORDS_PER_BLOCK, word_index):
+            rank += _bit_count(words[index])
+
+        return rank + _bit_count(words[word_index] & ((1 << bit) - 1))
+
+    def select(self, rank: int) -> int:
+        """
+        Find the working minute with the given number of working minutes
+        before it.
+
+        Args:
+            rank (int): The number of working minutes before the minute, from
+                0 to count - 1.
+
+        Returns:
+            int: The minute of the year.
+        """
+
+        block = bisect_right(self.blocks, rank) - 1
+        rank -= self.blocks[block]
+
+        index = block * WORDS_PER_BLOCK
+        word = self.words[index]
+        while _bit_count(word) <= rank:
+            rank -= _bit_count(word)
+            index += 1
+            word = self.words[index]
+
+        # Drop the lowest set bits before the one we are after
+        for _ in range(rank):
+            word &= word - 1
+
+        return index * 64 + (word & -word).bit_length() - 1
+
+    def is_set(self, minute: int) -> bool:
+        """
+        Check if a minute of the year is a working minute.
+
+        Args:
+            minute (int): The minute of the year.
+
+        Returns:
+            bool: Whether the bit of minute is set.
+        """
+
+        return bool(self.words[minute >> 6] >> (minute & 63) & 1)
+
+
+class BitmapEngine:
+    """
+    Converts between dates and times and work ordinals with one MinuteBitmap
+    per year.
+
+    The bitmaps are built on first use of a year from the schedule and the
+    holiday calendar, so any calendar shape costs the same: a rank to get a
+    work ordinal and a select to get back. The work ordinal of January 1st
+    comes from the calendar's closure table, so the ordinals are the same as
+    the default engine's.
+    """
+
+    def __init__(
+        self,
+        schedule: WorkSchedule,
+        holidays: Optional[HolidayCalendar] = None,
+        bitmaps: Optional[Mapping[int, MinuteBitmap]] = None,
+    ):
+        """
+        Args:
+            schedule (WorkSchedule): The working hours.
+            holidays (HolidayCalendar): The closures. Defaults to none.
+            bitmaps (Mapping[int, MinuteBitmap]): Bitmaps built before by
+                year, e.g. loaded from a snapshot. Other years are built on
+                first use.
+
+        Raises:
+            ValueError: If a working interval does not start and end on a
+                whole minute.
+        """
+
+        if holidays is None:
+            holidays = HolidayCalendar()
+
+        if any(
+            offset % MICROSECONDS_PER_MINUTE
+            for interval in schedule.intervals
+            for offset in interval
+        ):
+            raise ValueError(UNALIGNED_BITMAP_MESSAGE)
+
+        self.schedule = schedule
+        self.holidays = holidays
+        self._closures: ClosureTable = holidays.compile(schedule)
+        self._bitmaps: Dict[int, MinuteBitmap] = dict(bitmaps or {})
+        # Memory held by the bitmaps built so far, in bytes
+        self.nbytes = sum(bitmap.nbytes for bitmap in self._bitmaps.values())
+        holidays._add_dependent(self)
+
+        # Working minutes of the week, then of each weekday
+        week = 0
+        for start, end in schedule.intervals:
+            start //= MICROSECONDS_PER_MINUTE
+            end //= MICROSECONDS_PER_MINUTE
+            week |= ((1 << (end - start)) - 1) << start
+        day_mask = (1 << MINUTES_PER_DAY) - 1
+        self._days: List[int] = [
+            week >> (weekday * MINUTES_PER_DAY) & day_mask for weekday in range(7)
+        ]
+
+    def to_work_microseconds(self, date_time: datetime) -> int:
+        """
+        Convert a date and time into microseconds of working time since the epoch.
+
+        Args:
+            date_time (datetime): The date and time to convert.
+
+        Returns:
+            int: The number of working microseconds between the epoch and
+                date_time.
+        """
+
+        bitmap = self.get_bitmap(date_time.year)
+        minute = (
+            date_time.toordinal() - _first_day_of_year(date_time.year)
+        ) * MINUTES_PER_DAY + (date_time.hour * 60 + date_time.minute)
+
+        ordinal = (
+            self._closures.year_start(date_time.year)
+            + bitmap.rank(minute) * MICROSECONDS_PER_MINUTE
+        )
+        if bitmap.is_set(minute):
+            ordinal += (
+                date_time.second * MICROSECONDS_PER_SECOND + date_time.microsecond
+            )
+
+        return ordinal
+
+    def from_work_microseconds(
+        self, ordinal: int, prefer_end: bool = False
+    ) -> datetime:
+        """
+        Convert microseconds of working time since the epoch into a date and time.
+
+        Args:
+            ordinal (int): The number of working microseconds since the epoch,
+                not negative.
+            prefer_end (bool): Return the end of a working interval rather than
+                the start of the next one when the ordinal is on a boundary.
+
+        Returns:
+            datetime: The working instant the ordinal refers to.
+
+        Raises:
+            OverflowError: If the date and time would be after datetime.max.
+        """
+
+        year = self._closures.year_of(ordinal, prefer_end)
+        if year > MAXYEAR:
+            raise OverflowError(DATE_OVERFLOW_MESSAGE)
+        rank, remainder = divmod(
+            ordinal - self._closures.year_start(year), MICROSECONDS_PER_MINUTE
+        )
+        bitmap = self.get_bitmap(year)
+
+        if prefer_end and remainder == 0:
+            # The end of the previous working minute
+            minute = bitmap.select(rank - 1) + 1
+            if year == MAXYEAR and minute == MINUTES_PER_DAY * 365:
+                # Midnight at the end of datetime.max's day
+                raise OverflowError(DATE_OVERFLOW_MESSAGE)
+        else:
+            minute = bitmap.select(rank)
+
+        return datetime.fromordinal(_first_day_of_year(year)) + timedelta(
+            minutes=minute, microseconds=remainder
+        )
+
+    def invalidate(self) -> None:
+        """
+        Drop the bitmaps built so far, after the holiday calendar changed.
+        """
+
+        self._bitmaps.clear()
+        self.nbytes = 0
+
+    def get_bitmap(self, year: int) -> MinuteBitmap:
+        """
+        Get the working minutes of a year, building them on first use.
+
+        Args:
+            year (int): The year.
+
+        Returns:
+            MinuteBitmap: The bitmap of the year.
+
+        Raises:
+            ValueError: If a closure of the year does not start and end on a
+                whole minute.
+        """
+
+        bitmap = self._bitmaps.get(year)
+        if bitmap is not None:
+            return bitmap
+
+        holiday_year = self.holidays.get_year(year)
+        if any(
+            offset % MICROSECONDS_PER_MINUTE
+            for intervals in holiday_year.closures.values()
+            for interval in intervals
+            for offset in interval
+        ):
+            raise ValueError(UNALIGNED_BITMAP_MESSAGE)
+
+        first_day = _first_day_of_year(year)
+        days_in_year = _first_day_of_year(year + 1) - first_day
+
+        days = []
+        for day in range(days_in_year):
+            minutes = 0
+            if not holiday_year.mask >> day & 1:
+                minutes = self._days[(first_day + day - 1) % 7]
+                for start, end in holiday_year.closures.get(day, ()):
+                    start //= MICROSECONDS_PER_MINUTE
+                    end //= MICROSECONDS_PER_MINUTE
+                    minutes &= ~(((1 << (end - start)) - 1) << start)
+            days.append(minutes.to_bytes(BYTES_PER_DAY, "little"))
+
+        bitmap = self._bitmaps[year] = MinuteBitmap(
+            b"".join(days).ljust(BYTES_PER_YEAR, b"\0")
+        )
+        self.nbytes += bitmap.nbytes
+
+        return bitmap
@@ -1,151 +1,1068 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone, tzinfo
+from fractions import Fraction
+from typing import Iterable, List, Optional, Tuple, Union
+from zoneinfo import ZoneInfo
 import logging
 
+from .bitmap import BitmapEngine
+from .holidays import HolidayCalendar
+from .index import DayIndex, get_day_index
+from .schedule import (
+    DATE_OVERFLOW_MESSAGE,
+    MICROSECONDS_PER_DAY,
+    MICROSECONDS_PER_HOUR,
+    MICROSECONDS_PER_SECOND,
+    MICROSECONDS_PER_WEEK,
+    WorkSchedule,
+)
+from .timezones import get_zone_transitions
+
+OFF_HOURS_MESSAGE = "Submit date must be during working hours"
+NEGATIVE_TURNAROUND_MESSAGE = "Turnaround time cannot be negative"
+NEGATIVE_ORDINAL_MESSAGE = "Work ordinal cannot be negative"
+INVALID_POLICY_MESSAGE = (
+    "Off-hours policy must be one of: raise, roll_forward, roll_backward"
+)
+INVALID_ENGINE_MESSAGE = "Engine must be one of: weekly, bitmap, daily"
+DAY_INDEX_MISMATCH_MESSAGE = (
+    "Day index must be of the calculator's schedule, holidays and INDEX_YEARS"
+)
+BITMAP_ENGINE_MISMATCH_MESSAGE = (
+    "Bitmap engine must be of the calculator's schedule and holidays"
+)
+LENGTH_MISMATCH_MESSAGE = "Submit dates and turnaround times must have the same length"
+TIME_ZONE_MISMATCH_MESSAGE = (
+    "Calculators in different time zones must be moved to UTC to be intersected"
+)
+
+# What to do with submit dates outside working hours
+OFF_HOURS_RAISE = "raise"
+OFF_HOURS_ROLL_FORWARD = "roll_forward"
+OFF_HOURS_ROLL_BACKWARD = "roll_backward"
+OFF_HOURS_POLICIES = (OFF_HOURS_RAISE, OFF_HOURS_ROLL_FORWARD, OFF_HOURS_ROLL_BACKWARD)
+
+# How work ordinals are computed
+ENGINE_WEEKLY = "weekly"
+ENGINE_BITMAP = "bitmap"
+ENGINE_DAILY = "daily"
+ENGINES = (ENGINE_WEEKLY, ENGINE_BITMAP, ENGINE_DAILY)
+
+# Reason codes reported by validate_many
+REASON_VALID = 0
+REASON_OFF_HOURS = 1
+REASON_NEGATIVE_TURNAROUND = 2
+
+# A turnaround time is a number of working hours or a timedelta of working time
+Turnaround = Union[int, float, Fraction, timedelta]
+
+ONE_MICROSECOND = timedelta(microseconds=1)
+UNIX_EPOCH = datetime(1970, 1, 1)
+
 
 class DueDateCalculator:
     """
     A class that calculates due dates for issues in an issue tracking system.
 
     The calculator takes into account working hours (9AM to 5PM)
-    and working days (Monday to Friday).
+    and working days (Monday to Friday), or any other WorkSchedule given
+    at construction, and skips the closures of an optional HolidayCalendar.
+
+    Submit dates outside working hours are rejected by default. With the
+    roll_forward or roll_backward off-hours policy they are moved to the next
+    or previous working instant instead.
+
+    All calculations are done on integer microseconds of working time, so
+    results are exact for any turnaround time.
+
+    Naive dates and times are taken as wall time. Aware ones are converted to
+    the wall time of the calculator's time zone (their own time zone if it
+    has none) and results are returned in the time zone of the input. Working
+    hours apply to wall time, so a 9AM to 5PM day has eight working hours on
+    the days the clocks change too. Ambiguous results are the first of the
+    two instants, results in the gap of a forward transition are moved
+    forward by the length of the gap.
     """
 
-    # Working hours and days
+    # Working hours and days of the default schedule
     WORK_START_HOUR = 9
     WORK_END_HOUR = 17
     WORK_HOURS_PER_DAY = WORK_END_HOUR - WORK_START_HOUR
     # Monday (0) to Friday (4)
     WORKING_DAYS = range(0, 5)
+    # Years covered by the day index of the daily engine
+    INDEX_YEARS = range(1970, 2101)
+    # Batches at least this long go to the vectorized engine if numpy is
+    # installed, shorter ones are not worth converting to arrays
+    VECTORIZED_BATCH_SIZE = 64
+
+    def __init__(
+        self,
+        schedule: Optional[WorkSchedule] = None,
+        off_hours_policy: str = OFF_HOURS_RAISE,
+        holidays: Optional[HolidayCalendar] = None,
+        engine: str = ENGINE_WEEKLY,
+        time_zone: Union[tzinfo, str, None] = None,
+        day_index: Optional[DayIndex] = None,
+        bitmap_engine: Optional[BitmapEngine] = None,
+    ):
+        """
+        Args:
+            schedule (WorkSchedule): The working hours to use. Defaults to the
+                WORK_START_HOUR, WORK_END_HOUR and WORKING_DAYS class constants.
+            off_hours_policy (str): What to do with submit dates outside working
+                hours: raise (the default), roll_forward or roll_backward.
+            holidays (HolidayCalendar): Full-day and partial-day closures on
+                which no work is done. Defaults to none.
+            engine (str): How work ordinals are computed: weekly (the
+                default) looks instants up in the schedule's weekly table and
+                the calendar's closures, bitmap uses a bitmap of the working
+                minutes of each year, daily bisects an index of the work
+                ordinal at the start of every day of INDEX_YEARS.
+            time_zone (Union[tzinfo, str]): The time zone of the working hours,
+                as a tzinfo or an IANA key like Europe/Budapest. Defaults to
+                the time zone of each aware input.
+            day_index (DayIndex): A prebuilt index for the daily engine, e.g.
+                loaded from a cache. Defaults to the index shared by every
+                calculator with the same schedule and holidays.
+            bitmap_engine (BitmapEngine): A prebuilt engine for the bitmap
+                engine, e.g. with bitmaps loaded from a snapshot. Defaults to
+                building the bitmaps on first use.
+
+        Raises:
+            ValueError: If off_hours_policy or engine is not known, if the
+                bitmap engine is used with working hours that are not on whole
+                minutes, or if day_index or bitmap_engine is of other working
+                hours, holidays or years.
+        """
+
+        if off_hours_policy not in OFF_HOURS_POLICIES:
+            raise ValueError(INVALID_POLICY_MESSAGE)
+
+        if engine not in ENGINES:
+            raise ValueError(INVALID_ENGINE_MESSAGE)
+
+        if schedule is None:
+            schedule = WorkSchedule.from_hours(
+                self.WORK_START_HOUR, self.WORK_END_HOUR, self.WORKING_DAYS
+            )
+
+        self.schedule = schedule
+        self.off_hours_policy = off_hours_policy
+        self.holidays = holidays
+        self.engine = engine
+
+        if isinstance(time_zone, str):
+            time_zone = ZoneInfo(time_zone)
+        self.time_zone = time_zone
+
+        self._closures = None
+        if holidays is not None:
+            self._closures = holidays.compile(schedule)
+
+        # Around the clock without closures, working time is elapsed time
+        self._continuous = schedule.is_continuous and holidays is None
+
+        self._bitmap_engine = None
+        if engine == ENGINE_BITMAP:
+            self._bitmap_engine = self._check_bitmap_engine(bitmap_engine)
+
+        # The largest schedule ordinals that convert to a date and time no
+        # later than datetime.max, for the start and the end of an interval
+        weeks, offset = self._get_week_offset(datetime.max)
+        end_of_day = (offset // MICROSECONDS_PER_DAY + 1) * MICROSECONDS_PER_DAY
+        self._latest_ordinals = (
+            weeks * schedule.week_length + schedule.work_before(end_of_day) - 1,
+            weeks * schedule.week_length + schedule.work_before(offset),
+        )
+
+        self._day_index = None
+        if engine == ENGINE_DAILY:
+            self._day_index = self._check_day_index(day_index)
+
+        # A calculator of the same calendar without the time zone, built on
+        # first use by _get_wall_calculator
+        self._wall_calculator: Optional[DueDateCalculator] = None
+
+        self._off_hours_message = "{} ({})".format(
+            OFF_HOURS_MESSAGE, schedule.describe()
+        )
+
+    @property
+    def day_index(self) -> Optional[DayIndex]:
+        """
+        Optional[DayIndex]: The day index of the daily engine, or None for
+            the other engines.
+        """
+
+        return self._day_index
+
+    @property
+    def bitmap_engine(self) -> Optional[BitmapEngine]:
+        """
+        Optional[BitmapEngine]: The engine of the bitmap engine, or None for
+            the other engines.
+        """
+
+        return self._bitmap_engine
+
+    @property
+    def memory_parts(self) -> Tuple:
+        """
+        Tuple: The compiled holidays, closure table, bitmap engine and day
+            index this calculator holds, whichever it has. Each has an nbytes
+            attribute and may be shared with other calculators.
+        """
+
+        parts = (self.holidays, self._closures, self._bitmap_engine, self._day_index)
+
+        return tuple(part for part in parts if part is not None)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        int: The approximate memory held by the memory_parts of this
+            calculator, in bytes. Parts shared with other calculators are
+            counted in full.
+        """
+
+        return sum(part.nbytes for part in self.memory_parts)
 
     def calculate_due_date(
-        self, submit_date: datetime, turnaround_hours: int
+        self, submit_date: datetime, turnaround_hours: Turnaround
     ) -> datetime:
         """
         Calculate the due date for an issue based on the submit date and turnaround time.
 
         Args:
             submit_date (datetime): The date and time when the issue was submitted.
-            turnaround_hours (int): The turnaround time in working hours.
+            turnaround_hours (Turnaround): The turnaround time in working hours
+                (int, float or Fraction) or as a timedelta of working time.
 
         Returns:
             datetime: The date and time when the issue is due to be resolved.
 
         Raises:
-            ValueError: If the submit_date is not during working hours or
-                    if turnaround_hours is negative.
+            ValueError: If the submit_date is not during working hours (unless
+                    the off-hours policy rolls it) or if turnaround_hours is
+                    negative.
+            OverflowError: If the due date would be after datetime.max.
         """
 
+        zone = submit_date.tzinfo
+        submit_date = self._to_local(submit_date)
+
         # Validate inputs
         if not self._is_during_working_hours(submit_date):
-            raise ValueError(
-                "Submit date must be during working hours (9AM to 5PM, Monday to Friday)"
+            if self.off_hours_policy == OFF_HOURS_RAISE:
+                raise ValueError(self._off_hours_message)
+            submit_date = self._roll_to_working_hours(submit_date)
+
+        turnaround = self._to_microseconds(turnaround_hours)
+
+        if turnaround < 0:
+            raise ValueError(NEGATIVE_TURNAROUND_MESSAGE)
+
+        return self._from_local(self._get_due_date(submit_date, turnaround), zone)
+
+    def calculate_due_dates(
+        self, requests: Iterable[Tuple[datetime, Turnaround]]
+    ) -> List[Union[datetime, ValueError, OverflowError]]:
+        """
+        Calculate due dates for many issues at once.
+
+        Produces the same due dates as calculate_due_date, but invalid items
+        are reported instead of raised. Batches of VECTORIZED_BATCH_SIZE or
+        more requests are computed with array operations when numpy is
+        installed, so the per-item work is only the conversion of inputs and
+        results. Smaller batches share the setup of one loop.
+
+        Args:
+            requests (Iterable[Tuple[datetime, Turnaround]]): Pairs of submit
+                date and turnaround time, as a sequence or an iterator.
+
+        Returns:
+            List[Union[datetime, ValueError, OverflowError]]: One entry per
+                request in input order, either the due date or the error
+                describing why the request was rejected.
+        """
+
+        requests = list(requests)
+        if len(requests) >= self.VECTORIZED_BATCH_SIZE:
+            try:
+                return self._calculate_due_dates_vectorized(requests)
+            except ImportError:
+                pass
+
+        return self._calculate_due_dates_each(requests)
+
+    def _calculate_due_dates_vectorized(
+        self, requests: List[Tuple[datetime, Turnaround]]
+    ) -> List[Union[datetime, ValueError, OverflowError]]:
+        """
+        Calculate due dates for a batch with the vectorized engine.
+
+        Inputs are converted to wall time and microseconds one by one, the due
+        dates and the reasons of rejected requests are computed on arrays.
+        Due dates past datetime.max are computed again by calculate_due_date
+        for its error.
+
+        Args:
+            requests (List[Tuple[datetime, Turnaround]]): Pairs of submit date
+                and turnaround time.
+
+        Returns:
+            List[Union[datetime, ValueError, OverflowError]]: One entry per
+                request, see calculate_due_dates.
+
+        Raises:
+            ImportError: If numpy is not installed.
+        """
+
+        import numpy as np
+
+        from . import vectorized
+
+        to_local = self._to_local
+        to_microseconds = self._to_microseconds
+
+        submit_dates = np.array(
+            [
+                (to_local(submit_date) - UNIX_EPOCH) // ONE_MICROSECOND
+                for submit_date, _ in requests
+            ],
+            dtype=np.int64,
+        ).view("datetime64[us]")
+        turnarounds = [
+            to_microseconds(turnaround_hours) for _, turnaround_hours in requests
+        ]
+        try:
+            turnarounds = np.array(turnarounds, dtype=np.int64)
+        except OverflowError:
+            # Too long for int64, clip them like the engine does
+            limit = vectorized.MAX_TURNAROUND_MICROSECONDS
+            turnarounds = np.array(
+                [min(max(turnaround, -limit), limit) for turnaround in turnarounds],
+                dtype=np.int64,
             )
+        turnarounds = turnarounds.view("timedelta64[us]")
 
-        if turnaround_hours < 0:
-            raise ValueError("Turnaround time cannot be negative")
+        # The submit dates are wall times already
+        calculator = self._get_wall_calculator()
+        due_dates = vectorized.calculate_due_dates(
+            submit_dates, turnarounds, calculator
+        )
+        reasons = vectorized.validate_many(submit_dates, turnarounds, calculator)
 
-        if turnaround_hours == 0:
-            return submit_date
+        results = []
+        append = results.append
+        from_local = self._from_local
+        for (submit_date, turnaround_hours), due_date, reason in zip(
+            requests, due_dates.astype(object).tolist(), reasons.tolist()
+        ):
+            if due_date is not None:
+                append(from_local(due_date, submit_date.tzinfo))
+            elif reason == REASON_OFF_HOURS:
+                append(ValueError(self._off_hours_message))
+            elif reason == REASON_NEGATIVE_TURNAROUND:
+                append(ValueError(NEGATIVE_TURNAROUND_MESSAGE))
+            else:
+                try:
+                    append(self.calculate_due_date(submit_date, turnaround_hours))
+                except OverflowError as error:
+                    append(error)
+
+        return results
+
+    def _get_wall_calculator(self) -> "DueDateCalculator":
+        """
+        Get a calculator that takes naive dates and times as wall time of
+        this calculator's time zone, for the vectorized engine.
+
+        Returns:
+            DueDateCalculator: This calculator without a time zone, or this
+                calculator itself if it has none. Built once and kept.
+        """
+
+        if self.time_zone is None:
+            return self
 
-        # Calculate due date
-        current_date = submit_date
-        remaining_hours = turnaround_hours
-
-        # Handle remaining hours on the first day
-        hours_left_today = self._get_remaining_work_hours_in_day(current_date)
-
-        if remaining_hours <= hours_left_today:
-            # If we can complete within today's remaining work hours
-            return current_date + timedelta(hours=remaining_hours)
-
-        # Use up today's remaining hours
-        remaining_hours -= hours_left_today
-
-        # Move to start of next working day
-        current_date = self._get_next_working_day(current_date)
-
-        # Handle full working days
-        while remaining_hours >= self.WORK_HOURS_PER_DAY:
-            remaining_hours -= self.WORK_HOURS_PER_DAY
-            current_date = self._get_next_working_day(current_date)
-
-        # Handle remaining hours on the last day
-        if remaining_hours > 0:
-            # Start from work start hour
-            current_date = datetime(
-                current_date.year,
-                current_date.month,
-                current_date.day,
-                self.WORK_START_HOUR,
-                0,
-                0,
+        if self._wall_calculator is None:
+            self._wall_calculator = DueDateCalculator(
+                self.schedule, self.off_hours_policy, self.holidays
             )
-            current_date += timedelta(hours=remaining_hours)
 
-        return current_date
+        return self._wall_calculator
 
-    def _is_during_working_hours(self, date_time: datetime) -> bool:
+    def _calculate_due_dates_each(
+        self, requests: List[Tuple[datetime, Turnaround]]
+    ) -> List[Union[datetime, ValueError, OverflowError]]:
         """
-        Check if the given date and time is during working hours.
+        Calculate due dates for a batch one request at a time, sharing the
+        bound methods and settings of the calculator.
+
+        Args:
+            requests (List[Tuple[datetime, Turnaround]]): Pairs of submit date
+                and turnaround time.
+
+        Returns:
+            List[Union[datetime, ValueError, OverflowError]]: One entry per
+                request, see calculate_due_dates.
+        """
+
+        is_during_working_hours = self._is_during_working_hours
+        roll_to_working_hours = self._roll_to_working_hours
+        to_microseconds = self._to_microseconds
+        get_due_date = self._get_due_date
+        to_local = self._to_local
+        from_local = self._from_local
+        rejects_off_hours = self.off_hours_policy == OFF_HOURS_RAISE
+        off_hours_message = self._off_hours_message
+
+        results = []
+        append = results.append
+
+        for submit_date, turnaround_hours in requests:
+            zone = submit_date.tzinfo
+            submit_date = to_local(submit_date)
+
+            if not is_during_working_hours(submit_date):
+                if rejects_off_hours:
+                    append(ValueError(off_hours_message))
+                    continue
+                submit_date = roll_to_working_hours(submit_date)
 
-        Working hours are defined as 9AM to 5PM, Monday to Friday.
+            turnaround = to_microseconds(turnaround_hours)
+
+            if turnaround < 0:
+                append(ValueError(NEGATIVE_TURNAROUND_MESSAGE))
+                continue
+
+            try:
+                append(from_local(get_due_date(submit_date, turnaround), zone))
+            except OverflowError as error:
+                append(error)
+
+        return results
+
+    def validate_many(
+        self, submit_dates: Iterable[datetime], turnarounds: Iterable[Turnaround]
+    ) -> bytearray:
+        """
+        Check many submit dates and turnaround times without raising.
+
+        Uses the same rules as calculate_due_date, so rows can be filtered in
+        one pass before they are handed to a batch or vectorized engine. Submit
+        dates outside working hours are only reported when the off-hours policy
+        is raise.
 
         Args:
-            date_time (datetime): The date and time to check.
+            submit_dates (Iterable[datetime]): The submit dates to check.
+            turnarounds (Iterable[Turnaround]): The matching turnaround times.
 
         Returns:
-            datetime: The start of the next working day at 9 AM.
+            bytearray: One reason code per row in input order: REASON_VALID,
+                REASON_OFF_HOURS or REASON_NEGATIVE_TURNAROUND.
+
+        Raises:
+            ValueError: If there are not as many turnaround times as submit
+                dates.
         """
 
-        is_working_day = date_time.weekday() in self.WORKING_DAYS
-        is_working_hour = (
-            self.WORK_START_HOUR <= date_time.hour < self.WORK_END_HOUR
-        ) or (date_time.hour == self.WORK_END_HOUR and date_time.minute == 0)
+        submit_dates = list(submit_dates)
+        turnarounds = list(turnarounds)
+        if len(submit_dates) != len(turnarounds):
+            raise ValueError(LENGTH_MISMATCH_MESSAGE)
 
-        return is_working_day and is_working_hour
+        is_during_working_hours = self._is_during_working_hours
+        to_microseconds = self._to_microseconds
+        to_local = self._to_local
+        rejects_off_hours = self.off_hours_policy == OFF_HOURS_RAISE
 
-    def _get_remaining_work_hours_in_day(self, date_time: datetime) -> float:
+        return bytearray(
+            (
+                REASON_OFF_HOURS
+                if rejects_off_hours
+                and not is_during_working_hours(to_local(submit_date))
+                else (
+                    REASON_NEGATIVE_TURNAROUND
+                    if to_microseconds(turnaround_hours) < 0
+                    else REASON_VALID
+                )
+            )
+            for submit_date, turnaround_hours in zip(submit_dates, turnarounds)
+        )
+
+    def to_work_ordinal(self, date_time: datetime) -> int:
         """
-        Get the remaining work hours in the given day.
+        Convert a date and time into a count of working seconds since the epoch.
+
+        The epoch is the start of Monday 0001-01-01, so the week structure of
+        the ordinal lines up with the calendar. Instants outside working hours
+        map to the ordinal of the next working instant, which keeps the mapping
+        monotonic. Sub-second precision is dropped.
 
         Args:
-            date_time (datetime): The date and time to check.
+            date_time (datetime): The date and time to convert.
 
         Returns:
-            float: The remaining work hours in the day.
+            int: The number of working seconds between the epoch and date_time.
         """
 
         return (
-            self.WORK_END_HOUR
-            - date_time.hour
-            - (date_time.minute / 60)
-            - (date_time.second / 3600)
+            self._to_work_microseconds(self._to_local(date_time))
+            // MICROSECONDS_PER_SECOND
+        )
+
+    def from_work_ordinal(self, ordinal: int) -> datetime:
+        """
+        Convert a count of working seconds since the epoch back into a date and time.
+
+        This is the inverse of to_work_ordinal for instants during working hours.
+        An ordinal that falls exactly on the end of a working day maps to the
+        start of the next working day.
+
+        Args:
+            ordinal (int): The number of working seconds since the epoch.
+
+        Returns:
+            datetime: The working instant the ordinal refers to, in the
+                calculator's time zone if it has one.
+
+        Raises:
+            ValueError: If ordinal is negative.
+            OverflowError: If the date and time would be after datetime.max.
+        """
+
+        return self._from_local(
+            self._from_work_microseconds(ordinal * MICROSECONDS_PER_SECOND),
+            self.time_zone,
+        )
+
+    def working_time_between(self, start: datetime, end: datetime) -> timedelta:
+        """
+        Calculate the working time elapsed between two dates and times.
+
+        Only time during working hours counts. Instants outside working hours
+        count from the next working instant.
+
+        Args:
+            start (datetime): The date and time to measure from.
+            end (datetime): The date and time to measure to.
+
+        Returns:
+            timedelta: The working time between start and end, negative if end
+                is before start.
+        """
+
+        return timedelta(
+            microseconds=self._to_work_microseconds(self._to_local(end))
+            - self._to_work_microseconds(self._to_local(start))
+        )
+
+    def latest_submit_for(
+        self, due_date: datetime, turnaround_hours: Turnaround
+    ) -> datetime:
+        """
+        Calculate the latest submit date that still meets the given due date.
+
+        This is the inverse of calculate_due_date: the result is the latest
+        instant during working hours from which the turnaround time ends no
+        later than due_date.
+
+        Args:
+            due_date (datetime): The date and time the issue must be resolved by.
+            turnaround_hours (Turnaround): The turnaround time in working hours
+                (int, float or Fraction) or as a timedelta of working time.
+
+        Returns:
+            datetime: The latest date and time the issue can be submitted.
+
+        Raises:
+            ValueError: If turnaround_hours is negative or the submit date would
+                    fall before the work ordinal epoch.
+        """
+
+        turnaround = self._to_microseconds(turnaround_hours)
+
+        if turnaround < 0:
+            raise ValueError(NEGATIVE_TURNAROUND_MESSAGE)
+
+        return self._from_local(
+            self._get_latest_submit(self._to_local(due_date), turnaround),
+            due_date.tzinfo,
+        )
+
+    def latest_submits_for(
+        self, requests: Iterable[Tuple[datetime, Turnaround]]
+    ) -> List[Union[datetime, ValueError]]:
+        """
+        Calculate the latest submit dates for many due dates at once.
+
+        Args:
+            requests (Iterable[Tuple[datetime, Turnaround]]): Pairs of due date
+                and turnaround time, as a sequence or an iterator.
+
+        Returns:
+            List[Union[datetime, ValueError]]: One entry per request in input
+                order, either the latest submit date or the ValueError
+                describing why the request was rejected.
+        """
+
+        to_microseconds = self._to_microseconds
+        to_work_microseconds = self._to_work_microseconds
+        get_latest_submit = self._get_latest_submit
+        to_local = self._to_local
+        from_local = self._from_local
+
+        results = []
+        append = results.append
+
+        for due_date, turnaround_hours in requests:
+            zone = due_date.tzinfo
+            due_date = to_local(due_date)
+            turnaround = to_microseconds(turnaround_hours)
+
+            if turnaround < 0:
+                append(ValueError(NEGATIVE_TURNAROUND_MESSAGE))
+                continue
+
+            if to_work_microseconds(due_date) < turnaround:
+                append(ValueError(NEGATIVE_ORDINAL_MESSAGE))
+                continue
+
+            append(from_local(get_latest_submit(due_date, turnaround), zone))
+
+        return results
+
+    def intersection(self, other: "DueDateCalculator") -> "DueDateCalculator":
+        """
+        Make a calculator that only counts time when both calculators do, e.g.
+        our working hours and a customer's.
+
+        The schedules are intersected and the holiday calendars combined once,
+        so the result computes due dates and working time with a single merged
+        table instead of evaluating both calendars at every step. It keeps
+        this calculator's off-hours policy and engine.
+
+        Args:
+            other (DueDateCalculator): The other calculator.
+
+        Returns:
+            DueDateCalculator: The calculator of the common working time.
+
+        Raises:
+            ValueError: If the calculators are in different time zones.
+        """
+
+        time_zone = self.time_zone
+        if time_zone is None:
+            time_zone = other.time_zone
+        elif other.time_zone is not None and other.time_zone != time_zone:
+            raise ValueError(TIME_ZONE_MISMATCH_MESSAGE)
+
+        holidays = self.holidays
+        if holidays is None:
+            holidays = other.holidays
+        elif other.holidays is not None and other.holidays is not holidays:
+            holidays = holidays | other.holidays
+
+        return type(self)(
+            self.schedule & other.schedule,
+            self.off_hours_policy,
+            holidays,
+            self.engine,
+            time_zone,
         )
 
-    def _get_next_working_day(self, date_time: datetime) -> datetime:
+    def _check_bitmap_engine(
+        self, bitmap_engine: Optional[BitmapEngine]
+    ) -> BitmapEngine:
+        """
+        Get the engine of the bitmap engine, checking a prebuilt one.
+
+        Args:
+            bitmap_engine (BitmapEngine): A prebuilt engine, or None.
+
+        Returns:
+            BitmapEngine: The prebuilt engine, or a new one.
+
+        Raises:
+            ValueError: If the working hours are not on whole minutes, or
+                bitmap_engine is of other working hours or holidays.
+        """
+
+        if bitmap_engine is None:
+            return BitmapEngine(self.schedule, self.holidays)
+
+        if (
+            bitmap_engine.schedule != self.schedule
+            or self.holidays is not None
+            and bitmap_engine.holidays is not self.holidays
+        ):
+            raise ValueError(BITMAP_ENGINE_MISMATCH_MESSAGE)
+
+        return bitmap_engine
+
+    def _check_day_index(self, day_index: Optional[DayIndex]) -> DayIndex:
         """
-        Get the start of the next working day from the given date.
+        Get the index of the daily engine, checking a prebuilt one.
 
         Args:
-            date_time (datetime): The date and time to start from.
+            day_index (DayIndex): A prebuilt index, or None.
 
         Returns:
-            datetime: The start of the next working day at 9 AM.
+            DayIndex: The prebuilt index, or the shared one.
+
+        Raises:
+            ValueError: If day_index is of other working hours, holidays or
+                years.
         """
 
-        # Start with the next calendar day
-        next_day = date_time + timedelta(days=1)
+        if day_index is None:
+            return get_day_index(self.schedule, self.holidays, self.INDEX_YEARS)
+
+        if (
+            day_index.schedule != self.schedule
+            or self.holidays is not None
+            and day_index.holidays is not self.holidays
+            or day_index.years != self.INDEX_YEARS
+        ):
+            raise ValueError(DAY_INDEX_MISMATCH_MESSAGE)
+
+        return day_index
+
+    def _get_due_date(self, submit_date: datetime, turnaround: int) -> datetime:
+        """
+        Get the due date for a validated submit date and turnaround time.
+
+        Args:
+            submit_date (datetime): The date and time when the issue was submitted.
+            turnaround (int): The turnaround time in microseconds of working time.
+
+        Returns:
+            datetime: The date and time when the issue is due to be resolved.
+        """
+
+        if turnaround == 0:
+            return submit_date
+
+        if self._continuous:
+            try:
+                return submit_date + timedelta(microseconds=turnaround)
+            except OverflowError:
+                raise OverflowError(DATE_OVERFLOW_MESSAGE) from None
+
+        # A turnaround that uses up exactly today's remaining work hours is due
+        # at the end of today rather than at the start of the next working day
+        prefer_end = turnaround <= self._get_remaining_work_time_in_day(submit_date)
+
+        return self._from_work_microseconds(
+            self._to_work_microseconds(submit_date) + turnaround, prefer_end
+        )
+
+    def _get_latest_submit(self, due_date: datetime, turnaround: int) -> datetime:
+        """
+        Get the latest submit date for a due date and a validated turnaround time.
+
+        The work ordinal of a day boundary stands for both the end of one
+        working day and the start of the next. When the due date lies between
+        the two, the submit date is moved back so the turnaround ends before it.
+        A zero turnaround may end at the end of the working day itself, or
+        just before a closure, as a closure's start is not a working instant.
+
+        Args:
+            due_date (datetime): The date and time the issue must be resolved by.
+            turnaround (int): The turnaround time in microseconds of working time.
+
+        Returns:
+            datetime: The latest date and time the issue can be submitted.
+        """
+
+        ordinal = self._to_work_microseconds(due_date) - turnaround
+
+        try:
+            submit_date = self._from_work_microseconds(ordinal)
+            if self._get_due_date(submit_date, turnaround) <= due_date:
+                return submit_date
+        except OverflowError:
+            # The start of the next working day is after datetime.max
+            pass
+
+        submit_date = self._from_work_microseconds(ordinal - 1)
+        if turnaround == 0:
+            # The end of the previous working day itself is still in time, but
+            # not the start of a closure
+            end = submit_date + ONE_MICROSECOND
+            if self._is_during_working_hours(end):
+                return end
+
+        return submit_date
+
+    def _to_work_microseconds(self, date_time: datetime) -> int:
+        """
+        Convert a date and time into microseconds of working time since the epoch.
+
+        Args:
+            date_time (datetime): The date and time to convert.
+
+        Returns:
+            int: The number of working microseconds between the epoch and
+                date_time.
+        """
+
+        if self._bitmap_engine is not None:
+            return self._bitmap_engine.to_work_microseconds(date_time)
+
+        if self._day_index is not None:
+            ordinal = self._day_index.to_work_microseconds(date_time)
+            if ordinal is not None:
+                return ordinal
+
+        weeks, offset = self._get_week_offset(date_time)
+
+        return self._get_open_ordinal(date_time.year, weeks, offset)
+
+    def _get_open_ordinal(self, year: int, weeks: int, offset: int) -> int:
+        """
+        Get the work ordinal of an offset in a week from the weekly table and
+        the closures of the holiday calendar.
+
+        Args:
+            year (int): The year the instant is in. Midnight at the end of
+                December 31st can be counted in either year.
+            weeks (int): The number of weeks since the epoch.
+            offset (int): Microseconds since Monday midnight of the week, up to
+                the end of the week.
+
+        Returns:
+            int: The number of working microseconds since the epoch.
+        """
+
+        ordinal = weeks * self.schedule.week_length + self.schedule.work_before(offset)
+
+        if self._closures is not None:
+            ordinal -= self._closures.lost_before(year, ordinal)
+
+        return ordinal
+
+    def _from_work_microseconds(
+        self, ordinal: int, prefer_end: bool = False
+    ) -> datetime:
+        """
+        Convert microseconds of working time since the epoch into a date and time.
+
+        Args:
+            ordinal (int): The number of working microseconds since the epoch.
+            prefer_end (bool): Return the end of a working interval rather than
+                the start of the next one when the ordinal is on a boundary.
+
+        Returns:
+            datetime: The working instant the ordinal refers to.
+
+        Raises:
+            ValueError: If ordinal is negative.
+            OverflowError: If the date and time would be after datetime.max.
+        """
+
+        if ordinal < 0:
+            raise ValueError(NEGATIVE_ORDINAL_MESSAGE)
+
+        if self._bitmap_engine is not None:
+            return self._bitmap_engine.from_work_microseconds(ordinal, prefer_end)
+
+        if self._day_index is not None:
+            date_time = self._day_index.from_work_microseconds(ordinal, prefer_end)
+            if date_time is not None:
+                return date_time
+
+        if self._closures is not None:
+            ordinal = self._closures.to_schedule_ordinal(ordinal, prefer_end)
+
+        if ordinal > self._latest_ordinals[prefer_end]:
+            raise OverflowError(DATE_OVERFLOW_MESSAGE)
+
+        weeks, work = divmod(ordinal, self.schedule.week_length)
+        if prefer_end and work == 0 and weeks > 0:
+            # The boundary is the end of the last interval of the previous week
+            weeks -= 1
+            work = self.schedule.week_length
 
-        # Reset to 9 AM
-        next_day = datetime(
-            next_day.year, next_day.month, next_day.day, self.WORK_START_HOUR, 0, 0
+        return datetime.fromordinal(1 + 7 * weeks) + timedelta(
+            microseconds=self.schedule.offset_of(work, prefer_end)
         )
 
-        # If it's a weekend, move to next week (Monday)
-        while next_day.weekday() not in self.WORKING_DAYS:
-            next_day += timedelta(days=1)
+    def _to_local(self, date_time: datetime) -> datetime:
+        """
+        Convert a date and time into naive wall time of the calculator's time
+        zone.
+
+        Args:
+            date_time (datetime): The date and time to convert. Naive dates
+                and times are already wall time.
+
+        Returns:
+            datetime: The naive wall time.
+        """
+
+        if date_time.tzinfo is None:
+            return date_time
+
+        zone = self.time_zone or date_time.tzinfo
+        transitions = get_zone_transitions(zone)
+        if date_time.tzinfo is zone:
+            utc = transitions.to_utc(date_time.replace(tzinfo=None), date_time.fold)
+        else:
+            utc = date_time.replace(tzinfo=None) - date_time.utcoffset()
+
+        return transitions.to_local(utc)[0]
+
+    def _from_local(self, wall: datetime, zone: Optional[tzinfo]) -> datetime:
+        """
+        Convert naive wall time of the calculator's time zone into a date and
+        time in the given time zone.
+
+        Args:
+            wall (datetime): The naive wall time.
+            zone (tzinfo): The time zone of the result, or None for wall time.
+
+        Returns:
+            datetime: The date and time, aware unless zone is None.
+        """
+
+        if zone is None:
+            return wall
+
+        transitions = get_zone_transitions(self.time_zone or zone)
+        utc = transitions.to_utc(wall)
+        if self.time_zone is not None and zone is not self.time_zone:
+            return utc.replace(tzinfo=timezone.utc).astimezone(zone)
+
+        wall, fold = transitions.to_local(utc)
+
+        return wall.replace(tzinfo=zone, fold=fold)
+
+    def _to_microseconds(self, turnaround_hours: Turnaround) -> int:
+        """
+        Convert a turnaround time into microseconds of working time.
+
+        Numbers are taken as working hours and rounded to the nearest
+        microsecond, timedeltas are taken as they are.
+
+        Args:
+            turnaround_hours (Turnaround): The turnaround time to convert.
+
+        Returns:
+            int: The turnaround time in microseconds.
+        """
+
+        if isinstance(turnaround_hours, timedelta):
+            return turnaround_hours // ONE_MICROSECOND
+
+        if isinstance(turnaround_hours, int):
+            return turnaround_hours * MICROSECONDS_PER_HOUR
+
+        return round(Fraction(turnaround_hours) * MICROSECONDS_PER_HOUR)
+
+    def _get_time_of_day(self, date_time: datetime) -> int:
+        """
+        Get the time of day of the given date and time.
+
+        Args:
+            date_time (datetime): The date and time to check.
+
+        Returns:
+            int: The microseconds elapsed since midnight.
+        """
+
+        return (
+            (date_time.hour * 60 + date_time.minute) * 60 + date_time.second
+        ) * MICROSECONDS_PER_SECOND + date_time.microsecond
+
+    def _get_week_offset(self, date_time: datetime) -> Tuple[int, int]:
+        """
+        Split a date and time into whole weeks since the epoch and the offset
+        within its week.
 
-        return next_day
+        Args:
+            date_time (datetime): The date and time to split.
+
+        Returns:
+            Tuple[int, int]: The number of weeks since the epoch and the
+                microseconds since Monday midnight of the week.
+        """
+
+        weeks, weekday = divmod(date_time.toordinal() - 1, 7)
+
+        return weeks, weekday * MICROSECONDS_PER_DAY + self._get_time_of_day(date_time)
+
+    def _is_during_working_hours(self, date_time: datetime) -> bool:
+        """
+        Check if the given date and time is during working hours.
+
+        Working hours are defined by the schedule, 9AM to 5PM, Monday to Friday
+        by default, less the closures of the holiday calendar.
+
+        Args:
+            date_time (datetime): The date and time to check.
+
+        Returns:
+            bool: Whether date_time is during working hours.
+        """
+
+        if not self.schedule.is_working(self._get_week_offset(date_time)[1]):
+            return False
+
+        return self.holidays is None or not self.holidays.is_closed(date_time)
+
+    def _get_remaining_work_time_in_day(self, date_time: datetime) -> int:
+        """
+        Get the remaining work time in the given day.
+
+        The working day of a shift that runs through midnight ends with the
+        shift.
+
+        Args:
+            date_time (datetime): The date and time to check.
+
+        Returns:
+            int: The remaining work time in the day in microseconds.
+        """
+
+        weeks, offset = self._get_week_offset(date_time)
+        midnight = (offset // MICROSECONDS_PER_DAY + 1) * MICROSECONDS_PER_DAY
+        end_of_day = self.schedule.day_end(midnight)
+
+        end_year = date_time.year
+        if end_of_day > midnight and (date_time.month, date_time.day) == (12, 31):
+            end_year += 1
+        end_weeks = weeks
+        if end_of_day > MICROSECONDS_PER_WEEK:
+            end_weeks += 1
+            end_of_day -= MICROSECONDS_PER_WEEK
+
+        return self._get_open_ordinal(
+            end_year, end_weeks, end_of_day
+        ) - self._get_open_ordinal(date_time.year, weeks, offset)
+
+    def _roll_to_working_hours(self, date_time: datetime) -> datetime:
+        """
+        Move a date and time outside working hours into working hours.
+
+        Follows the off-hours policy: roll_forward moves to the next working
+        instant, roll_backward to the previous one.
+
+        Args:
+            date_time (datetime): The date and time outside working hours.
+
+        Returns:
+            datetime: The start or end of the nearest working day.
+        """
+
+        ordinal = self._to_work_microseconds(date_time)
+
+        return self._from_work_microseconds(
+            ordinal, prefer_end=self.off_hours_policy == OFF_HOURS_ROLL_BACKWARD
+        )
 
 
 # Example usage
@@ -0,0 +1,615 @@
+"""
+Calendars declared in TOML or JSON configuration files.
+
+A configuration is a table of calendars by name, e.g. in TOML:
+
+    [calendars.company]
+    hours = ["09:00", "17:00"]
+    days = ["mon", "tue", "wed", "thu", "fri"]
+    rules = [
+        { month = 12, day = 25, observed = "nearest" },
+        { month = 11, weekday = "thu", n = 4 },
+        { easter = -2 },
+    ]
+    years = [2000, 2100]
+    time_zone = "America/New_York"
+
+    [calendars.support]
+    parent = "company"
+    schedule = { mon = [["08:00", "12:00"], ["13:00", "17:00"]], sat = [["09:00", "13:00"]] }
+    holidays = [2025-12-24]
+    closures = { "2025-12-31" = [["13:00", "00:00"]] }
+    open_days = [2025-11-28]
+    engine = "daily"
+
+A calendar with a parent inherits its working hours, time zone, engine and
+off-hours policy unless it sets them, each on its own, e.g. the hours of
+the parent on the days the calendar sets, and its holidays are a
+CalendarLayer on the parent's. Dates and times are TOML dates and times or ISO strings.
+
+Loading only parses and checks the file; calculators are built on first
+use. The day indexes of the daily engine are written to a cache directory
+under a hash of the definitions they are built from, so they are read back
+instead of rebuilt after a restart, and a changed calendar gets a new one.
+"""
+
+import hashlib
+import json
+import os
+import sys
+from array import array
+from datetime import MAXYEAR, MINYEAR, date, time
+from typing import Any, BinaryIO, Dict, Iterator, List, Mapping, Optional, Union
+
+from .calculator import DueDateCalculator
+from .holidays import HolidayCalendar
+from .index import DayIndex
+from .layers import CalendarLayer
+from .rules import EasterOffset, FixedDate, HolidayRule, NthWeekday, RuleCalendar
+from .schedule import DAY_NAMES, Interval, WorkSchedule
+
+INVALID_CONFIG_FILE_MESSAGE = "Configuration must be a .toml or .json file"
+UNKNOWN_SETTING_MESSAGE = "Unknown setting of calendar {}: {}"
+UNKNOWN_PARENT_MESSAGE = "Unknown parent of calendar {}: {}"
+CYCLIC_PARENT_MESSAGE = "Calendar {} inherits from itself"
+INVALID_WEEKDAY_NAME_MESSAGE = "Unknown weekday: {}"
+INVALID_RULE_MESSAGE = (
+    "Holiday rule must have month and day, month, weekday and n, or easter"
+)
+OPEN_DAYS_WITHOUT_PARENT_MESSAGE = "Calendar {} has open days but no parent"
+OPEN_DAYS_WITHOUT_CLOSURES_MESSAGE = (
+    "Calendar {} has open days but its ancestors have no holidays or closures"
+)
+PARTIAL_HOURS_MESSAGE = (
+    "Calendar {} must set both hours and days to replace an inherited schedule"
+)
+TOML_UNAVAILABLE_MESSAGE = (
+    "Reading TOML needs Python 3.11 or later, or the tomli package"
+)
+
+SETTINGS = (
+    "description",
+    "parent",
+    "hours",
+    "days",
+    "schedule",
+    "holidays",
+    "closures",
+    "open_days",
+    "rules",
+    "years",
+    "time_zone",
+    "engine",
+    "off_hours_policy",
+)
+
+# Settings inherited from the parent calendar when they are not set
+INHERITED_SETTINGS = ("time_zone", "engine", "off_hours_policy")
+SCHEDULE_SETTINGS = ("hours", "days", "schedule")
+
+# Bumped whenever the cached files or the way they are computed change
+CACHE_FORMAT = 1
+
+
+class CalendarConfig:
+    """
+    Calculators declared by name in a configuration.
+    """
+
+    def __init__(
+        self,
+        calendars: Mapping[str, Mapping[str, Any]],
+        cache_dir: Optional[Union[str, os.PathLike]] = None,
+    ):
+        """
+        Args:
+            calendars (Mapping[str, Mapping[str, Any]]): The settings of each
+                calendar by name.
+            cache_dir (Union[str, os.PathLike]): Where compiled day indexes
+                are cached. Defaults to no cache.
+
+        Raises:
+            ValueError: If a calendar has an unknown setting, or an unknown or
+                cyclic parent.
+        """
+
+        self.calendars = {name: dict(settings) for name, settings in calendars.items()}
+        self.cache_dir = cache_dir
+
+        for name, settings in self.calendars.items():
+            for setting in settings:
+                if setting not in SETTINGS:
+                    raise ValueError(UNKNOWN_SETTING_MESSAGE.format(name, setting))
+            self._get_chain(name)
+
+        self._schedules: Dict[str, Optional[WorkSchedule]] = {}
+        self._holidays: Dict[str, Optional[HolidayCalendar]] = {}
+
+    @classmethod
+    def load(
+        cls,
+        path: Union[str, os.PathLike],
+        cache_dir: Optional[Union[str, os.PathLike]] = None,
+    ) -> "CalendarConfig":
+        """
+        Load a configuration from a TOML or JSON file.
+
+        Args:
+            path (Union[str, os.PathLike]): The .toml or .json file.
+            cache_dir (Union[str, os.PathLike]): Where compiled day indexes
+                are cached. Defaults to no cache.
+
+        Returns:
+            CalendarConfig: The configuration.
+
+        Raises:
+            ValueError: If the file is not TOML or JSON, or the configuration
+                is invalid.
+            ImportError: If the file is TOML and there is no TOML parser,
+                before Python 3.11 without tomli.
+        """
+
+        extension = os.path.splitext(path)[1].lower()
+        with open(path, "rb") as config_file:
+            if extension == ".toml":
+                config = _load_toml(config_file)
+            elif extension == ".json":
+                config = json.load(config_file)
+            else:
+                raise ValueError(INVALID_CONFIG_FILE_MESSAGE)
+
+        return cls(config.get("calendars", {}), cache_dir)
+
+    def build(self, name: str) -> DueDateCalculator:
+        """
+        Build the calculator of a calendar.
+
+        Calendars with the same parent share its holiday calendar. A new
+        calculator is built on every call, so this can be the loader of a
+        CalendarRegistry.
+
+        Args:
+            name (str): The name of the calendar.
+
+        Returns:
+            DueDateCalculator: The calculator.
+
+        Raises:
+            KeyError: If there is no calendar with that name.
+            ValueError: If a setting of the calendar is invalid.
+        """
+
+        schedule = self.get_schedule(name)
+        holidays = self.get_holidays(name)
+        options = {
+            setting: value
+            for setting, value in self._get_inherited(name).items()
+            if value is not None
+        }
+
+        day_index = None
+        if options.get("engine") == "daily" and self.cache_dir is not None:
+            if schedule is None:
+                schedule = WorkSchedule.from_hours(
+                    DueDateCalculator.WORK_START_HOUR,
+                    DueDateCalculator.WORK_END_HOUR,
+                    DueDateCalculator.WORKING_DAYS,
+                )
+            day_index = self._load_day_index(name, schedule, holidays)
+
+        return DueDateCalculator(
+            schedule, holidays=holidays, day_index=day_index, **options
+        )
+
+    def get_schedule(self, name: str) -> Optional[WorkSchedule]:
+        """
+        Get the working hours of a calendar.
+
+        Args:
+            name (str): The name of the calendar.
+
+        Returns:
+            Optional[WorkSchedule]: The working hours, or None for the
+                calculator's default hours.
+
+        Raises:
+            KeyError: If there is no calendar with that name.
+            ValueError: If the working hours are invalid.
+        """
+
+        if name in self._schedules:
+            return self._schedules[name]
+
+        settings = self.calendars[name]
+        if any(setting in settings for setting in SCHEDULE_SETTINGS):
+            schedule = _parse_schedule(self._get_schedule_settings(name))
+        elif "parent" in settings:
+            schedule = self.get_schedule(settings["parent"])
+        else:
+            schedule = None
+        self._schedules[name] = schedule
+
+        return schedule
+
+    def get_holidays(self, name: str) -> Optional[HolidayCalendar]:
+        """
+        Get the holiday calendar of a calendar, layered on its parent's.
+
+        Args:
+            name (str): The name of the calendar.
+
+        Returns:
+            Optional[HolidayCalendar]: The holidays, or None if there are none.
+
+        Raises:
+            KeyError: If there is no calendar with that name.
+            ValueError: If the holidays are invalid.
+        """
+
+        if name in self._holidays:
+            return self._holidays[name]
+
+        settings = self.calendars[name]
+        description = settings.get("description")
+        holidays = [_parse_date(day) for day in settings.get("holidays", ())]
+        closures = {
+            _parse_date(day): _parse_intervals(intervals)
+            for day, intervals in settings.get("closures", {}).items()
+        }
+        open_days = [_parse_date(day) for day in settings.get("open_days", ())]
+
+        rules = None
+        if "rules" in settings:
+            first, last = settings.get("years", (MINYEAR, MAXYEAR))
+            rules = RuleCalendar(
+                [_parse_rule(rule) for rule in settings["rules"]],
+                years=range(first, last + 1),
+                description=description,
+            )
+
+        parent = None
+        if "parent" in settings:
+            parent = self.get_holidays(settings["parent"])
+
+        if parent is None:
+            if open_days:
+                message = OPEN_DAYS_WITHOUT_PARENT_MESSAGE
+                if "parent" in settings:
+                    message = OPEN_DAYS_WITHOUT_CLOSURES_MESSAGE
+                raise ValueError(message.format(name))
+            calendar = rules
+            if holidays or closures:
+                defined = HolidayCalendar(holidays, closures, description)
+                calendar = defined if rules is None else rules | defined
+        else:
+            if rules is not None:
+                parent = parent | rules
+            calendar = parent
+            if holidays or closures or open_days:
+                calendar = CalendarLayer(
+                    parent, holidays, closures, open_days, description
+                )
+        self._holidays[name] = calendar
+
+        return calendar
+
+    def _get_chain(self, name: str) -> List[str]:
+        """
+        Get a calendar and its ancestors, nearest first.
+
+        Args:
+            name (str): The name of the calendar.
+
+        Returns:
+            List[str]: The names.
+
+        Raises:
+            ValueError: If a parent is unknown or the calendar inherits from
+                itself.
+        """
+
+        chain = [name]
+        settings = self.calendars[name]
+        while "parent" in settings:
+            parent = settings["parent"]
+            if parent not in self.calendars:
+                raise ValueError(UNKNOWN_PARENT_MESSAGE.format(chain[-1], parent))
+            if parent in chain:
+                raise ValueError(CYCLIC_PARENT_MESSAGE.format(name))
+            chain.append(parent)
+            settings = self.calendars[parent]
+
+        return chain
+
+    def _get_schedule_settings(self, name: str) -> Dict[str, Any]:
+        """
+        Get the working hours settings of a calendar. Hours and days it does
+        not set are inherited from the nearest calendar of its chain that
+        sets them, unless a nearer one sets a schedule instead.
+
+        Args:
+            name (str): The name of the calendar.
+
+        Returns:
+            Dict[str, Any]: The schedule, or the hours and days, that are set,
+                and the description of the calendar.
+
+        Raises:
+            ValueError: If a calendar sets only one of hours and days over an
+                inherited schedule.
+        """
+
+        merged: Dict[str, Any] = {}
+        for ancestor in reversed(self._get_chain(name)):
+            settings = self.calendars[ancestor]
+            if "schedule" in settings:
+                merged = {"schedule": settings["schedule"]}
+            elif "hours" in settings or "days" in settings:
+                if "schedule" in merged:
+                    if "hours" not in settings or "days" not in settings:
+                        raise ValueError(PARTIAL_HOURS_MESSAGE.format(ancestor))
+                    merged = {}
+                for setting in ("hours", "days"):
+                    if setting in settings:
+                        merged[setting] = settings[setting]
+
+        merged["description"] = self.calendars[name].get("description")
+
+        return merged
+
+    def _get_inherited(self, name: str) -> Dict[str, Any]:
+        """
+        Get the calculator options of a calendar, from the nearest calendar
+        of its chain that sets them.
+
+        Args:
+            name (str): The name of the calendar.
+
+        Returns:
+            Dict[str, Any]: The options, None where no calendar sets them.
+        """
+
+        options = dict.fromkeys(INHERITED_SETTINGS)
+        for ancestor in reversed(self._get_chain(name)):
+            for setting in INHERITED_SETTINGS:
+                if setting in self.calendars[ancestor]:
+                    options[setting] = self.calendars[ancestor][setting]
+
+        return options
+
+    def _load_day_index(
+        self,
+        name: str,
+        schedule: WorkSchedule,
+        holidays: Optional[HolidayCalendar],
+    ) -> DayIndex:
+        """
+        Read the day index of a calendar from the cache, or build and cache it.
+
+        Args:
+            name (str): The name of the calendar.
+            schedule (WorkSchedule): Its working hours.
+            holidays (HolidayCalendar): Its holidays.
+
+        Returns:
+            DayIndex: The day index.
+        """
+
+        years = DueDateCalculator.INDEX_YEARS
+        key = json.dumps(
+            {
+                "format": CACHE_FORMAT,
+                "years": [years.start, years.stop],
+                "calendars": [
+                    self.calendars[ancestor] for ancestor in self._get_chain(name)
+                ],
+            },
+            sort_keys=True,
+            default=str,
+        )
+        path = os.path.join(
+            self.cache_dir, hashlib.sha256(key.encode()).hexdigest() + ".index"
+        )
+
+        try:
+            with open(path, "rb") as index_file:
+                index = array("q")
+                index.frombytes(index_file.read())
+            if sys.byteorder == "big":
+                index.byteswap()
+            return DayIndex(schedule, holidays, years, index)
+        except (OSError, ValueError):
+            # Not cached yet, or an unreadable file that is rebuilt
+            pass
+
+        day_index = DayIndex(schedule, holidays, years)
+        index = array("q", day_index.index)
+        if sys.byteorder == "big":
+            index.byteswap()
+
+        # Write to a temporary file first so readers never see part of it
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temporary_path = "{}.{}.tmp".format(path, os.getpid())
+        with open(temporary_path, "wb") as index_file:
+            index.tofile(index_file)
+        os.replace(temporary_path, path)
+
+        return day_index
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.calendars
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.calendars)
+
+    def __len__(self) -> int:
+        return len(self.calendars)
+
+
+def _load_toml(config_file: BinaryIO) -> Dict[str, Any]:
+    """
+    Parse a TOML file with tomllib, or tomli before Python 3.11.
+
+    Args:
+        config_file (BinaryIO): The file, opened in binary mode.
+
+    Returns:
+        Dict[str, Any]: The parsed document.
+
+    Raises:
+        ImportError: If neither tomllib nor tomli is available.
+    """
+
+    try:
+        import tomllib
+    except ImportError:
+        try:
+            import tomli as tomllib
+        except ImportError as error:
+            raise ImportError(TOML_UNAVAILABLE_MESSAGE) from error
+
+    return tomllib.load(config_file)
+
+
+def _parse_schedule(settings: Mapping[str, Any]) -> WorkSchedule:
+    """
+    Build the working hours of a calendar from its settings.
+
+    Args:
+        settings (Mapping[str, Any]): The settings of the calendar.
+
+    Returns:
+        WorkSchedule: The working hours.
+
+    Raises:
+        ValueError: If a weekday or a time is invalid.
+    """
+
+    description = settings.get("description")
+    if "schedule" in settings:
+        return WorkSchedule(
+            {
+                _parse_weekday(weekday): _parse_intervals(intervals)
+                for weekday, intervals in settings["schedule"].items()
+            },
+            description=description,
+        )
+
+    start, end = settings.get(
+        "hours",
+        (
+            time(DueDateCalculator.WORK_START_HOUR),
+            time(DueDateCalculator.WORK_END_HOUR),
+        ),
+    )
+    interval = (_parse_time(start), _parse_time(end))
+    days = settings.get("days", DueDateCalculator.WORKING_DAYS)
+
+    return WorkSchedule(
+        {_parse_weekday(weekday): [interval] for weekday in days},
+        description=description,
+    )
+
+
+def _parse_weekday(weekday: Union[int, str]) -> int:
+    """
+    Parse a weekday given as a number, Monday (0) to Sunday (6), or by name,
+    e.g. Monday or mon.
+
+    Args:
+        weekday (Union[int, str]): The weekday.
+
+    Returns:
+        int: The weekday number.
+
+    Raises:
+        ValueError: If the weekday is unknown.
+    """
+
+    if isinstance(weekday, int):
+        return weekday
+
+    for number, day_name in enumerate(DAY_NAMES):
+        if weekday.lower() in (day_name.lower(), day_name[:3].lower()):
+            return number
+    if weekday.isdigit():
+        return int(weekday)
+
+    raise ValueError(INVALID_WEEKDAY_NAME_MESSAGE.format(weekday))
+
+
+def _parse_intervals(intervals: List[List[Union[str, time]]]) -> List[Interval]:
+    """
+    Parse start and end pairs of times.
+
+    Args:
+        intervals (List[List[Union[str, time]]]): The pairs.
+
+    Returns:
+        List[Interval]: The intervals.
+    """
+
+    return [(_parse_time(start), _parse_time(end)) for start, end in intervals]
+
+
+def _parse_time(value: Union[str, time]) -> time:
+    """
+    Parse a time of day given as a time or an ISO string like 09:30.
+
+    Args:
+        value (Union[str, time]): The time.
+
+    Returns:
+        time: The time of day.
+    """
+
+    if isinstance(value, time):
+        return value
+
+    return time.fromisoformat(value)
+
+
+def _parse_date(value: Union[str, date]) -> date:
+    """
+    Parse a date given as a date or an ISO string like 2025-12-25.
+
+    Args:
+        value (Union[str, date]): The date.
+
+    Returns:
+        date: The date.
+    """
+
+    if isinstance(value, date):
+        return value
+
+    return date.fromisoformat(value)
+
+
+def _parse_rule(rule: Mapping[str, Any]) -> HolidayRule:
+    """
+    Build a holiday rule from its settings.
+
+    Args:
+        rule (Mapping[str, Any]): month and day for a fixed date, month,
+            weekday and n for the nth weekday of a month, or easter for days
+            after Easter Sunday, each with an optional observed rule.
+
+    Returns:
+        HolidayRule: The rule.
+
+    Raises:
+        ValueError: If the rule is not one of these.
+    """
+
+    observed = rule.get("observed")
+    if "easter" in rule:
+        return EasterOffset(rule["easter"], observed)
+    if "month" in rule and "weekday" in rule and "n" in rule:
+        return NthWeekday(
+            rule["month"], _parse_weekday(rule["weekday"]), rule["n"], observed
+        )
+    if "month" in rule and "day" in rule:
+        return FixedDate(rule["month"], rule["day"], observed)
+
+    raise ValueError(INVALID_RULE_MESSAGE)
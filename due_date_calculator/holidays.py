@@ -0,0 +1,955 @@
+import sys
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime
+from weakref import WeakSet
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from .schedule import (
+    INVALID_INTERVAL_MESSAGE,
+    MICROSECONDS_PER_DAY,
+    MICROSECONDS_PER_SECOND,
+    Interval,
+    WorkSchedule,
+    _to_microseconds,
+)
+
+if sys.version_info >= (3, 10):
+    _bit_count = int.bit_count
+else:
+
+    def _bit_count(value: int) -> int:
+        """
+        Count the set bits of a non-negative integer, like int.bit_count.
+
+        Args:
+            value (int): The integer.
+
+        Returns:
+            int: The number of one bits.
+        """
+
+        return bin(value).count("1")
+
+
+# Bits of the days with each weekday in a year, indexed by the weekday of
+# January 1st and then by weekday. Bit n stands for day n of the year.
+_WEEKDAY_MASKS = [
+    [
+        sum(1 << day for day in range(366) if (first_weekday + day) % 7 == weekday)
+        for weekday in range(7)
+    ]
+    for first_weekday in range(7)
+]
+
+
+class HolidayYear(NamedTuple):
+    """
+    The closures of one year.
+
+    Attributes:
+        year (int): The year.
+        mask (int): Bitset of the full-day closures, bit n stands for day n of
+            the year (January 1st is day 0).
+        closures (Dict[int, List[List[int]]]): Partial-day closures by
+            day of the year, as merged start and end offsets in microseconds
+            since midnight.
+    """
+
+    year: int
+    mask: int
+    closures: Dict[int, List[List[int]]]
+
+
+class HolidayCalendar:
+    """
+    Days and parts of days on which no work is done, such as public holidays
+    and office closures.
+
+    Closures are compiled per year into a bitset with one bit per day of the
+    year for full-day closures, plus the closed intervals of partial-day
+    closures. Checking a date is a bit test, and the working time a year loses
+    to its holidays is a popcount per weekday.
+
+    Calendars that generate their closures override year_range and
+    _compile_year, which is called the first time a year is used. Only the
+    years that are used are cached: the working time lost in the years
+    before them is counted from closures compiled and dropped again. If the
+    closures repeat every cycle_years years, whole cycles are skipped at once.
+
+    Everything compiled from a calendar (years, closure tables, bitmaps, day
+    indexes and the calendars layered on it) is invalidated when it changes,
+    and compiled again on its next use.
+    """
+
+    # Closures repeat every cycle_years years from the first year of
+    # year_range, e.g. 400 for rules that follow the Gregorian calendar
+    cycle_years: Optional[int] = None
+
+    def __init__(
+        self,
+        holidays: Iterable[date] = (),
+        closures: Optional[Mapping[date, Sequence[Interval]]] = None,
+        description: Optional[str] = None,
+    ):
+        """
+        Args:
+            holidays (Iterable[date]): Days that are closed all day.
+            closures (Mapping[date, Sequence[Interval]]): Closed intervals on
+                days that are only partly closed, e.g. a half day.
+            description (str): A human readable description of the calendar.
+
+        Raises:
+            ValueError: If a closed interval ends before it starts.
+        """
+
+        self.description = description
+        # Closures given by date, per year
+        self._defined: Dict[int, HolidayYear] = {}
+        self._years: Dict[int, HolidayYear] = {}
+        self._tables: Dict[WorkSchedule, ClosureTable] = {}
+        # Day indexes by schedule and years, see index.get_day_index. Kept
+        # here so they are dropped with the calendar
+        self._day_indexes: Dict = {}
+        # Calendars and engines compiled from this calendar, invalidated with it
+        self._dependents: "WeakSet" = WeakSet()
+        # Approximate memory held by the compiled years, in bytes
+        self.nbytes = 0
+
+        self._define(holidays, closures)
+
+    @property
+    def year_range(self) -> range:
+        """
+        range: The years that may contain closures.
+        """
+
+        return range(self._first_year, self._last_year + 1)
+
+    def get_year(self, year: int) -> HolidayYear:
+        """
+        Get the compiled closures of a year.
+
+        Args:
+            year (int): The year.
+
+        Returns:
+            HolidayYear: The full-day bitset and partial-day closures.
+        """
+
+        holiday_year = self._years.get(year)
+        if holiday_year is None:
+            holiday_year = self._compile_year(year)
+            if year in self.year_range:
+                self._years[year] = holiday_year
+                self.nbytes += _get_year_bytes(holiday_year)
+
+        return holiday_year
+
+    @property
+    def compiled_years(self) -> List[int]:
+        """
+        List[int]: The years compiled and cached so far, in order.
+        """
+
+        return sorted(self._years)
+
+    def is_holiday(self, day: date) -> bool:
+        """
+        Check if the given day is closed all day.
+
+        Args:
+            day (date): The day to check.
+
+        Returns:
+            bool: Whether day is a full-day closure.
+        """
+
+        return bool(self.get_year(day.year).mask >> _day_of_year(day) & 1)
+
+    def is_closed(self, date_time: datetime) -> bool:
+        """
+        Check if the given date and time falls in a closure.
+
+        Args:
+            date_time (datetime): The date and time to check.
+
+        Returns:
+            bool: Whether date_time is in a full-day or partial-day closure.
+        """
+
+        holiday_year = self.get_year(date_time.year)
+        day = _day_of_year(date_time)
+        if holiday_year.mask >> day & 1:
+            return True
+
+        time_of_day = (
+            (date_time.hour * 60 + date_time.minute) * 60 + date_time.second
+        ) * MICROSECONDS_PER_SECOND + date_time.microsecond
+
+        return any(
+            start <= time_of_day < end
+            for start, end in holiday_year.closures.get(day, ())
+        )
+
+    def compile(self, schedule: WorkSchedule) -> "ClosureTable":
+        """
+        Get the closure table of this calendar for a work schedule.
+
+        The table is built once per schedule and shared by every calculator
+        using the same calendar and schedule.
+
+        Args:
+            schedule (WorkSchedule): The working hours the closures apply to.
+
+        Returns:
+            ClosureTable: The compiled closure table.
+        """
+
+        table = self._tables.get(schedule)
+        if table is None:
+            table = self._tables[schedule] = ClosureTable(self, schedule)
+
+        return table
+
+    def update(
+        self,
+        holidays: Iterable[date] = (),
+        closures: Optional[Mapping[date, Sequence[Interval]]] = None,
+        removed: Iterable[date] = (),
+    ) -> None:
+        """
+        Change the closures given by date, e.g. to add an emergency closure.
+
+        Args:
+            holidays (Iterable[date]): Days to close all day.
+            closures (Mapping[date, Sequence[Interval]]): Closed intervals to
+                add on days that are only partly closed.
+            removed (Iterable[date]): Days whose closures are removed, before
+                the new ones are added.
+
+        Raises:
+            ValueError: If a closed interval ends before it starts.
+        """
+
+        self._define(holidays, closures, removed)
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """
+        Drop everything compiled from this calendar, after it changed.
+
+        Closure tables are emptied in place, so calculators using them see
+        the change, and the calendars and engines depending on this calendar
+        are invalidated in turn.
+        """
+
+        self._years.clear()
+        self.nbytes = 0
+        for table in self._tables.values():
+            table.invalidate()
+        for dependent in list(self._dependents):
+            dependent.invalidate()
+
+    def _add_dependent(self, dependent) -> None:
+        """
+        Invalidate an object compiled from this calendar along with it.
+
+        Args:
+            dependent: An object with an invalidate method, only referenced
+                weakly.
+        """
+
+        self._dependents.add(dependent)
+
+    def _define(
+        self,
+        holidays: Iterable[date] = (),
+        closures: Optional[Mapping[date, Sequence[Interval]]] = None,
+        removed: Iterable[date] = (),
+    ) -> None:
+        """
+        Add and remove closures given by date.
+
+        Args:
+            holidays (Iterable[date]): Days that are closed all day.
+            closures (Mapping[date, Sequence[Interval]]): Closed intervals on
+                days that are only partly closed.
+            removed (Iterable[date]): Days whose closures are removed first.
+
+        Raises:
+            ValueError: If a closed interval ends before it starts.
+        """
+
+        masks: Dict[int, int] = {}
+        for day in holidays:
+            masks[day.year] = masks.get(day.year, 0) | 1 << _day_of_year(day)
+
+        partial: Dict[int, Dict[int, List[List[int]]]] = {}
+        for day, intervals in (closures or {}).items():
+            for start, end in intervals:
+                start_offset = _to_microseconds(start)
+                end_offset = _to_microseconds(end) or MICROSECONDS_PER_DAY
+                if end_offset <= start_offset:
+                    raise ValueError(INVALID_INTERVAL_MESSAGE)
+                partial.setdefault(day.year, {}).setdefault(
+                    _day_of_year(day), []
+                ).append([start_offset, end_offset])
+
+        for day in removed:
+            holiday_year = self._defined.get(day.year)
+            if holiday_year is None:
+                continue
+            day_of_year = _day_of_year(day)
+            self._defined[day.year] = HolidayYear(
+                day.year,
+                holiday_year.mask & ~(1 << day_of_year),
+                {
+                    other: intervals
+                    for other, intervals in holiday_year.closures.items()
+                    if other != day_of_year
+                },
+            )
+
+        for year in masks.keys() | partial.keys():
+            holiday_year = self._defined.get(year) or HolidayYear(year, 0, {})
+            mask = holiday_year.mask | masks.get(year, 0)
+            days = partial.get(year, {})
+            self._defined[year] = HolidayYear(
+                year,
+                mask,
+                {
+                    day: _merge(holiday_year.closures.get(day, []) + days.get(day, []))
+                    for day in holiday_year.closures.keys() | days.keys()
+                    if not mask >> day & 1
+                },
+            )
+
+        years = sorted(
+            year
+            for year, holiday_year in self._defined.items()
+            if holiday_year.mask or holiday_year.closures
+        )
+        self._first_year = years[0] if years else 1
+        self._last_year = years[-1] if years else 0
+
+    def _peek_year(self, year: int) -> HolidayYear:
+        """
+        Get the closures of a year without caching them, e.g. to count the
+        working time lost in years before the one that is used.
+
+        Args:
+            year (int): The year.
+
+        Returns:
+            HolidayYear: The full-day bitset and partial-day closures.
+        """
+
+        return self._years.get(year) or self._compile_year(year)
+
+    def _compile_year(self, year: int) -> HolidayYear:
+        """
+        Compile the closures of a year that has not been used yet.
+
+        Args:
+            year (int): The year.
+
+        Returns:
+            HolidayYear: The full-day bitset and partial-day closures.
+        """
+
+        return self._defined.get(year) or HolidayYear(year, 0, {})
+
+    def __or__(self, other: "HolidayCalendar") -> "HolidayCalendar":
+        if not isinstance(other, HolidayCalendar):
+            return NotImplemented
+        return CalendarUnion([self, other])
+
+    def __repr__(self):
+        return "{}({!r})".format(
+            type(self).__name__, self.description or self.year_range
+        )
+
+
+class CalendarUnion(HolidayCalendar):
+    """
+    The closures of several holiday calendars, closed whenever any of them
+    is, as made by calendar | calendar.
+
+    The closures of a year are merged the first time the year is used, so
+    the combined calendar is looked up like a single one.
+    """
+
+    def __init__(
+        self, calendars: Sequence[HolidayCalendar], description: Optional[str] = None
+    ):
+        """
+        Args:
+            calendars (Sequence[HolidayCalendar]): The calendars to combine.
+            description (str): A human readable description of the calendar.
+        """
+
+        super().__init__(description=description)
+
+        # Unions of unions combine their calendars directly
+        self.calendars: List[HolidayCalendar] = []
+        for calendar in calendars:
+            if isinstance(calendar, CalendarUnion):
+                self.calendars.extend(calendar.calendars)
+            else:
+                self.calendars.append(calendar)
+
+        for calendar in self.calendars:
+            calendar._add_dependent(self)
+
+        self._set_year_range()
+
+    @property
+    def year_range(self) -> range:
+        """
+        range: The years that may contain closures.
+        """
+
+        return self._year_range
+
+    def invalidate(self) -> None:
+        self._set_year_range()
+        super().invalidate()
+
+    def _set_year_range(self) -> None:
+        """
+        Span the years of every calendar, and repeat with them if they all
+        repeat together.
+        """
+
+        self._year_range = _span([calendar.year_range for calendar in self.calendars])
+
+        cycles = {
+            (calendar.cycle_years, calendar.year_range) for calendar in self.calendars
+        }
+        self.cycle_years = cycles.pop()[0] if len(cycles) == 1 else None
+
+    def _peek_year(self, year: int) -> HolidayYear:
+        holiday_year = self._years.get(year)
+        if holiday_year is None:
+            holiday_year = self._merge_year(
+                year,
+                [
+                    calendar._peek_year(year)
+                    for calendar in self.calendars
+                    if year in calendar.year_range
+                ],
+            )
+
+        return holiday_year
+
+    def _compile_year(self, year: int) -> HolidayYear:
+        """
+        Merge the closures of a year of every calendar.
+
+        Args:
+            year (int): The year.
+
+        Returns:
+            HolidayYear: The full-day bitset and partial-day closures.
+        """
+
+        return self._merge_year(
+            year,
+            [
+                calendar.get_year(year)
+                for calendar in self.calendars
+                if year in calendar.year_range
+            ],
+        )
+
+    def _merge_year(self, year: int, holiday_years: List[HolidayYear]) -> HolidayYear:
+        """
+        Merge the closures of a year of the calendars.
+
+        Args:
+            year (int): The year.
+            holiday_years (List[HolidayYear]): The closures of the year of
+                each calendar.
+
+        Returns:
+            HolidayYear: The full-day bitset and partial-day closures.
+        """
+
+        mask = 0
+        partial: Dict[int, List[List[int]]] = {}
+        for holiday_year in holiday_years:
+            mask |= holiday_year.mask
+            for day, intervals in holiday_year.closures.items():
+                partial.setdefault(day, []).extend(
+                    [start, end] for start, end in intervals
+                )
+
+        return HolidayYear(
+            year,
+            mask,
+            {
+                day: _merge(intervals)
+                for day, intervals in partial.items()
+                if not mask >> day & 1
+            },
+        )
+
+
+class _YearTable(NamedTuple):
+    """
+    The closures of one year in work ordinal space.
+
+    Attributes:
+        start (int): The schedule work ordinal of January 1st, midnight.
+        starts (List[int]): The schedule work ordinal at the start of each
+            closure.
+        lengths (List[int]): The working time lost to each closure.
+        cumulative (List[int]): The working time lost in the year before each
+            closure.
+        points (List[int]): The open working time since January 1st at which
+            each closure is reached.
+    """
+
+    start: int
+    starts: List[int]
+    lengths: List[int]
+    cumulative: List[int]
+    points: List[int]
+
+
+class ClosureTable:
+    """
+    The closures of a HolidayCalendar compiled against a WorkSchedule.
+
+    Work ordinals of the schedule alone ("schedule ordinals") count every
+    working interval. Closures remove stretches of them, and the open work
+    ordinal is the schedule ordinal minus the working time lost to closures
+    before it. Each closure is kept as a range of schedule ordinals with the
+    working time lost before it, so converting either way is a bisect within
+    the year. Years are compiled on first use, and the working time lost
+    before a year is a running total over the calendar's years, counted
+    without compiling the years before it.
+    """
+
+    def __init__(self, calendar: HolidayCalendar, schedule: WorkSchedule):
+        """
+        Args:
+            calendar (HolidayCalendar): The closures.
+            schedule (WorkSchedule): The working hours the closures apply to.
+        """
+
+        self.calendar = calendar
+        self.schedule = schedule
+
+        # Working time on each weekday
+        self._day_lengths = [
+            schedule.work_before((weekday + 1) * MICROSECONDS_PER_DAY)
+            - schedule.work_before(weekday * MICROSECONDS_PER_DAY)
+            for weekday in range(7)
+        ]
+        self._year_tables: Dict[int, _YearTable] = {}
+        # Approximate memory held by the compiled years, in bytes
+        self.nbytes = 0
+        # Working time lost before each year of the calendar's year range
+        self._lost_before_years = [0]
+
+    def invalidate(self) -> None:
+        """
+        Drop the compiled years, after the calendar changed.
+        """
+
+        self._year_tables.clear()
+        self._lost_before_years = [0]
+        self.nbytes = 0
+
+    def lost_before(self, year: int, ordinal: int) -> int:
+        """
+        Get the working time lost to closures before a schedule ordinal.
+
+        Args:
+            year (int): The year of the instant the ordinal refers to.
+            ordinal (int): The schedule work ordinal in microseconds.
+
+        Returns:
+            int: The working time lost in microseconds.
+        """
+
+        lost = self.lost_before_year(year)
+        if year not in self.calendar.year_range:
+            return lost
+
+        table = self._get_year_table(year)
+        index = bisect_right(table.starts, ordinal) - 1
+        if index < 0:
+            return lost
+
+        return (
+            lost
+            + table.cumulative[index]
+            + min(ordinal - table.starts[index], table.lengths[index])
+        )
+
+    def to_schedule_ordinal(self, ordinal: int, prefer_end: bool = False) -> int:
+        """
+        Convert an open work ordinal into a schedule ordinal.
+
+        Closures collapse to a single open work ordinal, which is both the end
+        of the working time before the closure and the start of the working
+        time after it. The start after it is returned unless prefer_end is set.
+
+        Args:
+            ordinal (int): The open work ordinal in microseconds.
+            prefer_end (bool): Return the end of the working time before a
+                closure when the ordinal is on one.
+
+        Returns:
+            int: The schedule work ordinal in microseconds.
+        """
+
+        year = self.year_of(ordinal, prefer_end)
+        lost = self.lost_before_year(year)
+        if year not in self.calendar.year_range:
+            return ordinal + lost
+
+        table = self._get_year_table(year)
+        open_time = ordinal + lost - table.start
+        if prefer_end:
+            index = bisect_left(table.points, open_time) - 1
+        else:
+            index = bisect_right(table.points, open_time) - 1
+        if index < 0:
+            return ordinal + lost
+
+        return ordinal + lost + table.cumulative[index] + table.lengths[index]
+
+    def get_closures(self, year: int) -> List[Tuple[int, int, int]]:
+        """
+        Get the closures of a year as ranges of schedule ordinals.
+
+        Args:
+            year (int): The year.
+
+        Returns:
+            List[Tuple[int, int, int]]: The schedule ordinal at the start of
+                each closure, the working time lost to it and the working time
+                lost to closures before it.
+        """
+
+        if year not in self.calendar.year_range:
+            return []
+
+        lost = self.lost_before_year(year)
+        table = self._get_year_table(year)
+
+        return [
+            (start, length, lost + cumulative)
+            for start, length, cumulative in zip(
+                table.starts, table.lengths, table.cumulative
+            )
+        ]
+
+    def lost_before_year(self, year: int) -> int:
+        """
+        Get the working time lost to closures before January 1st of a year.
+
+        Args:
+            year (int): The year.
+
+        Returns:
+            int: The working time lost in microseconds.
+        """
+
+        years = self.calendar.year_range
+        index = min(max(year - years.start, 0), len(years))
+
+        # Whole cycles all lose the same working time
+        cycle = self.calendar.cycle_years
+        if cycle and index > cycle:
+            cycles, index = divmod(index, cycle)
+            return cycles * self._get_lost_before_years(
+                cycle
+            ) + self._get_lost_before_years(index)
+
+        return self._get_lost_before_years(index)
+
+    def year_of(self, ordinal: int, prefer_end: bool = False) -> int:
+        """
+        Get the year an open work ordinal falls in.
+
+        Args:
+            ordinal (int): The open work ordinal in microseconds.
+            prefer_end (bool): Pick the earlier year when the ordinal is on
+                the boundary between two years.
+
+        Returns:
+            int: The year.
+        """
+
+        # Closures only move instants later, so the schedule ordinal equal to
+        # the open work ordinal is a lower bound
+        weeks = ordinal // self.schedule.week_length
+        year = date.fromordinal(min(1 + 7 * weeks, date.max.toordinal())).year
+        while prefer_end and year > 1 and self.year_start(year) >= ordinal:
+            year -= 1
+
+        def starts_before(year: int) -> bool:
+            start = self.year_start(year)
+            return start < ordinal or (not prefer_end and start == ordinal)
+
+        # Gallop forward to a year that starts after the ordinal, then bisect
+        step = 1
+        while starts_before(year + step):
+            year += step
+            step *= 2
+        end = year + step
+        while end - year > 1:
+            middle = (year + end) // 2
+            if starts_before(middle):
+                year = middle
+            else:
+                end = middle
+
+        return year
+
+    def year_start(self, year: int) -> int:
+        """
+        Get the open work ordinal of January 1st, midnight.
+
+        Args:
+            year (int): The year.
+
+        Returns:
+            int: The open work ordinal in microseconds.
+        """
+
+        return self._get_schedule_ordinal(
+            _first_day_of_year(year)
+        ) - self.lost_before_year(year)
+
+    def _get_schedule_ordinal(self, day: int) -> int:
+        """
+        Get the schedule work ordinal of midnight at the start of a day.
+
+        Args:
+            day (int): The proleptic Gregorian ordinal of the day.
+
+        Returns:
+            int: The schedule work ordinal in microseconds.
+        """
+
+        weeks, weekday = divmod(day - 1, 7)
+
+        return weeks * self.schedule.week_length + self.schedule.work_before(
+            weekday * MICROSECONDS_PER_DAY
+        )
+
+    def _get_lost_before_years(self, count: int) -> int:
+        """
+        Get the working time lost in the first years of the calendar.
+
+        Args:
+            count (int): The number of years from the start of year_range.
+
+        Returns:
+            int: The working time lost in microseconds.
+        """
+
+        first_year = self.calendar.year_range.start
+        lost_before_years = self._lost_before_years
+        while len(lost_before_years) <= count:
+            lost_before_years.append(
+                lost_before_years[-1]
+                + self._get_lost_in_year(first_year + len(lost_before_years) - 1)
+            )
+
+        return lost_before_years[count]
+
+    def _get_lost_in_year(self, year: int) -> int:
+        """
+        Get the working time lost to closures in a whole year.
+
+        Full-day closures are counted per weekday with a popcount of the
+        year's bitset, so the year does not need to be compiled into a table.
+        The closures of years that have not been used are not cached either,
+        so the running total over the years before a year holds no memory
+        for them.
+
+        Args:
+            year (int): The year.
+
+        Returns:
+            int: The working time lost in microseconds.
+        """
+
+        holiday_year = self.calendar._peek_year(year)
+        first_weekday = (_first_day_of_year(year) - 1) % 7
+        weekday_masks = _WEEKDAY_MASKS[first_weekday]
+
+        lost = sum(
+            _bit_count(holiday_year.mask & weekday_masks[weekday]) * length
+            for weekday, length in enumerate(self._day_lengths)
+        )
+        for day, intervals in holiday_year.closures.items():
+            offset = (first_weekday + day) % 7 * MICROSECONDS_PER_DAY
+            lost += sum(
+                self.schedule.work_before(offset + end)
+                - self.schedule.work_before(offset + start)
+                for start, end in intervals
+            )
+
+        return lost
+
+    def _get_year_table(self, year: int) -> _YearTable:
+        """
+        Get the closures of a year as ranges of schedule ordinals.
+
+        Args:
+            year (int): The year.
+
+        Returns:
+            _YearTable: The compiled year.
+        """
+
+        table = self._year_tables.get(year)
+        if table is not None:
+            return table
+
+        holiday_year = self.calendar.get_year(year)
+        first_day = _first_day_of_year(year)
+        schedule_ordinal = self._get_schedule_ordinal
+
+        ranges = []
+        mask = holiday_year.mask
+        while mask:
+            day = (mask & -mask).bit_length() - 1
+            mask &= mask - 1
+            ranges.append(
+                [
+                    schedule_ordinal(first_day + day),
+                    schedule_ordinal(first_day + day + 1),
+                ]
+            )
+        for day, intervals in holiday_year.closures.items():
+            midnight = schedule_ordinal(first_day + day)
+            offset = (first_day + day - 1) % 7 * MICROSECONDS_PER_DAY
+            for start, end in intervals:
+                ranges.append(
+                    [
+                        midnight
+                        + self.schedule.work_before(offset + start)
+                        - self.schedule.work_before(offset),
+                        midnight
+                        + self.schedule.work_before(offset + end)
+                        - self.schedule.work_before(offset),
+                    ]
+                )
+
+        # Closures with no working time in between, such as a Friday and the
+        # following Monday, collapse to the same open work ordinal
+        ranges = [interval for interval in _merge(ranges) if interval[0] < interval[1]]
+
+        start = schedule_ordinal(first_day)
+        starts, lengths, cumulative, points = [], [], [], []
+        lost = 0
+        for closure_start, closure_end in ranges:
+            starts.append(closure_start)
+            lengths.append(closure_end - closure_start)
+            cumulative.append(lost)
+            points.append(closure_start - start - lost)
+            lost += closure_end - closure_start
+
+        table = self._year_tables[year] = _YearTable(
+            start, starts, lengths, cumulative, points
+        )
+        self.nbytes += sum(sys.getsizeof(values) for values in table[1:])
+
+        return table
+
+
+def _span(ranges: Iterable[range]) -> range:
+    """
+    Get the years from the first to the last year of some year ranges.
+
+    Args:
+        ranges (Iterable[range]): The year ranges, empty ones are ignored.
+
+    Returns:
+        range: The spanning range, empty if every range is.
+    """
+
+    ranges = [years for years in ranges if years] or [range(1, 1)]
+
+    return range(
+        min(years.start for years in ranges), max(years.stop for years in ranges)
+    )
+
+
+def _get_year_bytes(holiday_year: HolidayYear) -> int:
+    """
+    Estimate the memory held by the closures of a year.
+
+    Args:
+        holiday_year (HolidayYear): The closures of the year.
+
+    Returns:
+        int: The approximate size in bytes.
+    """
+
+    return (
+        sys.getsizeof(holiday_year.mask)
+        + sys.getsizeof(holiday_year.closures)
+        + sum(sys.getsizeof(intervals) for intervals in holiday_year.closures.values())
+    )
+
+
+def _day_of_year(day: date) -> int:
+    """
+    Get the day of the year, counting January 1st as day 0.
+
+    Args:
+        day (date): The day.
+
+    Returns:
+        int: The day of the year.
+    """
+
+    return day.toordinal() - _first_day_of_year(day.year)
+
+
+def _first_day_of_year(year: int) -> int:
+    """
+    Get the proleptic Gregorian ordinal of January 1st of a year.
+
+    Unlike date.toordinal this also works for the year after date.max.
+
+    Args:
+        year (int): The year.
+
+    Returns:
+        int: The ordinal, where January 1st of year 1 is 1.
+    """
+
+    previous = year - 1
+
+    return previous * 365 + previous // 4 - previous // 100 + previous // 400 + 1
+
+
+def _merge(intervals: List[List[int]]) -> List[List[int]]:
+    """
+    Merge overlapping and touching intervals.
+
+    Args:
+        intervals (List[List[int]]): Start and end pairs.
+
+    Returns:
+        List[List[int]]: The sorted, merged intervals.
+    """
+
+    merged: List[List[int]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+
+    return merged
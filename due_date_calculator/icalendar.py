@@ -0,0 +1,897 @@
+"""
+Holiday calendars imported from iCalendar (RFC 5545) feeds.
+
+The file is read one line at a time and only the few fields of each event
+that matter for closures are kept (start, duration, recurrence rule and
+exceptions), so feeds of any size are imported in constant memory beyond the
+events themselves. Recurring events are expanded lazily, only for the years
+that are used, straight into the per-year bitsets of the calendar.
+
+All-day events close whole days. Timed events close the part of each day
+they cover. Times with a TZID or in UTC are converted into the calendar's
+time zone when it has one, and are taken as wall time otherwise, like
+floating times. Cancelled events are skipped.
+"""
+
+import os
+from datetime import MAXYEAR, date, datetime, time, timedelta, timezone, tzinfo
+from typing import (
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from .holidays import HolidayCalendar, HolidayYear, _day_of_year, _merge
+from .schedule import MICROSECONDS_PER_DAY, _to_microseconds
+
+INVALID_LINE_MESSAGE = "Invalid iCalendar line: {}"
+INVALID_VALUE_MESSAGE = "Invalid iCalendar date, time or duration: {}"
+UNSUPPORTED_FREQUENCY_MESSAGE = (
+    "Recurrence frequency must be one of: DAILY, WEEKLY, MONTHLY, YEARLY"
+)
+
+WEEKDAY_CODES = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY", "YEARLY")
+
+ONE_DAY = timedelta(days=1)
+
+
+class Recurrence:
+    """
+    An RRULE of an event, expanded on demand.
+
+    Supports the DAILY, WEEKLY, MONTHLY and YEARLY frequencies with INTERVAL,
+    COUNT, UNTIL, BYMONTH, BYMONTHDAY and BYDAY (with nth weekdays like 4TH
+    or -1MO for monthly and yearly rules). Weeks start on Monday. Rules
+    without COUNT jump straight to the requested dates.
+    """
+
+    def __init__(self, rule: str, start: datetime, zone: Optional[tzinfo] = None):
+        """
+        Args:
+            rule (str): The RRULE value, e.g. FREQ=YEARLY;BYMONTH=11;BYDAY=4TH.
+            start (datetime): The start of the first occurrence.
+            zone (tzinfo): The time zone of start, used to read a UTC UNTIL.
+
+        Raises:
+            ValueError: If the frequency is not supported or a part is invalid.
+        """
+
+        parts = dict(part.split("=", 1) for part in rule.upper().split(";") if part)
+
+        self.frequency = parts.get("FREQ")
+        if self.frequency not in FREQUENCIES:
+            raise ValueError(UNSUPPORTED_FREQUENCY_MESSAGE)
+
+        self.start = start
+        self.interval = int(parts.get("INTERVAL", 1))
+        self.count: Optional[int] = int(parts["COUNT"]) if "COUNT" in parts else None
+
+        self.until: Optional[datetime] = None
+        if "UNTIL" in parts:
+            until, until_zone, all_day = _parse_date_time(parts["UNTIL"], {})
+            if all_day:
+                until += ONE_DAY - timedelta(microseconds=1)
+            elif until_zone is not None and zone is not None:
+                until = _convert(until, until_zone, zone)
+            self.until = until
+
+        self.months = [
+            int(month) for month in parts.get("BYMONTH", "").split(",") if month
+        ]
+        self.month_days = [
+            int(day) for day in parts.get("BYMONTHDAY", "").split(",") if day
+        ]
+        # Weekdays with the n of nth weekday rules, None for every such weekday
+        self.weekdays: List[Tuple[Optional[int], int]] = []
+        for code in parts.get("BYDAY", "").split(","):
+            if code:
+                self.weekdays.append(
+                    (
+                        int(code[:-2]) if code[:-2] else None,
+                        WEEKDAY_CODES.index(code[-2:]),
+                    )
+                )
+
+    @property
+    def last_year(self) -> int:
+        """
+        int: The last year an occurrence can start in.
+        """
+
+        if self.until is not None:
+            return self.until.year
+
+        return MAXYEAR
+
+    def between(self, first: date, last: date) -> Iterator[datetime]:
+        """
+        Get the occurrences starting from one date to another, in order.
+
+        Args:
+            first (date): The first day.
+            last (date): The last day, included.
+
+        Returns:
+            Iterator[datetime]: The starts of the occurrences.
+        """
+
+        # Counted rules are expanded from the first occurrence to count them
+        period = 0 if self.count is not None else self._get_period(first)
+        seen = 0
+        while True:
+            period_start = self._get_period_start(period)
+            if period_start is None or period_start > last:
+                return
+            if self.until is not None and period_start > self.until.date():
+                return
+
+            for day in self._expand(period):
+                start = datetime.combine(day, self.start.time())
+                if start < self.start:
+                    continue
+                if self.until is not None and start > self.until:
+                    return
+                seen += 1
+                if first <= day <= last:
+                    yield start
+                if self.count is not None and seen >= self.count:
+                    return
+
+            period += self.interval
+
+    def _get_period(self, first: date) -> int:
+        """
+        Get the first period, a multiple of the interval, that can have an
+        occurrence on or after a date.
+
+        Args:
+            first (date): The date.
+
+        Returns:
+            int: The number of days, weeks, months or years since the start.
+        """
+
+        start = self.start.date()
+        if self.frequency == "DAILY":
+            periods = (first - start).days
+        elif self.frequency == "WEEKLY":
+            periods = (first - start).days // 7
+        elif self.frequency == "MONTHLY":
+            periods = (first.year - start.year) * 12 + first.month - start.month
+        else:
+            periods = first.year - start.year
+
+        # Weekly periods are aligned to the week of the start, a period
+        # earlier may still have occurrences on or after first
+        return max(0, periods - 1) // self.interval * self.interval
+
+    def _get_period_start(self, period: int) -> Optional[date]:
+        """
+        Get the first day of a period.
+
+        Args:
+            period (int): The number of days, weeks, months or years since the
+                start.
+
+        Returns:
+            Optional[date]: The first day, or None after date.max.
+        """
+
+        start = self.start.date()
+        try:
+            if self.frequency == "DAILY":
+                return start + timedelta(days=period)
+            if self.frequency == "WEEKLY":
+                return start - timedelta(days=start.weekday() - 7 * period)
+            if self.frequency == "MONTHLY":
+                year, month = divmod(start.year * 12 + start.month - 1 + period, 12)
+                return date(year, month + 1, 1)
+            return date(start.year + period, 1, 1)
+        except (OverflowError, ValueError):
+            return None
+
+    def _expand(self, period: int) -> List[date]:
+        """
+        Get the days of a period that match the rule, in order.
+
+        Args:
+            period (int): The number of days, weeks, months or years since the
+                start.
+
+        Returns:
+            List[date]: The days.
+        """
+
+        period_start = self._get_period_start(period)
+
+        if self.frequency == "DAILY":
+            days = [period_start]
+        elif self.frequency == "WEEKLY":
+            weekdays = sorted({weekday for _, weekday in self.weekdays}) or [
+                self.start.weekday()
+            ]
+            days = [period_start + timedelta(days=weekday) for weekday in weekdays]
+        elif self.frequency == "MONTHLY":
+            days = self._expand_month(period_start.year, period_start.month)
+        elif self.months or not (self.weekdays or self.month_days):
+            days = [
+                day
+                for month in self.months or [self.start.month]
+                for day in self._expand_month(period_start.year, month)
+            ]
+        elif self.month_days:
+            days = [
+                day
+                for month in range(1, 13)
+                for day in self._expand_month(period_start.year, month)
+            ]
+        else:
+            # Weekdays of the whole year, e.g. the 20th Monday
+            days = _get_weekdays(
+                date(period_start.year, 1, 1),
+                date(period_start.year, 12, 31),
+                self.weekdays,
+            )
+
+        # BYDAY and BYMONTHDAY only narrow down days they did not generate
+        weekdays = {weekday for _, weekday in self.weekdays}
+        filter_weekdays = weekdays and (self.frequency == "DAILY" or self.month_days)
+        filter_month_days = self.month_days and self.frequency in ("DAILY", "WEEKLY")
+
+        return sorted(
+            day
+            for day in days
+            if (not self.months or day.month in self.months)
+            and (not filter_weekdays or day.weekday() in weekdays)
+            and (not filter_month_days or _matches_month_day(day, self.month_days))
+        )
+
+    def _expand_month(self, year: int, month: int) -> List[date]:
+        """
+        Get the days of a month that match BYMONTHDAY or BYDAY, or the day of
+        the month of the start.
+
+        Args:
+            year (int): The year.
+            month (int): The month.
+
+        Returns:
+            List[date]: The days.
+        """
+
+        first = date(year, month, 1)
+        last = (first + timedelta(days=31)).replace(day=1) - ONE_DAY
+
+        if self.month_days:
+            days = []
+            for month_day in self.month_days:
+                day = month_day if month_day > 0 else last.day + 1 + month_day
+                if 1 <= day <= last.day:
+                    days.append(first.replace(day=day))
+            return days
+
+        if self.weekdays:
+            return _get_weekdays(first, last, self.weekdays)
+
+        if self.start.day <= last.day:
+            return [first.replace(day=self.start.day)]
+
+        return []
+
+
+class _Event(NamedTuple):
+    """
+    The closure of an event.
+
+    Attributes:
+        start (datetime): The start, midnight for all-day events.
+        duration (timedelta): How long each occurrence lasts.
+        all_day (bool): Whether the event is on whole days.
+        zone (tzinfo): The time zone of the times, None for floating times.
+        recurrence (Recurrence): The RRULE, None for single events.
+        extra (Tuple[datetime, ...]): Starts of additional occurrences (RDATE).
+        excluded (FrozenSet[datetime]): Starts of skipped occurrences (EXDATE).
+    """
+
+    start: datetime
+    duration: timedelta
+    all_day: bool
+    zone: Optional[tzinfo]
+    recurrence: Optional[Recurrence]
+    extra: Tuple[datetime, ...]
+    excluded: FrozenSet[datetime]
+
+
+class ICalendar(HolidayCalendar):
+    """
+    The closures of the events of an iCalendar feed.
+
+    Single events are filed under the years they cover, and timed ones under
+    the years next to them too, as converting them into the calendar's time
+    zone can move them across a new year. Recurring events are
+    expanded for a year the first time it is used, so a daily rule running
+    for centuries only holds memory for the years that are looked up; the
+    years before them are expanded to count the working time they lose and
+    dropped again.
+    """
+
+    def __init__(
+        self,
+        events: Iterable[_Event],
+        time_zone: Optional[tzinfo] = None,
+        description: Optional[str] = None,
+    ):
+        """
+        Args:
+            events (Iterable[_Event]): The events, as read by read_events.
+            time_zone (tzinfo): The time zone of the calendar. Defaults to
+                taking the times of the events as wall time.
+            description (str): A human readable description of the calendar.
+        """
+
+        super().__init__(description=description)
+        self.time_zone = time_zone
+
+        self._single: Dict[int, List[_Event]] = {}
+        self._recurring: List[_Event] = []
+        first_year, last_year = MAXYEAR, 0
+        for event in events:
+            first_year = min(first_year, event.start.year)
+            if event.recurrence is None and not event.extra:
+                end = event.start + event.duration
+                years = range(event.start.year, end.year + 1)
+                if not event.all_day:
+                    years = range(max(years.start - 1, 1), min(years.stop, MAXYEAR) + 1)
+                for year in years:
+                    self._single.setdefault(year, []).append(event)
+                last_year = max(last_year, end.year)
+            else:
+                self._recurring.append(event)
+                last_year = max(
+                    last_year,
+                    event.recurrence.last_year if event.recurrence else 0,
+                    *(start.year for start in event.extra),
+                )
+
+        # Conversions into the calendar's time zone can cross a new year
+        self._event_years = range(1, 1)
+        if first_year <= last_year:
+            self._event_years = range(
+                max(first_year - 1, 1), min(last_year + 1, MAXYEAR) + 1
+            )
+
+    @classmethod
+    def load(
+        cls,
+        source: Union[str, os.PathLike, Iterable[str]],
+        time_zone: Union[tzinfo, str, None] = None,
+        description: Optional[str] = None,
+    ) -> "ICalendar":
+        """
+        Import the events of an iCalendar file, reading it line by line.
+
+        Args:
+            source (Union[str, os.PathLike, Iterable[str]]): The path of the
+                .ics file, or its lines, e.g. an open file or a response body.
+            time_zone (Union[tzinfo, str]): The time zone of the calendar, as
+                a tzinfo or an IANA key. Defaults to wall time.
+            description (str): A human readable description of the calendar.
+
+        Returns:
+            ICalendar: The calendar.
+
+        Raises:
+            ValueError: If a line or a value is invalid.
+        """
+
+        if isinstance(time_zone, str):
+            time_zone = ZoneInfo(time_zone)
+
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, encoding="utf-8") as lines:
+                return cls(read_events(lines), time_zone, description)
+
+        return cls(read_events(source), time_zone, description)
+
+    @property
+    def year_range(self) -> range:
+        """
+        range: The years that may contain closures.
+        """
+
+        return self._event_years
+
+    def _compile_year(self, year: int) -> HolidayYear:
+        """
+        Close the days and parts of days the events of a year cover.
+
+        Args:
+            year (int): The year.
+
+        Returns:
+            HolidayYear: The full-day bitset and partial-day closures.
+        """
+
+        mask = 0
+        partial: Dict[int, List[List[int]]] = {}
+        if year not in self._event_years:
+            return HolidayYear(year, mask, partial)
+
+        first = date(year, 1, 1)
+        last = date(year, 12, 31)
+        occurrences = [(event, event.start) for event in self._single.get(year, ())] + [
+            (event, start)
+            for event in self._recurring
+            for start in self._get_starts(event, first, last)
+        ]
+
+        for event, start in occurrences:
+            end = start + event.duration
+            if not event.all_day:
+                start = self._to_wall(start, event.zone)
+                end = self._to_wall(end, event.zone)
+
+            day = max(start.date(), first)
+            while day <= min(end.date(), last):
+                midnight = datetime.combine(day, time())
+                closed_start = max(start, midnight)
+                closed_end = min(end, midnight + ONE_DAY)
+                if closed_end - closed_start == ONE_DAY:
+                    mask |= 1 << _day_of_year(day)
+                elif closed_start < closed_end:
+                    partial.setdefault(_day_of_year(day), []).append(
+                        [
+                            _to_microseconds(closed_start.time()),
+                            (
+                                _to_microseconds(closed_end.time())
+                                if closed_end < midnight + ONE_DAY
+                                else MICROSECONDS_PER_DAY
+                            ),
+                        ]
+                    )
+                day += ONE_DAY
+
+        return HolidayYear(
+            year,
+            mask,
+            {
+                day: _merge(intervals)
+                for day, intervals in partial.items()
+                if not mask >> day & 1
+            },
+        )
+
+    def _get_starts(self, event: _Event, first: date, last: date) -> List[datetime]:
+        """
+        Get the occurrences of a recurring event that can cover a year.
+
+        Args:
+            event (_Event): The event.
+            first (date): January 1st of the year.
+            last (date): December 31st of the year.
+
+        Returns:
+            List[datetime]: The starts of the occurrences.
+        """
+
+        # Occurrences starting before the year can still run into it, and
+        # conversions can move them by a day
+        earliest = date.min
+        if first.toordinal() > event.duration.days + 2:
+            earliest = first - timedelta(days=event.duration.days + 2)
+        latest = last + ONE_DAY if last.year < MAXYEAR else last
+
+        starts = []
+        if event.recurrence is not None:
+            starts.extend(event.recurrence.between(earliest, latest))
+        starts.extend(
+            start for start in event.extra if earliest <= start.date() <= latest
+        )
+
+        return [start for start in starts if start not in event.excluded]
+
+    def _to_wall(self, date_time: datetime, zone: Optional[tzinfo]) -> datetime:
+        """
+        Convert an event time into the wall time of the calendar.
+
+        Args:
+            date_time (datetime): The naive time in the event's time zone.
+            zone (tzinfo): The event's time zone, None for floating times.
+
+        Returns:
+            datetime: The naive wall time.
+        """
+
+        if zone is None or self.time_zone is None:
+            return date_time
+
+        return _convert(date_time, zone, self.time_zone)
+
+
+def read_events(lines: Iterable[str]) -> Iterator[_Event]:
+    """
+    Read the events of an iCalendar stream one at a time.
+
+    Folded lines are unfolded, and only the properties of VEVENT components
+    needed for closures are parsed. Time zone definitions are skipped, TZID
+    parameters are looked up in the tz database.
+
+    Args:
+        lines (Iterable[str]): The lines of the stream.
+
+    Returns:
+        Iterator[_Event]: The events that are not cancelled.
+
+    Raises:
+        ValueError: If a line or a value is invalid.
+    """
+
+    properties: Optional[Dict[str, Tuple[Dict[str, str], List[str]]]] = None
+    for line in _unfold(lines):
+        name, parameters, value = _parse_line(line)
+        if name == "BEGIN" and value.upper() == "VEVENT":
+            properties = {}
+        elif name == "END" and value.upper() == "VEVENT":
+            if properties is not None:
+                event = _make_event(properties)
+                if event is not None:
+                    yield event
+            properties = None
+        elif properties is not None:
+            if name in properties:
+                # EXDATE and RDATE can be repeated
+                properties[name][1].append(value)
+            else:
+                properties[name] = (parameters, [value])
+
+
+def _make_event(
+    properties: Dict[str, Tuple[Dict[str, str], List[str]]],
+) -> Optional[_Event]:
+    """
+    Build the closure of an event from its properties.
+
+    Args:
+        properties (Dict[str, Tuple[Dict[str, str], List[str]]]): The
+            parameters and values of each property of the event.
+
+    Returns:
+        Optional[_Event]: The event, or None if it is cancelled or has no start.
+    """
+
+    if "DTSTART" not in properties:
+        return None
+    if properties.get("STATUS", ({}, [""]))[1][0].upper() == "CANCELLED":
+        return None
+
+    parameters, values = properties["DTSTART"]
+    start, zone, all_day = _parse_date_time(values[0], parameters)
+
+    return _Event(
+        start,
+        _get_duration(properties, start, zone, all_day),
+        all_day,
+        zone,
+        _get_recurrence(properties, start, zone),
+        tuple(_parse_dates(properties, "RDATE", zone)),
+        frozenset(_parse_dates(properties, "EXDATE", zone)),
+    )
+
+
+def _get_duration(
+    properties: Dict[str, Tuple[Dict[str, str], List[str]]],
+    start: datetime,
+    zone: Optional[tzinfo],
+    all_day: bool,
+) -> timedelta:
+    """
+    Get the duration of an event from its end or duration.
+
+    Args:
+        properties (Dict[str, Tuple[Dict[str, str], List[str]]]): The
+            parameters and values of each property of the event.
+        start (datetime): The naive start of the event.
+        zone (tzinfo): The time zone of the start, or None.
+        all_day (bool): Whether the event starts on a date without a time.
+
+    Returns:
+        timedelta: The duration. Events with neither last a day if they
+            are all day, and no time otherwise.
+    """
+
+    if "DTEND" in properties:
+        end_parameters, end_values = properties["DTEND"]
+        end, end_zone, _ = _parse_date_time(end_values[0], end_parameters)
+        if end_zone is not None and zone is not None and end_zone is not zone:
+            end = _convert(end, end_zone, zone)
+        return end - start
+
+    if "DURATION" in properties:
+        return _parse_duration(properties["DURATION"][1][0])
+
+    return ONE_DAY if all_day else timedelta()
+
+
+def _get_recurrence(
+    properties: Dict[str, Tuple[Dict[str, str], List[str]]],
+    start: datetime,
+    zone: Optional[tzinfo],
+) -> Optional[Recurrence]:
+    """
+    Get the recurrence rule of an event.
+
+    Args:
+        properties (Dict[str, Tuple[Dict[str, str], List[str]]]): The
+            parameters and values of each property of the event.
+        start (datetime): The naive start of the event.
+        zone (tzinfo): The time zone of the start, or None.
+
+    Returns:
+        Optional[Recurrence]: The rule, or None if the event does not recur.
+    """
+
+    if "RRULE" not in properties:
+        return None
+
+    return Recurrence(properties["RRULE"][1][0], start, zone)
+
+
+def _parse_dates(
+    properties: Dict[str, Tuple[Dict[str, str], List[str]]],
+    name: str,
+    zone: Optional[tzinfo],
+) -> List[datetime]:
+    """
+    Parse the comma separated dates of every RDATE or EXDATE of an event.
+
+    Args:
+        properties (Dict[str, Tuple[Dict[str, str], List[str]]]): The
+            parameters and values of each property of the event.
+        name (str): The name of the property.
+        zone (tzinfo): The time zone of the event's start, which dates in
+            other time zones are converted to, or None.
+
+    Returns:
+        List[datetime]: The naive dates and times.
+    """
+
+    dates = []
+    parameters, values = properties.get(name, ({}, []))
+    for value in values:
+        for item in value.split(","):
+            if item:
+                day, day_zone, _ = _parse_date_time(item, parameters)
+                if day_zone is not None and zone is not None:
+                    day = _convert(day, day_zone, zone)
+                dates.append(day)
+
+    return dates
+
+
+def _unfold(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Join folded lines, which continue on lines starting with a space or tab.
+
+    Args:
+        lines (Iterable[str]): The raw lines.
+
+    Returns:
+        Iterator[str]: The logical lines, without line endings.
+    """
+
+    current = None
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current:
+            yield current
+        current = line
+    if current:
+        yield current
+
+
+def _parse_line(line: str) -> Tuple[str, Dict[str, str], str]:
+    """
+    Split a content line into its name, parameters and value.
+
+    Args:
+        line (str): The unfolded line, e.g. DTSTART;TZID=Europe/Budapest:20251224T130000.
+
+    Returns:
+        Tuple[str, Dict[str, str], str]: The upper case name, the parameters
+            and the value.
+
+    Raises:
+        ValueError: If the line has no value.
+    """
+
+    # The value starts at the first colon outside a quoted parameter value
+    quoted = False
+    for position, character in enumerate(line):
+        if character == '"':
+            quoted = not quoted
+        elif character == ":" and not quoted:
+            break
+    else:
+        raise ValueError(INVALID_LINE_MESSAGE.format(line))
+
+    name, *parameter_items = line[:position].split(";")
+    parameters = {}
+    for item in parameter_items:
+        key, _, parameter = item.partition("=")
+        parameters[key.upper()] = parameter.strip('"')
+
+    return name.upper(), parameters, line[position + 1 :]  # noqa: E203
+
+
+def _parse_date_time(
+    value: str, parameters: Dict[str, str]
+) -> Tuple[datetime, Optional[tzinfo], bool]:
+    """
+    Parse a DATE or DATE-TIME value.
+
+    Args:
+        value (str): The value, e.g. 20251225 or 20251224T130000Z.
+        parameters (Dict[str, str]): The parameters of the property.
+
+    Returns:
+        Tuple[datetime, Optional[tzinfo], bool]: The naive date and time, its
+            time zone (None for floating times and dates) and whether it is a
+            date.
+
+    Raises:
+        ValueError: If the value is invalid.
+    """
+
+    try:
+        if "T" not in value:
+            return datetime.strptime(value, "%Y%m%d"), None, True
+
+        zone = None
+        if value.endswith("Z"):
+            zone = timezone.utc
+            value = value[:-1]
+        elif "TZID" in parameters:
+            zone = _get_zone(parameters["TZID"])
+
+        return datetime.strptime(value, "%Y%m%dT%H%M%S"), zone, False
+    except ValueError:
+        raise ValueError(INVALID_VALUE_MESSAGE.format(value)) from None
+
+
+def _parse_duration(value: str) -> timedelta:
+    """
+    Parse a DURATION value, e.g. P1D, PT4H30M or P2W.
+
+    Args:
+        value (str): The value.
+
+    Returns:
+        timedelta: The duration.
+
+    Raises:
+        ValueError: If the value is invalid.
+    """
+
+    sign = -1 if value.startswith("-") else 1
+    text = value.lstrip("+-")
+    if not text.startswith("P"):
+        raise ValueError(INVALID_VALUE_MESSAGE.format(value))
+
+    units = {"W": "weeks", "D": "days", "H": "hours", "M": "minutes", "S": "seconds"}
+    amounts: Dict[str, int] = {}
+    number = ""
+    for character in text[1:]:
+        if character.isdigit():
+            number += character
+        elif character == "T":
+            continue
+        elif character in units and number:
+            amounts[units[character]] = int(number)
+            number = ""
+        else:
+            raise ValueError(INVALID_VALUE_MESSAGE.format(value))
+
+    return sign * timedelta(**amounts)
+
+
+def _get_zone(key: str) -> Optional[tzinfo]:
+    """
+    Look up a TZID in the tz database.
+
+    Args:
+        key (str): The TZID, e.g. Europe/Budapest.
+
+    Returns:
+        Optional[tzinfo]: The time zone, or None for names it does not know
+            (such as Windows names), whose times are taken as wall time.
+    """
+
+    try:
+        return ZoneInfo(key)
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
+
+
+def _convert(date_time: datetime, source: tzinfo, target: tzinfo) -> datetime:
+    """
+    Convert a naive date and time from one time zone to another.
+
+    Args:
+        date_time (datetime): The naive date and time in source.
+        source (tzinfo): Its time zone.
+        target (tzinfo): The time zone to convert into.
+
+    Returns:
+        datetime: The naive date and time in target.
+    """
+
+    return date_time.replace(tzinfo=source).astimezone(target).replace(tzinfo=None)
+
+
+def _matches_month_day(day: date, month_days: List[int]) -> bool:
+    """
+    Check whether a day is one of some days of its month.
+
+    Args:
+        day (date): The day.
+        month_days (List[int]): Days of the month, negative ones counting
+            from the end (-1 is the last day).
+
+    Returns:
+        bool: Whether the day matches.
+    """
+
+    days_in_month = (
+        (day.replace(day=28) + timedelta(days=4)).replace(day=1) - ONE_DAY
+    ).day
+
+    return day.day in month_days or day.day - days_in_month - 1 in month_days
+
+
+def _get_weekdays(
+    first: date, last: date, weekdays: List[Tuple[Optional[int], int]]
+) -> List[date]:
+    """
+    Get the days between two dates that are one of some weekdays, or the nth
+    such weekday counting from first (or from last for negative n).
+
+    Args:
+        first (date): The first day.
+        last (date): The last day, included.
+        weekdays (List[Tuple[Optional[int], int]]): n, or None for every one,
+            and the weekday, Monday (0) to Sunday (6).
+
+    Returns:
+        List[date]: The days.
+    """
+
+    days = []
+    for n, weekday in weekdays:
+        first_match = first + timedelta(days=(weekday - first.weekday()) % 7)
+        if n is None:
+            day = first_match
+            while day <= last:
+                days.append(day)
+                day += timedelta(days=7)
+        elif n > 0:
+            day = first_match + timedelta(days=7 * (n - 1))
+            if day <= last:
+                days.append(day)
+        else:
+            last_match = last - timedelta(days=(last.weekday() - weekday) % 7)
+            day = last_match - timedelta(days=7 * (-n - 1))
+            if day >= first:
+                days.append(day)
+
+    return days
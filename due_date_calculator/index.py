@@ -0,0 +1,284 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import List, Optional, Sequence
+
+from .holidays import HolidayCalendar, _first_day_of_year
+from .schedule import MICROSECONDS_PER_DAY, MICROSECONDS_PER_SECOND, WorkSchedule
+
+INVALID_INDEX_MESSAGE = "Day index must have an entry for every day of its years"
+
+
+class DayIndex:
+    """
+    The work ordinal at the start of every day of a range of years.
+
+    The index is an array of cumulative working time, one entry per day plus
+    one for the end of the range. Finding the day a work ordinal falls on is
+    a single bisect, and only the intervals of that day are looked at to find
+    the instant within it.
+    """
+
+    def __init__(
+        self,
+        schedule: WorkSchedule,
+        holidays: Optional[HolidayCalendar] = None,
+        years: range = range(1970, 2101),
+        index: Optional[array] = None,
+    ):
+        """
+        Args:
+            schedule (WorkSchedule): The working hours.
+            holidays (HolidayCalendar): The closures. Defaults to none.
+            years (range): The years covered by the index.
+            index (array): The work ordinal at the start of every day and at
+                the end of the last one, e.g. loaded from a cache. Defaults to
+                summing the working time of every day.
+
+        Raises:
+            ValueError: If index does not have an entry for every day.
+        """
+
+        if holidays is None:
+            holidays = HolidayCalendar()
+
+        self.schedule = schedule
+        self.holidays = holidays
+        self.years = years
+        self.first_day = _first_day_of_year(years.start)
+
+        # Working intervals of each weekday as offsets since midnight
+        self._day_intervals: List[List[List[int]]] = [[] for _ in range(7)]
+        for start, end in schedule.intervals:
+            for weekday in range(start // MICROSECONDS_PER_DAY, 7):
+                midnight = weekday * MICROSECONDS_PER_DAY
+                if end <= midnight:
+                    break
+                self._day_intervals[weekday].append(
+                    [
+                        max(start, midnight) - midnight,
+                        min(end, midnight + MICROSECONDS_PER_DAY) - midnight,
+                    ]
+                )
+
+        if index is None:
+            index = self._build()
+        elif len(index) != _first_day_of_year(years.stop) - self.first_day + 1:
+            raise ValueError(INVALID_INDEX_MESSAGE)
+        self._index: Optional[array] = index
+        holidays._add_dependent(self)
+
+    @property
+    def index(self) -> array:
+        """
+        array: The work ordinal at the start of every day, rebuilt on first
+            use after the holiday calendar changed.
+        """
+
+        index = self._index
+        if index is None:
+            index = self._index = self._build()
+
+        return index
+
+    @property
+    def nbytes(self) -> int:
+        """
+        int: The memory held by the index, in bytes.
+        """
+
+        if self._index is None:
+            return 0
+
+        return self._index.itemsize * len(self._index)
+
+    def invalidate(self) -> None:
+        """
+        Drop the index, after the holiday calendar changed.
+        """
+
+        self._index = None
+
+    def _build(self) -> array:
+        """
+        Sum the working time of every day of the years.
+
+        Returns:
+            array: The work ordinal at the start of every day, and at the end
+                of the last one.
+        """
+
+        day_lengths = [
+            sum(end - start for start, end in intervals)
+            for intervals in self._day_intervals
+        ]
+
+        ordinal = self.holidays.compile(self.schedule).year_start(self.years.start)
+        index = array("q", [ordinal])
+        for year in self.years:
+            holiday_year = self.holidays.get_year(year)
+            first_day = _first_day_of_year(year)
+            for day in range(_first_day_of_year(year + 1) - first_day):
+                if holiday_year.mask >> day & 1:
+                    pass
+                elif day in holiday_year.closures:
+                    ordinal += sum(
+                        end - start
+                        for start, end in self._get_intervals(first_day + day)
+                    )
+                else:
+                    ordinal += day_lengths[(first_day + day - 1) % 7]
+                index.append(ordinal)
+
+        return index
+
+    def to_work_microseconds(self, date_time: datetime) -> Optional[int]:
+        """
+        Convert a date and time into microseconds of working time since the epoch.
+
+        Args:
+            date_time (datetime): The date and time to convert.
+
+        Returns:
+            Optional[int]: The number of working microseconds between the epoch
+                and date_time, or None if date_time is outside the index.
+        """
+
+        index = self.index
+        day = date_time.toordinal()
+        position = day - self.first_day
+        if not 0 <= position < len(index) - 1:
+            return None
+
+        time_of_day = (
+            (date_time.hour * 60 + date_time.minute) * 60 + date_time.second
+        ) * MICROSECONDS_PER_SECOND + date_time.microsecond
+
+        ordinal = index[position]
+        for start, end in self._get_intervals(day):
+            if time_of_day <= start:
+                break
+            ordinal += min(time_of_day, end) - start
+
+        return ordinal
+
+    def from_work_microseconds(
+        self, ordinal: int, prefer_end: bool = False
+    ) -> Optional[datetime]:
+        """
+        Convert microseconds of working time since the epoch into a date and time.
+
+        Args:
+            ordinal (int): The number of working microseconds since the epoch.
+            prefer_end (bool): Return the end of a working interval rather than
+                the start of the next one when the ordinal is on a boundary.
+
+        Returns:
+            Optional[datetime]: The working instant the ordinal refers to, or
+                None if it is outside the index.
+        """
+
+        index = self.index
+        if prefer_end:
+            if not index[0] < ordinal <= index[-1]:
+                return None
+            position = bisect_left(index, ordinal) - 1
+        else:
+            if not index[0] <= ordinal < index[-1]:
+                return None
+            position = bisect_right(index, ordinal) - 1
+
+        day = self.first_day + position
+        work = ordinal - index[position]
+        for start, end in self._get_intervals(day):
+            if work < end - start or (prefer_end and work == end - start):
+                break
+            work -= end - start
+
+        return datetime.fromordinal(day) + timedelta(microseconds=start + work)
+
+    def _get_intervals(self, day: int) -> Sequence[List[int]]:
+        """
+        Get the working intervals of a day, less its closures.
+
+        Args:
+            day (int): The proleptic Gregorian ordinal of the day.
+
+        Returns:
+            Sequence[List[int]]: Start and end offsets since midnight in
+                microseconds.
+        """
+
+        intervals = self._day_intervals[(day - 1) % 7]
+
+        year = datetime.fromordinal(day).year
+        holiday_year = self.holidays.get_year(year)
+        day_of_year = day - _first_day_of_year(year)
+        if holiday_year.mask >> day_of_year & 1:
+            return ()
+
+        closures = holiday_year.closures.get(day_of_year)
+        if not closures:
+            return intervals
+
+        # Cut the closed intervals out of the working intervals
+        open_intervals = []
+        for start, end in intervals:
+            for closed_start, closed_end in closures:
+                if closed_start > start:
+                    open_intervals.append([start, min(end, closed_start)])
+                start = max(start, closed_end)
+                if start >= end:
+                    break
+            if start < end:
+                open_intervals.append([start, end])
+
+        return open_intervals
+
+
+def get_day_index(
+    schedule: WorkSchedule, holidays: Optional[HolidayCalendar], years: range
+) -> DayIndex:
+    """
+    Get the day index of a schedule and holiday calendar, shared by every
+    calculator that uses them.
+
+    Indexes of a calendar are kept by the calendar itself, so they are freed
+    along with it, e.g. when a registry drops a tenant's calculator.
+
+    Args:
+        schedule (WorkSchedule): The working hours.
+        holidays (HolidayCalendar): The closures, or None.
+        years (range): The years covered by the index.
+
+    Returns:
+        DayIndex: The day index.
+    """
+
+    if holidays is None:
+        return _get_day_index_without_holidays(schedule, years)
+
+    key = (schedule, years)
+    day_index = holidays._day_indexes.get(key)
+    if day_index is None:
+        day_index = holidays._day_indexes[key] = DayIndex(schedule, holidays, years)
+
+    return day_index
+
+
+@lru_cache(maxsize=128)
+def _get_day_index_without_holidays(schedule: WorkSchedule, years: range) -> DayIndex:
+    """
+    Get the day index of a schedule without closures, shared by every
+    calculator that uses it.
+
+    Args:
+        schedule (WorkSchedule): The working hours.
+        years (range): The years covered by the index.
+
+    Returns:
+        DayIndex: The day index.
+    """
+
+    return DayIndex(schedule, None, years)
@@ -0,0 +1,264 @@
+from bisect import bisect_left
+from datetime import date
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from .holidays import (
+    ClosureTable,
+    HolidayCalendar,
+    HolidayYear,
+    _YearTable,
+    _day_of_year,
+    _merge,
+    _span,
+)
+from .schedule import Interval, WorkSchedule
+
+
+class CalendarLayer(HolidayCalendar):
+    """
+    A holiday calendar that inherits the closures of a parent calendar and
+    stores only its own changes, e.g. a team's calendar on top of its
+    region's, on top of the company's.
+
+    A layer adds full-day and partial-day closures and can reopen days its
+    ancestors close. Years it does not change are the parent's compiled
+    years and closure tables themselves, and the working time lost before a
+    year is the parent's plus the difference in the changed years, so any
+    number of layers share the memory of their ancestors. A layer is
+    invalidated whenever one of its ancestors changes.
+    """
+
+    def __init__(
+        self,
+        parent: HolidayCalendar,
+        holidays: Iterable[date] = (),
+        closures: Optional[Mapping[date, Sequence[Interval]]] = None,
+        open_days: Iterable[date] = (),
+        description: Optional[str] = None,
+    ):
+        """
+        Args:
+            parent (HolidayCalendar): The calendar to inherit closures from.
+            holidays (Iterable[date]): Days that are closed all day.
+            closures (Mapping[date, Sequence[Interval]]): Closed intervals on
+                days that are only partly closed.
+            open_days (Iterable[date]): Days on which the closures of the
+                ancestors do not apply.
+            description (str): A human readable description of the calendar.
+
+        Raises:
+            ValueError: If a closed interval ends before it starts.
+        """
+
+        self.parent = parent
+        # Bitsets of the reopened days, per year
+        self._open: Dict[int, int] = {}
+        super().__init__(holidays, closures, description)
+        self._reopen(open_days)
+        self._set_year_range()
+        parent._add_dependent(self)
+
+    @property
+    def year_range(self) -> range:
+        """
+        range: The years that may contain closures.
+        """
+
+        return self._year_range
+
+    def update(
+        self,
+        holidays: Iterable[date] = (),
+        closures: Optional[Mapping[date, Sequence[Interval]]] = None,
+        removed: Iterable[date] = (),
+        open_days: Iterable[date] = (),
+    ) -> None:
+        """
+        Change the closures of this layer.
+
+        Args:
+            holidays (Iterable[date]): Days to close all day.
+            closures (Mapping[date, Sequence[Interval]]): Closed intervals to
+                add on days that are only partly closed.
+            removed (Iterable[date]): Days whose changes are removed, so they
+                inherit the closures of the ancestors again.
+            open_days (Iterable[date]): Days to reopen.
+
+        Raises:
+            ValueError: If a closed interval ends before it starts.
+        """
+
+        removed = list(removed)
+        self._define(holidays, closures, removed)
+        for day in removed:
+            if day.year in self._open:
+                self._open[day.year] &= ~(1 << _day_of_year(day))
+        self._reopen(open_days)
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        self._set_year_range()
+        super().invalidate()
+
+    def compile(self, schedule: WorkSchedule) -> "LayerClosureTable":
+        table = self._tables.get(schedule)
+        if table is None:
+            table = self._tables[schedule] = LayerClosureTable(self, schedule)
+
+        return table
+
+    def is_changed(self, year: int) -> bool:
+        """
+        Check if this layer changes the closures of a year.
+
+        Args:
+            year (int): The year.
+
+        Returns:
+            bool: Whether the year differs from the parent's.
+        """
+
+        return year in self._defined or year in self._open
+
+    def _reopen(self, days: Iterable[date]) -> None:
+        """
+        Mark days as open whatever the ancestors close.
+
+        Args:
+            days (Iterable[date]): The days.
+        """
+
+        for day in days:
+            self._open[day.year] = self._open.get(day.year, 0) | 1 << _day_of_year(day)
+
+    def _set_year_range(self) -> None:
+        """
+        Span the years of the parent and of the closures of this layer.
+        """
+
+        self._year_range = _span(
+            [self.parent.year_range, range(self._first_year, self._last_year + 1)]
+        )
+
+    def _compile_year(self, year: int) -> HolidayYear:
+        """
+        Apply the changes of this layer to a year of the parent.
+
+        Args:
+            year (int): The year.
+
+        Returns:
+            HolidayYear: The full-day bitset and partial-day closures, the
+                parent's own if the year is not changed.
+        """
+
+        return self._apply_changes(self.parent.get_year(year))
+
+    def _peek_year(self, year: int) -> HolidayYear:
+        holiday_year = self._years.get(year)
+        if holiday_year is None:
+            holiday_year = self._apply_changes(self.parent._peek_year(year))
+
+        return holiday_year
+
+    def _apply_changes(self, inherited: HolidayYear) -> HolidayYear:
+        """
+        Apply the changes of this layer to the closures of the parent.
+
+        Args:
+            inherited (HolidayYear): The closures of a year of the parent.
+
+        Returns:
+            HolidayYear: The full-day bitset and partial-day closures, the
+                parent's own if the year is not changed.
+        """
+
+        year = inherited.year
+        if not self.is_changed(year):
+            return inherited
+
+        reopened = self._open.get(year, 0)
+        mask = inherited.mask & ~reopened
+        closures: Dict[int, List[List[int]]] = {
+            day: intervals
+            for day, intervals in inherited.closures.items()
+            if not reopened >> day & 1
+        }
+
+        defined = self._defined.get(year)
+        if defined is not None:
+            mask |= defined.mask
+            for day, intervals in defined.closures.items():
+                closures[day] = _merge(closures.get(day, []) + intervals)
+
+        return HolidayYear(
+            year,
+            mask,
+            {
+                day: intervals
+                for day, intervals in closures.items()
+                if not mask >> day & 1
+            },
+        )
+
+
+class LayerClosureTable(ClosureTable):
+    """
+    The closure table of a CalendarLayer, sharing the compiled years of the
+    parent's table for the years the layer does not change.
+    """
+
+    def __init__(self, calendar: CalendarLayer, schedule: WorkSchedule):
+        """
+        Args:
+            calendar (CalendarLayer): The closures.
+            schedule (WorkSchedule): The working hours the closures apply to.
+        """
+
+        super().__init__(calendar, schedule)
+        self.parent_table = calendar.parent.compile(schedule)
+        # The changed years, and the difference in working time lost to the
+        # parent's closures before each of them
+        self._changes: Optional[Tuple[List[int], List[int]]] = None
+
+    def invalidate(self) -> None:
+        super().invalidate()
+        self._changes = None
+
+    def lost_before_year(self, year: int) -> int:
+        years, differences = self._get_changes()
+
+        return (
+            self.parent_table.lost_before_year(year)
+            + differences[bisect_left(years, year)]
+        )
+
+    def _get_changes(self) -> Tuple[List[int], List[int]]:
+        """
+        Get the years the layer changes with the running total of the working
+        time it loses in them compared to the parent.
+
+        Returns:
+            Tuple[List[int], List[int]]: The sorted years, and the difference
+                before each of them and after the last.
+        """
+
+        changes = self._changes
+        if changes is None:
+            years = sorted(self.calendar._defined.keys() | self.calendar._open.keys())
+            differences = [0]
+            for year in years:
+                differences.append(
+                    differences[-1]
+                    + self._get_lost_in_year(year)
+                    - self.parent_table._get_lost_in_year(year)
+                )
+            changes = self._changes = (years, differences)
+
+        return changes
+
+    def _get_year_table(self, year: int) -> _YearTable:
+        if self.calendar.is_changed(year):
+            return super()._get_year_table(year)
+
+        return self.parent_table._get_year_table(year)
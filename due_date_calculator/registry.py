@@ -0,0 +1,223 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, NamedTuple, Optional
+
+from .calculator import DueDateCalculator
+from .index import _get_day_index_without_holidays
+from .timezones import get_zone_transitions
+
+INVALID_REGISTRY_SIZE_MESSAGE = "Registry must hold at least one calendar"
+
+
+class RegistryStats(NamedTuple):
+    """
+    The counters of a CalendarRegistry.
+
+    Attributes:
+        hits (int): Lookups served from the registry.
+        misses (int): Lookups that loaded a calendar.
+        evictions (int): Calendars dropped to stay within the limits.
+        entries (int): Calendars currently held.
+        nbytes (int): Approximate memory held by them, in bytes, counting
+            parts shared between calculators once.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    nbytes: int
+
+
+class CalendarRegistry:
+    """
+    Compiled calculators by tenant or calendar id, loaded on first use and
+    kept in a bounded least recently used cache.
+
+    Calculators compile the years they use lazily, so the memory of an entry
+    is measured again every time it is looked up. Parts shared between
+    calculators, like a holiday calendar or day index, are counted once.
+    When there are more than max_entries calculators, or they hold more than
+    max_bytes, the least recently used ones are evicted (the one just looked
+    up is always kept) and loaded again on their next use. Nothing else
+    keeps an evicted calculator's calendar alive.
+
+    Registries can be shared between threads. Lookups hold a lock, so a
+    calendar is loaded once even when several threads ask for it at once.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[Hashable], DueDateCalculator],
+        max_entries: int = 1024,
+        max_bytes: Optional[int] = None,
+    ):
+        """
+        Args:
+            loader (Callable[[Hashable], DueDateCalculator]): Builds the calculator
+                of a key, e.g. from a tenant's configuration. Raises KeyError
+                for unknown keys.
+            max_entries (int): The most calculators to keep.
+            max_bytes (int): The most memory the calculators may hold, in
+                bytes. Defaults to no limit.
+
+        Raises:
+            ValueError: If max_entries is less than 1.
+        """
+
+        if max_entries < 1:
+            raise ValueError(INVALID_REGISTRY_SIZE_MESSAGE)
+
+        self.loader = loader
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.nbytes = 0
+
+        # Calculators, least recently used first
+        self._entries: "OrderedDict[Hashable, DueDateCalculator]" = OrderedDict()
+        # The memory parts of the calculators by id: the part, the number of
+        # calculators holding it and its measured size
+        self._parts: Dict[int, List] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> DueDateCalculator:
+        """
+        Get the calculator of a key, loading it on first use.
+
+        Args:
+            key (Hashable): The tenant or calendar id.
+
+        Returns:
+            DueDateCalculator: The calculator.
+        """
+
+        with self._lock:
+            calculator = self._entries.get(key)
+            if calculator is None:
+                self.misses += 1
+                calculator = self.loader(key)
+                self._entries[key] = calculator
+                self._hold(calculator)
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+
+            # The calculator may have compiled more years since it was measured
+            self._measure(calculator)
+            self._evict()
+
+        return calculator
+
+    __getitem__ = get
+
+    def discard(self, key: Hashable) -> None:
+        """
+        Drop the calculator of a key, if it is held, e.g. after its
+        configuration changed.
+
+        Args:
+            key (Hashable): The tenant or calendar id.
+        """
+
+        with self._lock:
+            calculator = self._entries.pop(key, None)
+            if calculator is not None:
+                self._release(calculator)
+
+    def clear(self) -> None:
+        """
+        Drop every calculator, and the day indexes and time zone tables shared
+        by calculators of any registry. The counters are kept.
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self._parts.clear()
+            self.nbytes = 0
+            _get_day_index_without_holidays.cache_clear()
+            get_zone_transitions.cache_clear()
+
+    @property
+    def stats(self) -> RegistryStats:
+        """
+        RegistryStats: The hit, miss and eviction counters and current size.
+        """
+
+        with self._lock:
+            return RegistryStats(
+                self.hits, self.misses, self.evictions, len(self._entries), self.nbytes
+            )
+
+    def _hold(self, calculator: DueDateCalculator) -> None:
+        """
+        Count the memory parts of a calculator added to the registry.
+
+        Args:
+            calculator (DueDateCalculator): The calculator.
+        """
+
+        for part in calculator.memory_parts:
+            held = self._parts.get(id(part))
+            if held is None:
+                self._parts[id(part)] = [part, 1, 0]
+            else:
+                held[1] += 1
+
+    def _measure(self, calculator: DueDateCalculator) -> None:
+        """
+        Measure the memory parts of a calculator in the registry again.
+
+        Args:
+            calculator (DueDateCalculator): The calculator.
+        """
+
+        for part in calculator.memory_parts:
+            held = self._parts[id(part)]
+            nbytes = part.nbytes
+            self.nbytes += nbytes - held[2]
+            held[2] = nbytes
+
+    def _release(self, calculator: DueDateCalculator) -> None:
+        """
+        Stop counting the memory parts of a calculator dropped from the
+        registry, unless other calculators still hold them.
+
+        Args:
+            calculator (DueDateCalculator): The calculator.
+        """
+
+        for part in calculator.memory_parts:
+            held = self._parts[id(part)]
+            held[1] -= 1
+            if not held[1]:
+                del self._parts[id(part)]
+                self.nbytes -= held[2]
+
+    def _evict(self) -> None:
+        """
+        Drop least recently used calculators until the registry is within its
+        limits, keeping the most recently used one.
+        """
+
+        entries = self._entries
+        while len(entries) > 1 and (
+            len(entries) > self.max_entries
+            or self.max_bytes is not None
+            and self.nbytes > self.max_bytes
+        ):
+            _, calculator = entries.popitem(last=False)
+            self._release(calculator)
+            self.evictions += 1
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self):
+        return "{}({})".format(type(self).__name__, self.stats)
@@ -0,0 +1,290 @@
+from datetime import MAXYEAR, MINYEAR, date, timedelta
+from typing import Iterable, List, Optional
+
+from .holidays import HolidayCalendar, HolidayYear, _day_of_year
+
+INVALID_NTH_WEEKDAY_MESSAGE = "Nth weekday must be 1 to 5, or -1 to -5 from the end"
+INVALID_OBSERVED_MESSAGE = "Observed rule must be one of: monday, nearest"
+
+# How holidays falling on a weekend are observed
+OBSERVED_MONDAY = "monday"
+OBSERVED_NEAREST = "nearest"
+OBSERVED_RULES = (OBSERVED_MONDAY, OBSERVED_NEAREST)
+
+# Saturday and Sunday
+WEEKEND = (5, 6)
+
+
+class HolidayRule:
+    """
+    A rule that gives the date of a holiday in any year.
+
+    Subclasses implement get_date. The observed rule moves holidays that fall
+    on a weekend: monday moves them to the following Monday, nearest moves
+    Saturdays to the Friday before and Sundays to the Monday after.
+    """
+
+    def __init__(self, observed: Optional[str] = None):
+        """
+        Args:
+            observed (str): How a holiday on a weekend is observed: monday,
+                nearest or None to keep it on the weekend.
+
+        Raises:
+            ValueError: If observed is not a known rule.
+        """
+
+        if observed is not None and observed not in OBSERVED_RULES:
+            raise ValueError(INVALID_OBSERVED_MESSAGE)
+
+        self.observed = observed
+
+    def get_date(self, year: int) -> Optional[date]:
+        """
+        Get the date of the holiday in a year.
+
+        Args:
+            year (int): The year.
+
+        Returns:
+            Optional[date]: The date, or None if there is no holiday that year.
+        """
+
+        raise NotImplementedError
+
+    def get_observed_date(self, year: int) -> Optional[date]:
+        """
+        Get the date the holiday is observed on in a year.
+
+        The observed date can fall in the year before or after.
+
+        Args:
+            year (int): The year.
+
+        Returns:
+            Optional[date]: The date, or None if there is no holiday that year.
+        """
+
+        day = self.get_date(year)
+        if day is None or self.observed is None or day.weekday() not in WEEKEND:
+            return day
+
+        if self.observed == OBSERVED_NEAREST and day.weekday() == 5:
+            return day - timedelta(days=1)
+
+        return day + timedelta(days=7 - day.weekday())
+
+    @property
+    def follows_gregorian_cycle(self) -> bool:
+        """
+        bool: Whether the holiday falls on the same dates every 400 years.
+        """
+
+        return True
+
+
+class FixedDate(HolidayRule):
+    """
+    A holiday on the same day of the same month every year.
+    """
+
+    def __init__(self, month: int, day: int, observed: Optional[str] = None):
+        """
+        Args:
+            month (int): The month, 1 to 12.
+            day (int): The day of the month.
+            observed (str): How a holiday on a weekend is observed.
+        """
+
+        super().__init__(observed)
+        self.month = month
+        self.day = day
+
+    def get_date(self, year: int) -> Optional[date]:
+        try:
+            return date(year, self.month, self.day)
+        except ValueError:
+            # February 29th outside leap years
+            return None
+
+
+class NthWeekday(HolidayRule):
+    """
+    A holiday on the nth weekday of a month, e.g. the fourth Thursday of
+    November, or the last Monday of May for n = -1.
+    """
+
+    def __init__(
+        self, month: int, weekday: int, n: int, observed: Optional[str] = None
+    ):
+        """
+        Args:
+            month (int): The month, 1 to 12.
+            weekday (int): The weekday, Monday (0) to Sunday (6).
+            n (int): Which of the weekdays in the month, 1 to 5 from the start
+                or -1 to -5 from the end.
+            observed (str): How a holiday on a weekend is observed.
+
+        Raises:
+            ValueError: If n is out of range.
+        """
+
+        if n == 0 or not -5 <= n <= 5:
+            raise ValueError(INVALID_NTH_WEEKDAY_MESSAGE)
+
+        super().__init__(observed)
+        self.month = month
+        self.weekday = weekday
+        self.n = n
+
+    def get_date(self, year: int) -> Optional[date]:
+        if self.n > 0:
+            first = date(year, self.month, 1)
+            day = first + timedelta(
+                days=(self.weekday - first.weekday()) % 7 + 7 * (self.n - 1)
+            )
+        else:
+            if self.month == 12:
+                last = date(year, 12, 31)
+            else:
+                last = date(year, self.month + 1, 1) - timedelta(days=1)
+            day = last - timedelta(
+                days=(last.weekday() - self.weekday) % 7 + 7 * (-self.n - 1)
+            )
+
+        # There is no fifth weekday in every month
+        return day if day.month == self.month else None
+
+
+class EasterOffset(HolidayRule):
+    """
+    A holiday a number of days from Easter Sunday, e.g. -2 for Good Friday
+    or 1 for Easter Monday.
+    """
+
+    def __init__(self, days: int, observed: Optional[str] = None):
+        """
+        Args:
+            days (int): Days after Easter Sunday, negative for days before.
+            observed (str): How a holiday on a weekend is observed.
+        """
+
+        super().__init__(observed)
+        self.days = days
+
+    def get_date(self, year: int) -> Optional[date]:
+        return easter(year) + timedelta(days=self.days)
+
+    @property
+    def follows_gregorian_cycle(self) -> bool:
+        # The date of Easter only repeats every 5,700,000 years
+        return False
+
+
+class RuleCalendar(HolidayCalendar):
+    """
+    A holiday calendar generated from rules.
+
+    The holidays of a year are generated the first time the year is used and
+    cached, so a calendar spanning centuries holds no memory for the years
+    that are never touched. The working time lost in the years before is
+    counted from holidays generated and dropped again. Calendars whose rules
+    all follow the Gregorian cycle repeat every 400 years, so the working
+    time lost over whole cycles is only counted once.
+    """
+
+    def __init__(
+        self,
+        rules: Iterable[HolidayRule],
+        years: range = range(MINYEAR, MAXYEAR + 1),
+        description: Optional[str] = None,
+    ):
+        """
+        Args:
+            rules (Iterable[HolidayRule]): The holidays.
+            years (range): The years the rules apply to.
+            description (str): A human readable description of the calendar.
+        """
+
+        super().__init__(description=description)
+        self.rules: List[HolidayRule] = list(rules)
+        self.years = years
+
+        if all(rule.follows_gregorian_cycle for rule in self.rules):
+            self.cycle_years = 400
+
+    @property
+    def year_range(self) -> range:
+        """
+        range: The years that may contain closures.
+        """
+
+        return self.years
+
+    def _compile_year(self, year: int) -> HolidayYear:
+        """
+        Generate the holidays of a year.
+
+        Holidays observed on the same day as an earlier rule's holiday move to
+        the next weekday, e.g. Boxing Day after Christmas on a Saturday.
+
+        Args:
+            year (int): The year.
+
+        Returns:
+            HolidayYear: The full-day bitset of the holidays.
+        """
+
+        mask = 0
+        if year not in self.years:
+            return HolidayYear(year, mask, {})
+
+        # Observed dates can move across the turn of the year
+        neighbours = [
+            neighbour
+            for neighbour in (year - 1, year, year + 1)
+            if neighbour in self.years
+        ]
+
+        for neighbour in neighbours:
+            observed_days = set()
+            for rule in self.rules:
+                day = rule.get_observed_date(neighbour)
+                if day is None:
+                    continue
+                while rule.observed and day in observed_days:
+                    day += timedelta(days=1)
+                    while day.weekday() in WEEKEND:
+                        day += timedelta(days=1)
+                observed_days.add(day)
+                if day.year == year:
+                    mask |= 1 << _day_of_year(day)
+
+        return HolidayYear(year, mask, {})
+
+
+def easter(year: int) -> date:
+    """
+    Get the date of Easter Sunday in the Gregorian calendar.
+
+    Uses the anonymous Gregorian algorithm (Meeus/Jones/Butcher).
+
+    Args:
+        year (int): The year.
+
+    Returns:
+        date: Easter Sunday.
+    """
+
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7  # noqa: E741
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+
+    return date(year, month, day + 1)
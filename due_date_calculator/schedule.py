@@ -0,0 +1,546 @@
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta, tzinfo
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+from zoneinfo import ZoneInfo
+
+EMPTY_SCHEDULE_MESSAGE = "Work schedule must contain working time"
+INVALID_WEEKDAY_MESSAGE = "Weekday must be between 0 (Monday) and 6 (Sunday)"
+INVALID_INTERVAL_MESSAGE = "Working interval must end after it starts"
+DATE_OVERFLOW_MESSAGE = "Date is after the latest supported date"
+
+MICROSECONDS_PER_SECOND = 1_000_000
+MICROSECONDS_PER_MINUTE = 60 * MICROSECONDS_PER_SECOND
+MICROSECONDS_PER_HOUR = 60 * MICROSECONDS_PER_MINUTE
+MICROSECONDS_PER_DAY = 24 * MICROSECONDS_PER_HOUR
+MICROSECONDS_PER_WEEK = 7 * MICROSECONDS_PER_DAY
+
+DAY_NAMES = (
+    "Monday",
+    "Tuesday",
+    "Wednesday",
+    "Thursday",
+    "Friday",
+    "Saturday",
+    "Sunday",
+)
+
+# A working interval starting on a day, an end of time(0) stands for midnight
+# and an end at or before the start is on the next day
+Interval = Tuple[time, time]
+
+
+class WorkSchedule:
+    """
+    Working hours for each day of the week.
+
+    The intervals are compiled once into a weekly offset table: the start and
+    end of every working interval in microseconds since Monday midnight, plus
+    the working time before each interval. Converting between instants and
+    working time is then a lookup in that table, whatever the number of
+    intervals per day. Intervals that run past midnight, like a night shift
+    from 10PM to 6AM, continue on the next day; the ones running past Sunday
+    midnight are split at the end of the week.
+
+    Schedules combine with | (working time of either) and & (working time of
+    both) into a schedule with a single merged table. Schedules of regions in
+    different time zones are moved to UTC with to_utc first, so a
+    follow-the-sun schedule costs the same as the schedule of one region.
+    Such a schedule holds while the UTC offsets it was moved with apply.
+    """
+
+    def __init__(
+        self,
+        hours: Mapping[int, Sequence[Interval]],
+        description: Optional[str] = None,
+    ):
+        """
+        Args:
+            hours (Mapping[int, Sequence[Interval]]): The working intervals for
+                each weekday, Monday (0) to Sunday (6), by the day they start
+                on. Days that are left out have no working time.
+            description (str): A human readable description of the schedule,
+                used in error messages.
+
+        Raises:
+            ValueError: If a weekday is invalid, or if the schedule has no
+                working time at all.
+        """
+
+        intervals = []
+        for weekday, day_intervals in hours.items():
+            if weekday not in range(7):
+                raise ValueError(INVALID_WEEKDAY_MESSAGE)
+
+            for start, end in day_intervals:
+                start_offset = _to_microseconds(start)
+                end_offset = _to_microseconds(end)
+                if end_offset <= start_offset:
+                    # The interval ends on the next day
+                    end_offset += MICROSECONDS_PER_DAY
+
+                day_offset = weekday * MICROSECONDS_PER_DAY
+                start_offset += day_offset
+                end_offset += day_offset
+                if end_offset > MICROSECONDS_PER_WEEK:
+                    # Split at the end of the week
+                    intervals.append((0, end_offset - MICROSECONDS_PER_WEEK))
+                    end_offset = MICROSECONDS_PER_WEEK
+                intervals.append((start_offset, end_offset))
+
+        self._compile(intervals)
+        self.description = description
+
+    @classmethod
+    def from_hours(
+        cls,
+        start_hour: int,
+        end_hour: int,
+        working_days: Iterable[int] = range(0, 5),
+    ) -> "WorkSchedule":
+        """
+        Create a schedule with the same working hours on every working day.
+
+        Args:
+            start_hour (int): The hour working time starts.
+            end_hour (int): The hour working time ends.
+            working_days (Iterable[int]): The working weekdays, Monday (0) to
+                Sunday (6). Defaults to Monday to Friday.
+
+        Returns:
+            WorkSchedule: The schedule.
+        """
+
+        working_days = sorted(set(working_days))
+        interval = (time(start_hour), time(end_hour % 24))
+
+        return cls(
+            {weekday: [interval] for weekday in working_days},
+            description="{} to {}, {}".format(
+                _format_hour(start_hour),
+                _format_hour(end_hour),
+                _format_days(working_days),
+            ),
+        )
+
+    @classmethod
+    def from_intervals(
+        cls, intervals: Iterable[Tuple[int, int]], description: Optional[str] = None
+    ) -> "WorkSchedule":
+        """
+        Create a schedule from working intervals of the week.
+
+        Args:
+            intervals (Iterable[Tuple[int, int]]): Start and end offsets in
+                microseconds since Monday midnight, as returned by intervals.
+            description (str): A human readable description of the schedule.
+
+        Returns:
+            WorkSchedule: The schedule.
+
+        Raises:
+            ValueError: If there is no working time.
+        """
+
+        schedule = cls.__new__(cls)
+        schedule._compile(list(intervals))
+        schedule.description = description
+
+        return schedule
+
+    @classmethod
+    def continuous(cls) -> "WorkSchedule":
+        """
+        Create a schedule with working time around the clock, every day.
+
+        Returns:
+            WorkSchedule: The schedule.
+        """
+
+        return cls(
+            {weekday: [(time(0), time(0))] for weekday in range(7)},
+            description="24/7",
+        )
+
+    @property
+    def is_continuous(self) -> bool:
+        """
+        bool: Whether every instant of the week is working time.
+        """
+
+        return self._week_length == MICROSECONDS_PER_WEEK
+
+    @property
+    def week_length(self) -> int:
+        """
+        int: The working time in a week in microseconds.
+        """
+
+        return self._week_length
+
+    @property
+    def intervals(self) -> List[Tuple[int, int]]:
+        """
+        List[Tuple[int, int]]: The compiled working intervals as start and end
+            offsets in microseconds since Monday midnight.
+        """
+
+        return list(zip(self._starts, self._ends))
+
+    def describe(self) -> str:
+        """
+        Describe the working hours, e.g. for error messages.
+
+        Returns:
+            str: The description of the schedule, or if it has none the
+                working intervals of each weekday, like 9AM to 5PM, Monday to
+                Friday.
+        """
+
+        if self.description:
+            return self.description
+        if self.is_continuous:
+            return "24/7"
+
+        # Weekdays with the same intervals are listed together
+        days: Dict[Tuple[Tuple[int, int], ...], List[int]] = {}
+        for weekday in range(7):
+            midnight = weekday * MICROSECONDS_PER_DAY
+            hours = tuple(
+                (start - midnight, end - midnight)
+                for start, end in zip(self._starts, self._ends)
+                if midnight <= start < midnight + MICROSECONDS_PER_DAY
+            )
+            if hours:
+                days.setdefault(hours, []).append(weekday)
+
+        return "; ".join(
+            "{}, {}".format(
+                ", ".join(
+                    "{} to {}".format(_format_offset(start), _format_offset(end))
+                    for start, end in hours
+                ),
+                _format_days(weekdays),
+            )
+            for hours, weekdays in days.items()
+        )
+
+    def shift(self, offset: timedelta) -> "WorkSchedule":
+        """
+        Move the working hours by a fixed amount of time.
+
+        Args:
+            offset (timedelta): How far to move the working hours, negative to
+                move them earlier.
+
+        Returns:
+            WorkSchedule: The schedule with every interval moved, split at the
+                end of the week where it wraps around.
+        """
+
+        offset = offset // timedelta(microseconds=1) % MICROSECONDS_PER_WEEK
+
+        intervals = []
+        for start, end in zip(self._starts, self._ends):
+            start += offset
+            end += offset
+            if start >= MICROSECONDS_PER_WEEK:
+                start -= MICROSECONDS_PER_WEEK
+                end -= MICROSECONDS_PER_WEEK
+            elif end > MICROSECONDS_PER_WEEK:
+                intervals.append((0, end - MICROSECONDS_PER_WEEK))
+                end = MICROSECONDS_PER_WEEK
+            intervals.append((start, end))
+
+        return self.from_intervals(intervals, self.description)
+
+    def to_utc(self, time_zone: Union[tzinfo, str], on: date) -> "WorkSchedule":
+        """
+        Move working hours in the wall time of a time zone to UTC.
+
+        The schedule is moved by the UTC offset the time zone has at noon on
+        the given day, and is only valid while that offset applies. A single
+        weekly table cannot follow daylight saving changes, so a schedule
+        moved on a winter day is an hour off in summer: move the schedule
+        again, and combine it again, for each period between the offset
+        changes of the time zones involved.
+
+        Args:
+            time_zone (Union[tzinfo, str]): The time zone of the working hours,
+                as a tzinfo or an IANA key like Asia/Singapore.
+            on (date): The day whose UTC offset is used.
+
+        Returns:
+            WorkSchedule: The schedule in UTC.
+        """
+
+        if isinstance(time_zone, str):
+            time_zone = ZoneInfo(time_zone)
+
+        offset = time_zone.utcoffset(datetime.combine(on, time(12)))
+        schedule = self.shift(-offset)
+        if self.description:
+            schedule.description = "{} ({})".format(self.description, time_zone)
+
+        return schedule
+
+    def work_before(self, offset: int) -> int:
+        """
+        Get the working time in the week before the given offset.
+
+        Args:
+            offset (int): Microseconds since Monday midnight.
+
+        Returns:
+            int: The working time between Monday midnight and offset in
+                microseconds.
+        """
+
+        index = bisect_right(self._starts, offset) - 1
+        if index < 0:
+            return 0
+
+        return self._cumulative[index] + min(
+            offset - self._starts[index], self._ends[index] - self._starts[index]
+        )
+
+    def offset_of(self, work: int, prefer_end: bool = False) -> int:
+        """
+        Get the offset in the week at which the given working time is reached.
+
+        Working time that falls exactly on the end of an interval is reached
+        both at that end and at the start of the next interval. The start of
+        the next interval is returned unless prefer_end is set.
+
+        Args:
+            work (int): Working time since Monday midnight in microseconds,
+                from 0 to week_length.
+            prefer_end (bool): Return the end of the interval on boundaries.
+
+        Returns:
+            int: Microseconds since Monday midnight.
+        """
+
+        if prefer_end:
+            index = max(bisect_left(self._cumulative, work) - 1, 0)
+        else:
+            index = bisect_right(self._cumulative, work) - 1
+
+        return self._starts[index] + work - self._cumulative[index]
+
+    def day_end(self, midnight: int) -> int:
+        """
+        Get the end of the working day that runs up to a midnight.
+
+        A working day ends at midnight, unless a working interval runs
+        through midnight, in which case it ends with that interval, at most a
+        day later.
+
+        Args:
+            midnight (int): Microseconds since Monday midnight of a midnight,
+                up to the end of the week.
+
+        Returns:
+            int: Microseconds since the same Monday midnight, up to a day
+                after midnight.
+        """
+
+        offset = midnight % MICROSECONDS_PER_WEEK
+        index = bisect_right(self._starts, offset) - 1
+        if index >= 0 and self._starts[index] < offset < self._ends[index]:
+            end = self._ends[index] - offset
+        elif offset == 0 and self._ends[-1] == MICROSECONDS_PER_WEEK:
+            # Split at the end of the week
+            end = self._ends[0] if self._starts[0] == 0 else 0
+        else:
+            end = 0
+
+        return midnight + min(end, MICROSECONDS_PER_DAY)
+
+    def is_working(self, offset: int) -> bool:
+        """
+        Check if the given offset in the week is during working hours.
+
+        The end of a working interval counts as working time up to the end
+        of its first minute.
+
+        Args:
+            offset (int): Microseconds since Monday midnight.
+
+        Returns:
+            bool: Whether offset is during working hours.
+        """
+
+        index = bisect_right(self._starts, offset) - 1
+
+        return index >= 0 and offset < self._ends[index] + MICROSECONDS_PER_MINUTE
+
+    def _compile(self, intervals: List[Tuple[int, int]]):
+        """
+        Merge the working intervals and build the weekly offset table.
+
+        Args:
+            intervals (List[Tuple[int, int]]): Working intervals as start and
+                end offsets in microseconds since Monday midnight.
+
+        Raises:
+            ValueError: If there is no working time.
+        """
+
+        if not intervals:
+            raise ValueError(EMPTY_SCHEDULE_MESSAGE)
+
+        # Merge overlapping and touching intervals
+        merged = []
+        for start, end in sorted(intervals):
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+
+        self._starts = [start for start, _ in merged]
+        self._ends = [end for _, end in merged]
+
+        # Working time before each interval
+        self._cumulative = []
+        week_length = 0
+        for start, end in merged:
+            self._cumulative.append(week_length)
+            week_length += end - start
+        self._week_length = week_length
+
+    def __or__(self, other: "WorkSchedule") -> "WorkSchedule":
+        if not isinstance(other, WorkSchedule):
+            return NotImplemented
+        return self.from_intervals(
+            self.intervals + other.intervals,
+            _combine_descriptions(self.description, other.description, "or"),
+        )
+
+    def __and__(self, other: "WorkSchedule") -> "WorkSchedule":
+        if not isinstance(other, WorkSchedule):
+            return NotImplemented
+
+        # Walk both sorted interval lists, keeping the overlaps
+        intervals = []
+        first, second = self.intervals, other.intervals
+        i = j = 0
+        while i < len(first) and j < len(second):
+            start = max(first[i][0], second[j][0])
+            end = min(first[i][1], second[j][1])
+            if start < end:
+                intervals.append((start, end))
+            if first[i][1] < second[j][1]:
+                i += 1
+            else:
+                j += 1
+
+        return self.from_intervals(
+            intervals,
+            _combine_descriptions(self.description, other.description, "and"),
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, WorkSchedule):
+            return NotImplemented
+        return self._starts == other._starts and self._ends == other._ends
+
+    def __hash__(self):
+        return hash((tuple(self._starts), tuple(self._ends)))
+
+    def __repr__(self):
+        return "WorkSchedule({!r})".format(self.description or self.intervals)
+
+
+def _to_microseconds(value: time) -> int:
+    """
+    Convert a time of day into microseconds since midnight.
+
+    Args:
+        value (time): The time of day.
+
+    Returns:
+        int: Microseconds since midnight.
+    """
+
+    return (
+        (value.hour * 60 + value.minute) * 60 + value.second
+    ) * MICROSECONDS_PER_SECOND + value.microsecond
+
+
+def _combine_descriptions(
+    first: Optional[str], second: Optional[str], conjunction: str
+) -> Optional[str]:
+    """
+    Describe a combination of two schedules.
+
+    Args:
+        first (str): The description of the first schedule, or None.
+        second (str): The description of the second schedule, or None.
+        conjunction (str): The word joining the descriptions.
+
+    Returns:
+        Optional[str]: The description, or None unless both schedules have one.
+    """
+
+    if not first or not second:
+        return None
+
+    return "{} {} {}".format(first, conjunction, second)
+
+
+def _format_hour(hour: int) -> str:
+    """
+    Format an hour of the day like 9AM or 5PM.
+
+    Args:
+        hour (int): The hour of the day, 0 to 24.
+
+    Returns:
+        str: The formatted hour.
+    """
+
+    return "{}{}".format(hour % 12 or 12, "AM" if hour % 24 < 12 else "PM")
+
+
+def _format_offset(offset: int) -> str:
+    """
+    Format a time of day like 9AM or 9:30AM.
+
+    Args:
+        offset (int): Microseconds since midnight, taken modulo a day.
+
+    Returns:
+        str: The formatted time.
+    """
+
+    minutes = offset % MICROSECONDS_PER_DAY // MICROSECONDS_PER_MINUTE
+    hour, minute = divmod(minutes, 60)
+    if not minute:
+        return _format_hour(hour)
+
+    return "{}:{:02d}{}".format(hour % 12 or 12, minute, "AM" if hour < 12 else "PM")
+
+
+def _format_days(working_days: List[int]) -> str:
+    """
+    Format a list of weekdays like Monday to Friday.
+
+    Args:
+        working_days (List[int]): Sorted weekdays, Monday (0) to Sunday (6).
+
+    Returns:
+        str: The formatted weekdays.
+    """
+
+    if len(working_days) == 7:
+        return "{} to {}".format(DAY_NAMES[0], DAY_NAMES[6])
+
+    # A run of three or more consecutive days, possibly wrapping around the
+    # end of the week, is written as a range
+    if len(working_days) > 2:
+        first = next(day for day in working_days if (day - 1) % 7 not in working_days)
+        run = [(first + n) % 7 for n in range(len(working_days))]
+        if sorted(run) == working_days:
+            return "{} to {}".format(DAY_NAMES[run[0]], DAY_NAMES[run[-1]])
+
+    return ", ".join(DAY_NAMES[weekday] for weekday in working_days)
@@ -0,0 +1,577 @@
+"""
+Compiled calendars saved to a compact binary file and memory-mapped back.
+
+A snapshot holds everything a calculator compiles from its schedule and
+holidays over DueDateCalculator.INDEX_YEARS: the full-day bitset and
+partial-day closures of every year, the working time lost before every
+year, the work ordinal at the start of every day and the minute bitmaps of
+every year. Loading one is an mmap call: the arrays are read in place
+through memoryviews, so every process on a host shares one copy of them in
+the page cache and nothing is compiled at startup.
+
+The file starts with a fixed header (magic, format version and the length
+of the metadata), then JSON metadata (working hours, time zone, options and
+the offset of every section), then the sections, 8-byte aligned, as
+little-endian integers. Closures outside the years are not kept. Bitmaps
+are left out, and the metadata says why, when the working time is not on
+whole minutes.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from datetime import timezone, tzinfo
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+
+from .bitmap import (
+    BYTES_PER_YEAR,
+    UNALIGNED_BITMAP_MESSAGE,
+    WORDS_PER_BLOCK,
+    BitmapEngine,
+    MinuteBitmap,
+)
+from .calculator import ENGINE_BITMAP, ENGINE_DAILY, DueDateCalculator
+from .holidays import ClosureTable, HolidayCalendar, HolidayYear
+from .index import DayIndex, get_day_index
+from .schedule import WorkSchedule
+
+INVALID_SNAPSHOT_MESSAGE = "File is not a calendar snapshot"
+UNSUPPORTED_VERSION_MESSAGE = "Calendar snapshot version {} is not supported"
+SNAPSHOT_TIME_ZONE_MESSAGE = "Snapshot time zone must be an IANA time zone"
+READ_ONLY_SNAPSHOT_MESSAGE = (
+    "Snapshot calendars cannot change, layer the changes on them instead"
+)
+
+MAGIC = b"DDCSNAP\0"
+SNAPSHOT_VERSION = 1
+# Magic, format version and length of the metadata
+HEADER = struct.Struct("<8sII")
+ALIGNMENT = 8
+
+# The 366 bits of a year's full-day bitset, padded to whole words
+MASK_BYTES = 48
+WORDS_PER_YEAR = BYTES_PER_YEAR // 8
+BLOCKS_PER_YEAR = -(-WORDS_PER_YEAR // WORDS_PER_BLOCK) + 1
+
+
+class SnapshotCalendar(HolidayCalendar):
+    """
+    The closures of a snapshot, decoded from the mapped file per year on
+    first use.
+
+    The working time lost before every year is read from the file too, so
+    the closure table of the snapshot's schedule never sums the years
+    before the one it is asked about. Snapshot calendars are read-only;
+    changes go in a CalendarLayer on top of them.
+    """
+
+    def __init__(
+        self,
+        schedule: WorkSchedule,
+        years: range,
+        masks: memoryview,
+        closure_offsets: Sequence[int],
+        closures: Sequence[int],
+        lost_before_years: Sequence[int],
+        description: Optional[str] = None,
+    ):
+        """
+        Args:
+            schedule (WorkSchedule): The working hours the snapshot was
+                compiled against.
+            years (range): The years of the snapshot.
+            masks (memoryview): The full-day bitset of every year, MASK_BYTES
+                bytes each.
+            closure_offsets (Sequence[int]): The first partial-day closure of
+                every year, and the end of the last one.
+            closures (Sequence[int]): The day of the year, start and end of
+                every partial-day closure.
+            lost_before_years (Sequence[int]): The working time lost before
+                every year, and before the end of the last one.
+            description (str): A human readable description of the calendar.
+        """
+
+        super().__init__(description=description)
+        self.schedule = schedule
+        self._snapshot_years = years
+        self._masks = masks
+        self._closure_offsets = closure_offsets
+        self._closures = closures
+        self._lost_before_years = lost_before_years
+
+    @property
+    def year_range(self) -> range:
+        """
+        range: The years that may contain closures.
+        """
+
+        return self._snapshot_years
+
+    def compile(self, schedule: WorkSchedule) -> ClosureTable:
+        table = self._tables.get(schedule)
+        if table is None:
+            if schedule == self.schedule:
+                table = SnapshotClosureTable(self, schedule)
+            else:
+                table = ClosureTable(self, schedule)
+            self._tables[schedule] = table
+
+        return table
+
+    def update(self, holidays=(), closures=None, removed=()) -> None:
+        """
+        Raises:
+            ValueError: Always, the closures of a snapshot cannot change.
+        """
+
+        raise ValueError(READ_ONLY_SNAPSHOT_MESSAGE)
+
+    def get_lost_before_year(self, year: int) -> int:
+        """
+        Get the working time lost before January 1st of a year with the
+        snapshot's schedule.
+
+        Args:
+            year (int): The year.
+
+        Returns:
+            int: The working time lost in microseconds.
+        """
+
+        years = self._snapshot_years
+
+        return self._lost_before_years[min(max(year - years.start, 0), len(years))]
+
+    def _compile_year(self, year: int) -> HolidayYear:
+        """
+        Decode the closures of a year from the snapshot.
+
+        Args:
+            year (int): The year.
+
+        Returns:
+            HolidayYear: The full-day bitset and partial-day closures.
+        """
+
+        if year not in self._snapshot_years:
+            return HolidayYear(year, 0, {})
+
+        position = year - self._snapshot_years.start
+        start = position * MASK_BYTES
+        end = start + MASK_BYTES
+        mask = int.from_bytes(self._masks[start:end], "little")
+
+        closures: Dict[int, list] = {}
+        rows = self._closures
+        for row in range(
+            self._closure_offsets[position], self._closure_offsets[position + 1]
+        ):
+            closures.setdefault(rows[3 * row], []).append(
+                [rows[3 * row + 1], rows[3 * row + 2]]
+            )
+
+        return HolidayYear(year, mask, closures)
+
+
+class SnapshotClosureTable(ClosureTable):
+    """
+    The closure table of a snapshot's schedule, with the working time lost
+    before every year read from the snapshot.
+    """
+
+    def lost_before_year(self, year: int) -> int:
+        return self.calendar.get_lost_before_year(year)
+
+
+class CalendarSnapshot:
+    """
+    A calculator's compiled calendar, mapped from a snapshot file.
+
+    Calculators built from a snapshot share its calendar, day index and
+    bitmaps, and give the same results and work ordinals as the calculator
+    it was written from within its years.
+    """
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap]):
+        """
+        Args:
+            buffer (Union[bytes, mmap.mmap]): The contents of a snapshot file.
+
+        Raises:
+            ValueError: If the buffer is not a snapshot, or of a version that
+                is not supported.
+        """
+
+        if len(buffer) < HEADER.size:
+            raise ValueError(INVALID_SNAPSHOT_MESSAGE)
+        magic, version, metadata_length = HEADER.unpack_from(buffer)
+        if magic != MAGIC:
+            raise ValueError(INVALID_SNAPSHOT_MESSAGE)
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(UNSUPPORTED_VERSION_MESSAGE.format(version))
+
+        self.version = version
+        metadata_start = HEADER.size
+        metadata_end = metadata_start + metadata_length
+        self.metadata: Dict[str, Any] = json.loads(
+            bytes(buffer[metadata_start:metadata_end])
+        )
+        self._buffer = buffer
+        self._data_start = _align(metadata_end)
+
+        metadata = self.metadata
+        self.years = range(*metadata["years"])
+        self.schedule = WorkSchedule.from_intervals(
+            metadata["schedule"]["intervals"], metadata["schedule"]["description"]
+        )
+
+        self.holidays: Optional[SnapshotCalendar] = None
+        if metadata["holidays"] is not None:
+            self.holidays = SnapshotCalendar(
+                self.schedule,
+                self.years,
+                self._get_section("masks", "B"),
+                self._get_section("closure_offsets", "q"),
+                self._get_section("closures", "q"),
+                self._get_section("lost_before_years", "q"),
+                metadata["holidays"]["description"],
+            )
+
+        # Why the bitmaps were left out, None if the snapshot has them
+        self.bitmaps_skipped: Optional[str] = metadata.get("bitmaps_skipped")
+
+        self._day_index: Optional[DayIndex] = None
+        self._bitmap_engine: Optional[BitmapEngine] = None
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike]) -> "CalendarSnapshot":
+        """
+        Map a snapshot file into memory.
+
+        Args:
+            path (Union[str, os.PathLike]): The path of the snapshot.
+
+        Returns:
+            CalendarSnapshot: The snapshot.
+
+        Raises:
+            ValueError: If the file is not a snapshot, or of a version that is
+                not supported.
+        """
+
+        with open(path, "rb") as snapshot_file:
+            if os.fstat(snapshot_file.fileno()).st_size == 0:
+                raise ValueError(INVALID_SNAPSHOT_MESSAGE)
+            # The mapping stays valid after the file is closed
+            buffer = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        return cls(buffer)
+
+    @classmethod
+    def write(
+        cls, calculator: DueDateCalculator, path: Union[str, os.PathLike]
+    ) -> None:
+        """
+        Compile a calculator's calendar over its INDEX_YEARS and save it.
+
+        The bitmaps are left out when the working hours or closures are not
+        on whole minutes, and bitmaps_skipped of the snapshot says so.
+
+        Args:
+            calculator (DueDateCalculator): The calculator.
+            path (Union[str, os.PathLike]): The path of the snapshot, replaced
+                at once so readers never see part of it.
+
+        Raises:
+            ValueError: If the calculator's time zone is not an IANA time zone.
+        """
+
+        schedule = calculator.schedule
+        holidays = calculator.holidays
+        years = calculator.INDEX_YEARS
+
+        sections = _get_calendar_sections(calculator)
+        bitmap_sections, bitmaps_skipped = _get_bitmap_sections(calculator)
+        sections.update(bitmap_sections)
+
+        metadata = {
+            "schedule": {
+                "intervals": [list(interval) for interval in schedule.intervals],
+                "description": schedule.description,
+            },
+            "holidays": (
+                {"description": holidays.description} if holidays is not None else None
+            ),
+            "time_zone": _get_time_zone_key(calculator.time_zone),
+            "off_hours_policy": calculator.off_hours_policy,
+            "engine": calculator.engine,
+            "years": [years.start, years.stop],
+            "bitmaps_skipped": bitmaps_skipped,
+        }
+        _write_file(path, metadata, sections)
+
+    @property
+    def day_index(self) -> DayIndex:
+        """
+        DayIndex: The day index of the snapshot, read in place.
+        """
+
+        if self._day_index is None:
+            self._day_index = DayIndex(
+                self.schedule,
+                self.holidays,
+                self.years,
+                self._get_section("day_index", "q"),
+            )
+
+        return self._day_index
+
+    @property
+    def bitmap_engine(self) -> Optional[BitmapEngine]:
+        """
+        Optional[BitmapEngine]: An engine with the bitmaps of the snapshot
+            read in place, or None if the snapshot has no bitmaps.
+        """
+
+        if self._bitmap_engine is None and self.bitmaps_skipped is None:
+            words = self._get_section("bitmap_words", "Q")
+            blocks = self._get_section("bitmap_blocks", "q")
+            bitmaps = {}
+            for position, year in enumerate(self.years):
+                first_word = position * WORDS_PER_YEAR
+                last_word = first_word + WORDS_PER_YEAR
+                first_block = position * BLOCKS_PER_YEAR
+                last_block = first_block + BLOCKS_PER_YEAR
+                bitmaps[year] = MinuteBitmap.from_words(
+                    words[first_word:last_word], blocks[first_block:last_block]
+                )
+            self._bitmap_engine = BitmapEngine(self.schedule, self.holidays, bitmaps)
+
+        return self._bitmap_engine
+
+    def build(self, engine: Optional[str] = None) -> DueDateCalculator:
+        """
+        Create a calculator from the snapshot.
+
+        Args:
+            engine (str): The engine of the calculator. Defaults to the
+                engine of the calculator the snapshot was written from.
+
+        Returns:
+            DueDateCalculator: A new calculator, sharing the snapshot's
+                calendar, day index and bitmaps.
+
+        Raises:
+            ValueError: If the engine is not known, or is bitmap and the
+                snapshot has no bitmaps.
+        """
+
+        metadata = self.metadata
+        engine = engine or metadata["engine"]
+
+        options: Dict[str, Any] = {}
+        if engine == ENGINE_DAILY:
+            options["day_index"] = self.day_index
+        elif engine == ENGINE_BITMAP:
+            if self.bitmaps_skipped is not None:
+                raise ValueError(self.bitmaps_skipped)
+            options["bitmap_engine"] = self.bitmap_engine
+
+        return DueDateCalculator(
+            self.schedule,
+            metadata["off_hours_policy"],
+            self.holidays,
+            engine,
+            metadata["time_zone"],
+            **options,
+        )
+
+    def _get_section(self, name: str, typecode: str) -> Sequence[int]:
+        """
+        Get a section of the snapshot as a sequence of integers.
+
+        Args:
+            name (str): The name of the section.
+            typecode (str): The array typecode of its items.
+
+        Returns:
+            Sequence[int]: A view of the section, or a copy in the host's byte
+                order on big-endian hosts.
+        """
+
+        offset, length = self.metadata["sections"][name]
+        start = self._data_start + offset
+        end = start + length
+        view = memoryview(self._buffer)[start:end]
+        if typecode == "B":
+            return view
+        if sys.byteorder == "little":
+            return view.cast(typecode)
+
+        values = array(typecode)
+        values.frombytes(view)
+        values.byteswap()
+
+        return values
+
+
+def _get_time_zone_key(time_zone: Optional[tzinfo]) -> Optional[str]:
+    """
+    Get the IANA key a time zone is saved as.
+
+    Args:
+        time_zone (tzinfo): The time zone of a calculator, or None.
+
+    Returns:
+        Optional[str]: The key, or None without a time zone.
+
+    Raises:
+        ValueError: If the time zone is not an IANA time zone.
+    """
+
+    if time_zone is None:
+        return None
+    if time_zone is timezone.utc:
+        return "UTC"
+
+    time_zone_key = getattr(time_zone, "key", None)
+    if time_zone_key is None:
+        raise ValueError(SNAPSHOT_TIME_ZONE_MESSAGE)
+
+    return time_zone_key
+
+
+def _get_calendar_sections(calculator: DueDateCalculator) -> Dict[str, Any]:
+    """
+    Compile the closures and day index of a calculator over its INDEX_YEARS.
+
+    Args:
+        calculator (DueDateCalculator): The calculator.
+
+    Returns:
+        Dict[str, Any]: The masks, closure_offsets, closures,
+            lost_before_years and day_index sections.
+    """
+
+    schedule = calculator.schedule
+    holidays = calculator.holidays
+    years = calculator.INDEX_YEARS
+
+    calendar = holidays if holidays is not None else HolidayCalendar()
+    table = calendar.compile(schedule)
+    masks = bytearray()
+    closure_offsets = array("q", [0])
+    closures = array("q")
+    for year in years:
+        holiday_year = calendar.get_year(year)
+        masks += holiday_year.mask.to_bytes(MASK_BYTES, "little")
+        for day in sorted(holiday_year.closures):
+            for start, end in holiday_year.closures[day]:
+                closures.extend((day, start, end))
+        closure_offsets.append(len(closures) // 3)
+    lost_before_years = array(
+        "q",
+        (table.lost_before_year(year) for year in range(years.start, years.stop + 1)),
+    )
+
+    day_index = calculator.day_index or get_day_index(schedule, holidays, years)
+
+    return {
+        "masks": bytes(masks),
+        "closure_offsets": closure_offsets,
+        "closures": closures,
+        "lost_before_years": lost_before_years,
+        "day_index": array("q", day_index.index),
+    }
+
+
+def _get_bitmap_sections(
+    calculator: DueDateCalculator,
+) -> Tuple[Dict[str, array], Optional[str]]:
+    """
+    Build the minute bitmaps of a calculator over its INDEX_YEARS.
+
+    Args:
+        calculator (DueDateCalculator): The calculator.
+
+    Returns:
+        Tuple[Dict[str, array], Optional[str]]: The bitmap_words and
+            bitmap_blocks sections, and None; or no sections and why there
+            are none, when the working time is not on whole minutes.
+
+    Raises:
+        ValueError: If building the bitmaps fails for another reason.
+    """
+
+    try:
+        bitmap_engine = calculator.bitmap_engine or BitmapEngine(
+            calculator.schedule, calculator.holidays
+        )
+        words, blocks = array("Q"), array("q")
+        for year in calculator.INDEX_YEARS:
+            bitmap = bitmap_engine.get_bitmap(year)
+            words.extend(bitmap.words)
+            blocks.extend(bitmap.blocks)
+    except ValueError as error:
+        if str(error) != UNALIGNED_BITMAP_MESSAGE:
+            raise
+        return {}, str(error)
+
+    return {"bitmap_words": words, "bitmap_blocks": blocks}, None
+
+
+def _write_file(
+    path: Union[str, os.PathLike], metadata: Dict[str, Any], sections: Dict[str, Any]
+) -> None:
+    """
+    Write the header, metadata and sections of a snapshot to a file.
+
+    Args:
+        path (Union[str, os.PathLike]): The path of the snapshot, replaced at
+            once so readers never see part of it.
+        metadata (Dict[str, Any]): The metadata, without the section offsets.
+        sections (Dict[str, Any]): The sections by name, as bytes or arrays.
+    """
+
+    # Offsets of the sections from the end of the metadata
+    data = []
+    offsets = {}
+    offset = 0
+    for name, section in sections.items():
+        if isinstance(section, array):
+            if sys.byteorder == "big":
+                section = array(section.typecode, section)
+                section.byteswap()
+            section = section.tobytes()
+        offsets[name] = [offset, len(section)]
+        data.append(section.ljust(_align(len(section)), b"\0"))
+        offset += _align(len(section))
+
+    encoded = json.dumps(dict(metadata, sections=offsets), sort_keys=True).encode()
+    header = HEADER.pack(MAGIC, SNAPSHOT_VERSION, len(encoded))
+    padding = b"\0" * (_align(HEADER.size + len(encoded)) - HEADER.size - len(encoded))
+
+    # Write to a temporary file first so readers never see part of it
+    temporary_path = "{}.{}.tmp".format(os.fspath(path), os.getpid())
+    with open(temporary_path, "wb") as snapshot_file:
+        snapshot_file.write(header + encoded + padding)
+        for section in data:
+            snapshot_file.write(section)
+    os.replace(temporary_path, path)
+
+
+def _align(size: int) -> int:
+    """
+    Round a size up to a multiple of ALIGNMENT.
+
+    Args:
+        size (int): The size in bytes.
+
+    Returns:
+        int: The aligned size.
+    """
+
+    return -(-size // ALIGNMENT) * ALIGNMENT
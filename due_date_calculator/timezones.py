@@ -0,0 +1,204 @@
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone, tzinfo
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Tuple
+
+ONE_DAY = timedelta(days=1)
+ONE_SECOND = timedelta(seconds=1)
+
+# Instants far enough from datetime.min and datetime.max to be converted to
+# local time in any time zone
+EARLIEST_UTC = datetime.min + ONE_DAY
+LATEST_UTC = datetime.max - ONE_DAY
+
+
+class _ZoneYear(NamedTuple):
+    """
+    The UTC offsets of a time zone around one year.
+
+    Attributes:
+        transitions (List[datetime]): The naive UTC instants the offset
+            changes at, in order.
+        offsets (List[timedelta]): The offset before the first transition,
+            then the offset after each transition.
+    """
+
+    transitions: List[datetime]
+    offsets: List[timedelta]
+
+
+class ZoneTransitions:
+    """
+    Converts between UTC and the wall time of a time zone with a table of
+    its offset transitions.
+
+    The transitions of a year are found the first time the year is used, by
+    sampling the offset once a day and bisecting to the second where it
+    changes, and are cached. Conversions are then a bisect in the table of
+    the year, with no call into the time zone. Transitions less than a day
+    apart are not supported, which no time zone of the tz database has.
+
+    Local times are resolved like datetime does for aware datetimes
+    (PEP 495): an ambiguous wall time is the first occurrence with fold=0
+    and the second with fold=1, a nonexistent wall time uses the offset
+    before the gap with fold=0, which moves it forward by the length of the
+    gap, and the offset after it with fold=1.
+    """
+
+    def __init__(self, zone: tzinfo):
+        """
+        Args:
+            zone (tzinfo): The time zone.
+        """
+
+        self.zone = zone
+        self._years: Dict[int, _ZoneYear] = {}
+
+    def to_local(self, utc: datetime) -> Tuple[datetime, int]:
+        """
+        Convert a UTC instant into wall time.
+
+        Args:
+            utc (datetime): The naive UTC date and time.
+
+        Returns:
+            Tuple[datetime, int]: The naive wall time and its fold, 1 for the
+                second occurrence of an ambiguous wall time.
+        """
+
+        zone_year = self.get_year(utc.year)
+        index = bisect_right(zone_year.transitions, utc)
+        offset = zone_year.offsets[index]
+        wall = utc + offset
+
+        # The wall time after a backward transition repeats the one before it
+        fold = 0
+        if index:
+            before = zone_year.offsets[index - 1]
+            if before > offset and wall < zone_year.transitions[index - 1] + before:
+                fold = 1
+
+        return wall, fold
+
+    def to_utc(self, wall: datetime, fold: int = 0) -> datetime:
+        """
+        Convert a wall time into a UTC instant.
+
+        Args:
+            wall (datetime): The naive wall time.
+            fold (int): Which of the two instants an ambiguous or nonexistent
+                wall time stands for, as datetime.fold.
+
+        Returns:
+            datetime: The naive UTC date and time.
+        """
+
+        zone_year = self.get_year(wall.year)
+        transitions, offsets = zone_year.transitions, zone_year.offsets
+
+        # Offsets are less than a day, so only the transitions within a day
+        # of the wall time can apply to it
+        first = bisect_right(transitions, wall - ONE_DAY)
+        last = bisect_right(transitions, wall + ONE_DAY)
+        if first == last:
+            return wall - offsets[first]
+
+        # Around a transition the two candidate offsets are the offset before
+        # it (at the earlier instant) and the offset after it
+        nearby = [offsets[index] for index in range(first, last + 1)]
+        if fold:
+            offset = self._get_offset(zone_year, wall - min(nearby))
+        else:
+            offset = self._get_offset(zone_year, wall - max(nearby))
+
+        return wall - offset
+
+    def get_year(self, year: int) -> _ZoneYear:
+        """
+        Get the offsets of the time zone around a year, finding them on first
+        use.
+
+        The table covers two days before and after the year, so conversions
+        of wall times near the turn of the year see the transitions of both.
+
+        Args:
+            year (int): The year.
+
+        Returns:
+            _ZoneYear: The transitions and offsets.
+        """
+
+        zone_year = self._years.get(year)
+        if zone_year is not None:
+            return zone_year
+
+        start = max(datetime(year, 1, 1) - 2 * ONE_DAY, EARLIEST_UTC)
+        end = min(datetime(year, 12, 31) + 2 * ONE_DAY, LATEST_UTC)
+
+        offset = self._get_utc_offset(start)
+        transitions = []
+        offsets = [offset]
+        day = start
+        while day < end:
+            next_day = min(day + ONE_DAY, end)
+            next_offset = self._get_utc_offset(next_day)
+            if next_offset != offset:
+                # Bisect to the first second with the new offset
+                before, after = day, next_day
+                while after - before > ONE_SECOND:
+                    middle = before + ONE_SECOND * ((after - before) // ONE_SECOND // 2)
+                    if self._get_utc_offset(middle) == offset:
+                        before = middle
+                    else:
+                        after = middle
+                transitions.append(after)
+                offsets.append(next_offset)
+                offset = next_offset
+            day = next_day
+
+        zone_year = self._years[year] = _ZoneYear(transitions, offsets)
+
+        return zone_year
+
+    def _get_offset(self, zone_year: _ZoneYear, utc: datetime) -> timedelta:
+        """
+        Look up the offset of a UTC instant in a year table.
+
+        Args:
+            zone_year (_ZoneYear): The offsets of the year.
+            utc (datetime): The naive UTC date and time.
+
+        Returns:
+            timedelta: The UTC offset.
+        """
+
+        return zone_year.offsets[bisect_right(zone_year.transitions, utc)]
+
+    def _get_utc_offset(self, utc: datetime) -> timedelta:
+        """
+        Ask the time zone for the offset of a UTC instant.
+
+        Args:
+            utc (datetime): The naive UTC date and time.
+
+        Returns:
+            timedelta: The UTC offset.
+        """
+
+        return utc.replace(tzinfo=timezone.utc).astimezone(self.zone).utcoffset()
+
+
+@lru_cache(maxsize=128)
+def get_zone_transitions(zone: tzinfo) -> ZoneTransitions:
+    """
+    Get the transition table of a time zone, shared by every calculator that
+    uses it.
+
+    Args:
+        zone (tzinfo): The time zone.
+
+    Returns:
+        ZoneTransitions: The transition table.
+    """
+
+    return ZoneTransitions(zone)
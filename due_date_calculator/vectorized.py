@@ -0,0 +1,768 @@
+"""
+Vectorized due date calculation on NumPy datetime64 arrays.
+
+This module requires NumPy, which is an optional dependency of the package.
+It mirrors DueDateCalculator.calculate_due_date, validate_many,
+to_work_ordinal and working_time_between, but every step (splitting
+instants into weeks and offsets, looking offsets up in the schedule's weekly
+table and the calendar's closures) is done with array operations, so no
+Python datetime is created per element.
+
+datetime64 values carry no time zone. For a calculator with a time zone
+they are UTC instants: they are moved to its wall time with the zone's
+transition table, like aware datetimes, and due dates are moved back to
+UTC. For a calculator without one they are wall times, like naive datetimes.
+Turnaround times too long to end before datetime.max are clipped so the
+arithmetic stays within int64; their due dates are NaT.
+"""
+
+from datetime import MAXYEAR, MINYEAR, date, datetime, timedelta, tzinfo
+from typing import NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .calculator import (
+    OFF_HOURS_RAISE,
+    OFF_HOURS_ROLL_BACKWARD,
+    REASON_NEGATIVE_TURNAROUND,
+    REASON_OFF_HOURS,
+    REASON_VALID,
+    DueDateCalculator,
+)
+from .holidays import HolidayCalendar
+from .timezones import get_zone_transitions
+from .schedule import (
+    MICROSECONDS_PER_DAY,
+    MICROSECONDS_PER_HOUR,
+    MICROSECONDS_PER_MINUTE,
+    MICROSECONDS_PER_SECOND,
+    MICROSECONDS_PER_WEEK,
+    WorkSchedule,
+)
+
+# Days between 0001-01-01, the work ordinal epoch, and 1970-01-01, the
+# datetime64 epoch. 0001-01-01 was a Monday, so weeks line up with the epoch.
+WORK_ORDINAL_EPOCH_DAYS = 719162
+
+# datetime.max in microseconds since 1970-01-01
+LATEST_MICROSECONDS = (
+    date.max.toordinal() - WORK_ORDINAL_EPOCH_DAYS
+) * MICROSECONDS_PER_DAY - 1
+
+# Longer than all the time from the work ordinal epoch to datetime.max, so a
+# turnaround time this long is due after datetime.max. Longer ones are
+# clipped to it.
+MAX_TURNAROUND_MICROSECONDS = (
+    LATEST_MICROSECONDS + WORK_ORDINAL_EPOCH_DAYS * MICROSECONDS_PER_DAY + 1
+)
+
+UNIX_EPOCH = datetime(1970, 1, 1)
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+class _ClosureArrays(NamedTuple):
+    """
+    The closures of a HolidayCalendar as NumPy arrays, both as ranges of
+    schedule ordinals and as closed intervals in microseconds since 1970-01-01.
+    """
+
+    starts: np.ndarray
+    lengths: np.ndarray
+    cumulative: np.ndarray
+    points: np.ndarray
+    closed_starts: np.ndarray
+    closed_ends: np.ndarray
+    # Working time lost before the first year of the arrays
+    lost_before: int
+
+
+class _WeekTable(NamedTuple):
+    """
+    The weekly offset table of a WorkSchedule as NumPy arrays, with the
+    closures of the calculator's holiday calendar if it has one.
+    """
+
+    starts: np.ndarray
+    ends: np.ndarray
+    cumulative: np.ndarray
+    week_length: int
+    closures: Optional[_ClosureArrays]
+
+
+def calculate_due_dates(
+    submit_dates: np.ndarray,
+    turnaround_hours: np.ndarray,
+    calculator: Optional[DueDateCalculator] = None,
+) -> np.ndarray:
+    """
+    Calculate due dates for arrays of submit dates and turnaround times.
+
+    Args:
+        submit_dates (np.ndarray): datetime64 array of submit dates, UTC
+            instants if the calculator has a time zone, wall times otherwise.
+        turnaround_hours (np.ndarray): Integer or float array of turnaround
+            times in working hours, or a timedelta64 array of working time,
+            broadcastable against submit_dates.
+        calculator (DueDateCalculator): The calculator whose schedule and
+            off-hours policy are used. Defaults to a plain DueDateCalculator.
+
+    Returns:
+        np.ndarray: datetime64[us] array of due dates, in UTC if the
+            calculator has a time zone. Entries whose submit date is outside
+            working hours (when the calculator's off-hours policy is raise),
+            whose turnaround time is negative or whose due date would be after
+            datetime.max are NaT.
+    """
+
+    if calculator is None:
+        calculator = DueDateCalculator()
+
+    submit = _to_wall(calculator, _to_microseconds_since_epoch(submit_dates))
+    turnaround = _to_turnaround_microseconds(turnaround_hours)
+    submit, turnaround = np.broadcast_arrays(submit, turnaround)
+
+    # The working day of the latest submit date can end in the next year
+    years = _get_years(submit)
+    years = range(years.start, years.stop + 1)
+    table = _get_week_table(calculator, years)
+    valid = _get_reasons(calculator, table, submit, turnaround) == REASON_VALID
+
+    ordinal = _get_ordinals(table, submit)
+
+    if calculator.holidays is not None and ordinal.size:
+        # The due dates and rolled submit dates can be in other years
+        closure_table = calculator.holidays.compile(calculator.schedule)
+        due_years = range(
+            closure_table.year_of(int(ordinal.min()), prefer_end=True),
+            closure_table.year_of(int((ordinal + np.maximum(turnaround, 0)).max())) + 1,
+        )
+        if due_years.start < years.start or due_years.stop > years.stop:
+            years = range(
+                min(years.start, due_years.start), max(years.stop, due_years.stop)
+            )
+            table = _get_week_table(calculator, years)
+
+    if calculator.off_hours_policy != OFF_HOURS_RAISE:
+        rolled = _from_work_microseconds(
+            table,
+            ordinal,
+            np.full(
+                ordinal.shape, calculator.off_hours_policy == OFF_HOURS_ROLL_BACKWARD
+            ),
+        )
+        submit = np.where(_is_working(table, submit), submit, rolled)
+
+    # A turnaround that uses up exactly today's remaining work hours is due at
+    # the end of today rather than at the start of the next working day
+    end_of_day = _day_end(
+        table, (submit // MICROSECONDS_PER_DAY + 1) * MICROSECONDS_PER_DAY
+    )
+    prefer_end = turnaround <= _get_ordinals(table, end_of_day) - ordinal
+
+    due = np.where(
+        turnaround == 0,
+        submit,
+        _from_work_microseconds(table, ordinal + turnaround, prefer_end),
+    )
+    valid &= due <= LATEST_MICROSECONDS
+    due = _to_utc(calculator, np.where(valid, due, submit)).view("datetime64[us]")
+    due[~valid] = np.datetime64("NaT")
+
+    return due
+
+
+def validate_many(
+    submit_dates: np.ndarray,
+    turnaround_hours: np.ndarray,
+    calculator: Optional[DueDateCalculator] = None,
+) -> np.ndarray:
+    """
+    Check arrays of submit dates and turnaround times without raising.
+
+    Args:
+        submit_dates (np.ndarray): datetime64 array of submit dates, UTC
+            instants if the calculator has a time zone, wall times otherwise.
+        turnaround_hours (np.ndarray): Turnaround times as accepted by
+            calculate_due_dates, broadcastable against submit_dates.
+        calculator (DueDateCalculator): The calculator whose schedule and
+            off-hours policy are used. Defaults to a plain DueDateCalculator.
+
+    Returns:
+        np.ndarray: uint8 array of reason codes: REASON_VALID,
+            REASON_OFF_HOURS or REASON_NEGATIVE_TURNAROUND.
+    """
+
+    if calculator is None:
+        calculator = DueDateCalculator()
+
+    submit, turnaround = np.broadcast_arrays(
+        _to_wall(calculator, _to_microseconds_since_epoch(submit_dates)),
+        _to_turnaround_microseconds(turnaround_hours),
+    )
+    table = _get_week_table(calculator, _get_years(submit))
+
+    return _get_reasons(calculator, table, submit, turnaround)
+
+
+def to_work_ordinals(
+    date_times: np.ndarray, calculator: Optional[DueDateCalculator] = None
+) -> np.ndarray:
+    """
+    Convert an array of dates and times into work ordinals.
+
+    Args:
+        date_times (np.ndarray): datetime64 array of dates and times, UTC
+            instants if the calculator has a time zone, wall times otherwise.
+        calculator (DueDateCalculator): The calculator whose schedule is used.
+            Defaults to a plain DueDateCalculator.
+
+    Returns:
+        np.ndarray: int64 array of working seconds since the epoch, as
+            returned by DueDateCalculator.to_work_ordinal.
+    """
+
+    return _to_work_microseconds(date_times, calculator) // MICROSECONDS_PER_SECOND
+
+
+def working_time_between(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    calculator: Optional[DueDateCalculator] = None,
+) -> np.ndarray:
+    """
+    Calculate the working time elapsed between arrays of dates and times.
+
+    Args:
+        starts (np.ndarray): datetime64 array of dates and times to measure
+            from, UTC instants if the calculator has a time zone, wall times
+            otherwise.
+        ends (np.ndarray): datetime64 array of dates and times to measure to.
+        calculator (DueDateCalculator): The calculator whose schedule is used.
+            Defaults to a plain DueDateCalculator.
+
+    Returns:
+        np.ndarray: timedelta64[us] array of working time, negative where the
+            end is before the start.
+    """
+
+    return (
+        _to_work_microseconds(ends, calculator)
+        - _to_work_microseconds(starts, calculator)
+    ).astype("timedelta64[us]")
+
+
+def _to_work_microseconds(
+    date_times: np.ndarray, calculator: Optional[DueDateCalculator]
+) -> np.ndarray:
+    """
+    Convert an array of dates and times into microseconds of working time
+    since the work ordinal epoch.
+
+    Args:
+        date_times (np.ndarray): datetime64 array of dates and times.
+        calculator (DueDateCalculator): The calculator whose schedule is used.
+            Defaults to a plain DueDateCalculator.
+
+    Returns:
+        np.ndarray: int64 array of working microseconds since the epoch.
+    """
+
+    if calculator is None:
+        calculator = DueDateCalculator()
+
+    date_times = _to_wall(calculator, _to_microseconds_since_epoch(date_times))
+
+    return _get_ordinals(
+        _get_week_table(calculator, _get_years(date_times)), date_times
+    )
+
+
+def _get_ordinals(table: _WeekTable, date_times: np.ndarray) -> np.ndarray:
+    """
+    Convert microseconds since 1970-01-01 into microseconds of working time
+    since the work ordinal epoch.
+
+    Args:
+        table (_WeekTable): The weekly offset table.
+        date_times (np.ndarray): int64 array of microseconds since 1970-01-01.
+
+    Returns:
+        np.ndarray: int64 array of working microseconds since the epoch.
+    """
+
+    weeks, offset = _get_week_offsets(date_times)
+    ordinal = weeks * table.week_length + _work_before(table, offset)
+
+    closures = table.closures
+    if closures is None:
+        return ordinal
+    if not len(closures.starts):
+        return ordinal - closures.lost_before
+
+    index = np.searchsorted(closures.starts, ordinal, side="right") - 1
+    clipped = np.maximum(index, 0)
+    lost = closures.cumulative[clipped] + np.minimum(
+        ordinal - closures.starts[clipped], closures.lengths[clipped]
+    )
+
+    return ordinal - np.where(index < 0, closures.lost_before, lost)
+
+
+def _get_week_table(calculator: DueDateCalculator, years: range) -> _WeekTable:
+    """
+    Get the weekly offset table of the calculator's schedule as arrays.
+
+    Args:
+        calculator (DueDateCalculator): The calculator whose schedule and
+            holiday calendar are used.
+        years (range): The years whose closures are looked up.
+
+    Returns:
+        _WeekTable: The interval starts, ends and cumulative working time.
+    """
+
+    intervals = np.array(calculator.schedule.intervals, dtype=np.int64)
+    starts, ends = intervals[:, 0], intervals[:, 1]
+    cumulative = np.concatenate(([0], np.cumsum(ends - starts)[:-1]))
+
+    closures = None
+    if calculator.holidays is not None:
+        closures = _get_closure_arrays(calculator.holidays, calculator.schedule, years)
+
+    return _WeekTable(
+        starts, ends, cumulative, calculator.schedule.week_length, closures
+    )
+
+
+def _get_closure_arrays(
+    holidays: HolidayCalendar, schedule: WorkSchedule, years: range
+) -> _ClosureArrays:
+    """
+    Get the closures of some years of a holiday calendar as arrays.
+
+    Only instants in the given years can be looked up in the arrays.
+
+    Args:
+        holidays (HolidayCalendar): The holiday calendar.
+        schedule (WorkSchedule): The working hours the closures apply to.
+        years (range): The years to get the closures of.
+
+    Returns:
+        _ClosureArrays: The closures of the years.
+    """
+
+    table = holidays.compile(schedule)
+
+    lost_before = table.lost_before_year(years.start) if years else 0
+    years = range(
+        max(years.start, holidays.year_range.start),
+        min(years.stop, holidays.year_range.stop),
+    )
+
+    closures = np.array(
+        [closure for year in years for closure in table.get_closures(year)],
+        dtype=np.int64,
+    ).reshape(-1, 3)
+    starts, lengths, cumulative = closures[:, 0], closures[:, 1], closures[:, 2]
+
+    closed = []
+    for year in years:
+        holiday_year = holidays.get_year(year)
+        midnight = (
+            date(year, 1, 1).toordinal() - 1 - WORK_ORDINAL_EPOCH_DAYS
+        ) * MICROSECONDS_PER_DAY
+        mask = holiday_year.mask
+        while mask:
+            day = (mask & -mask).bit_length() - 1
+            mask &= mask - 1
+            closed.append(
+                (
+                    midnight + day * MICROSECONDS_PER_DAY,
+                    midnight + (day + 1) * MICROSECONDS_PER_DAY,
+                )
+            )
+        for day, intervals in holiday_year.closures.items():
+            closed.extend(
+                (
+                    midnight + day * MICROSECONDS_PER_DAY + start,
+                    midnight + day * MICROSECONDS_PER_DAY + end,
+                )
+                for start, end in intervals
+            )
+    closed = np.array(sorted(closed), dtype=np.int64).reshape(-1, 2)
+
+    return _ClosureArrays(
+        starts,
+        lengths,
+        cumulative,
+        starts - cumulative,
+        closed[:, 0],
+        closed[:, 1],
+        lost_before,
+    )
+
+
+def _get_years(date_times: np.ndarray) -> range:
+    """
+    Get the years spanned by an array of dates and times.
+
+    Args:
+        date_times (np.ndarray): int64 array of microseconds since 1970-01-01.
+
+    Returns:
+        range: The years from the earliest to the latest date and time, empty
+            for an empty array.
+    """
+
+    if not date_times.size:
+        return range(0)
+
+    years = date_times.view("datetime64[us]").astype("datetime64[Y]").view(np.int64)
+
+    return range(int(years.min()) + 1970, int(years.max()) + 1971)
+
+
+def _get_week_offsets(date_times: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Split microseconds since 1970-01-01 into weeks since the work ordinal
+    epoch and offsets within the week.
+
+    Args:
+        date_times (np.ndarray): int64 array of microseconds since 1970-01-01.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The weeks since the epoch and the
+            microseconds since Monday midnight of the week.
+    """
+
+    return np.divmod(
+        date_times + WORK_ORDINAL_EPOCH_DAYS * MICROSECONDS_PER_DAY,
+        MICROSECONDS_PER_WEEK,
+    )
+
+
+def _work_before(table: _WeekTable, offset: np.ndarray) -> np.ndarray:
+    """
+    Get the working time in the week before each offset.
+
+    Args:
+        table (_WeekTable): The weekly offset table.
+        offset (np.ndarray): int64 array of microseconds since Monday midnight.
+
+    Returns:
+        np.ndarray: int64 array of working microseconds.
+    """
+
+    index = np.searchsorted(table.starts, offset, side="right") - 1
+    clipped = np.maximum(index, 0)
+    work = table.cumulative[clipped] + np.minimum(
+        offset - table.starts[clipped], table.ends[clipped] - table.starts[clipped]
+    )
+
+    return np.where(index < 0, 0, work)
+
+
+def _day_end(table: _WeekTable, midnight: np.ndarray) -> np.ndarray:
+    """
+    Get the end of the working days that run up to midnights.
+
+    Applies the same rules as WorkSchedule.day_end: a working day ends at
+    midnight, unless a working interval runs through midnight, in which case
+    it ends with that interval, at most a day later.
+
+    Args:
+        table (_WeekTable): The weekly offset table.
+        midnight (np.ndarray): int64 array of midnights in microseconds since
+            1970-01-01.
+
+    Returns:
+        np.ndarray: int64 array of microseconds since 1970-01-01.
+    """
+
+    _, offset = _get_week_offsets(midnight)
+    index = np.searchsorted(table.starts, offset, side="right") - 1
+    clipped = np.maximum(index, 0)
+    inside = (
+        (index >= 0) & (table.starts[clipped] < offset) & (offset < table.ends[clipped])
+    )
+    end = np.where(inside, table.ends[clipped] - offset, 0)
+
+    if table.ends[-1] == MICROSECONDS_PER_WEEK and table.starts[0] == 0:
+        # Split at the end of the week
+        end = np.where(offset == 0, table.ends[0], end)
+
+    return midnight + np.minimum(end, MICROSECONDS_PER_DAY)
+
+
+def _is_working(table: _WeekTable, date_times: np.ndarray) -> np.ndarray:
+    """
+    Check which dates and times are during working hours.
+
+    Applies the same rules as WorkSchedule.is_working: the end of a working
+    interval counts as working time up to the end of its first minute.
+    Closures of the holiday calendar are not working time.
+
+    Args:
+        table (_WeekTable): The weekly offset table.
+        date_times (np.ndarray): int64 array of microseconds since 1970-01-01.
+
+    Returns:
+        np.ndarray: Boolean mask, True where the date and time is during
+            working hours.
+    """
+
+    _, offset = _get_week_offsets(date_times)
+    index = np.searchsorted(table.starts, offset, side="right") - 1
+    working = (index >= 0) & (
+        offset < table.ends[np.maximum(index, 0)] + MICROSECONDS_PER_MINUTE
+    )
+
+    closures = table.closures
+    if closures is None or not len(closures.closed_starts):
+        return working
+
+    index = np.searchsorted(closures.closed_starts, date_times, side="right") - 1
+    closed = (index >= 0) & (date_times < closures.closed_ends[np.maximum(index, 0)])
+
+    return working & ~closed
+
+
+def _from_work_microseconds(
+    table: _WeekTable, ordinal: np.ndarray, prefer_end: np.ndarray
+) -> np.ndarray:
+    """
+    Convert microseconds of working time since the work ordinal epoch into
+    microseconds since 1970-01-01.
+
+    Args:
+        table (_WeekTable): The weekly offset table.
+        ordinal (np.ndarray): int64 array of working microseconds.
+        prefer_end (np.ndarray): Boolean mask, True where the end of a working
+            interval is returned rather than the start of the next one when
+            the ordinal is on a boundary.
+
+    Returns:
+        np.ndarray: int64 array of microseconds since 1970-01-01.
+    """
+
+    closures = table.closures
+    if closures is not None and not len(closures.starts):
+        ordinal = ordinal + closures.lost_before
+    elif closures is not None:
+        # Skip the closures, landing after them unless prefer_end is set
+        index = (
+            np.where(
+                prefer_end,
+                np.searchsorted(closures.points, ordinal, side="left"),
+                np.searchsorted(closures.points, ordinal, side="right"),
+            )
+            - 1
+        )
+        clipped = np.maximum(index, 0)
+        ordinal = ordinal + np.where(
+            index < 0,
+            closures.lost_before,
+            closures.cumulative[clipped] + closures.lengths[clipped],
+        )
+
+    weeks, work = np.divmod(ordinal, table.week_length)
+
+    # The boundary is the end of the last interval of the previous week
+    previous_week = prefer_end & (work == 0) & (weeks > 0)
+    weeks = weeks - previous_week
+    work = np.where(previous_week, table.week_length, work)
+
+    index = np.where(
+        prefer_end,
+        np.maximum(np.searchsorted(table.cumulative, work, side="left") - 1, 0),
+        np.searchsorted(table.cumulative, work, side="right") - 1,
+    )
+    offset = table.starts[index] + work - table.cumulative[index]
+
+    return (
+        weeks * MICROSECONDS_PER_WEEK
+        + offset
+        - WORK_ORDINAL_EPOCH_DAYS * MICROSECONDS_PER_DAY
+    )
+
+
+def _to_microseconds_since_epoch(date_times: np.ndarray) -> np.ndarray:
+    """
+    Convert a datetime64 array into microseconds since 1970-01-01.
+
+    Args:
+        date_times (np.ndarray): datetime64 array of dates and times.
+
+    Returns:
+        np.ndarray: int64 array of microseconds since 1970-01-01.
+    """
+
+    return np.asarray(date_times).astype("datetime64[us]").view(np.int64)
+
+
+def _to_turnaround_microseconds(turnaround_hours: np.ndarray) -> np.ndarray:
+    """
+    Convert an array of turnaround times into int64 microseconds.
+
+    Numbers are taken as working hours, floats are rounded to the nearest
+    microsecond. timedelta64 arrays are taken as they are. Turnaround times
+    longer than MAX_TURNAROUND_MICROSECONDS either way are clipped to it, so
+    adding them to work ordinals cannot overflow.
+
+    Args:
+        turnaround_hours (np.ndarray): Array of turnaround times.
+
+    Returns:
+        np.ndarray: int64 array of turnaround times in microseconds.
+    """
+
+    limit = MAX_TURNAROUND_MICROSECONDS
+    turnaround = np.asarray(turnaround_hours)
+    if np.issubdtype(turnaround.dtype, np.timedelta64):
+        # Coarser units are clipped in their own unit first, so converting
+        # them to microseconds cannot overflow
+        dtype = turnaround.dtype
+        unit = np.ones(1, dtype).astype("timedelta64[us]").view(np.int64)[0]
+        if unit > 1:
+            units = limit // unit + 1
+            turnaround = np.clip(turnaround.view(np.int64), -units, units).view(dtype)
+        turnaround = turnaround.astype("timedelta64[us]").view(np.int64)
+        return np.clip(turnaround, -limit, limit)
+    if np.issubdtype(turnaround.dtype, np.integer):
+        hours = limit // MICROSECONDS_PER_HOUR + 1
+        turnaround = np.clip(turnaround, -hours, hours).astype(np.int64)
+        return np.clip(turnaround * MICROSECONDS_PER_HOUR, -limit, limit)
+    turnaround = np.clip(turnaround * MICROSECONDS_PER_HOUR, -limit, limit)
+    return np.rint(turnaround).astype(np.int64)
+
+
+def _to_wall(calculator: DueDateCalculator, date_times: np.ndarray) -> np.ndarray:
+    """
+    Move UTC instants to the wall time of the calculator's time zone.
+
+    Args:
+        calculator (DueDateCalculator): The calculator.
+        date_times (np.ndarray): int64 array of microseconds since 1970-01-01,
+            UTC if the calculator has a time zone.
+
+    Returns:
+        np.ndarray: int64 array of wall times in microseconds since
+            1970-01-01, date_times itself if there is no time zone.
+    """
+
+    if calculator.time_zone is None or not date_times.size:
+        return date_times
+
+    transitions, offsets = _get_zone_arrays(
+        calculator.time_zone, _get_years(date_times)
+    )
+
+    return date_times + offsets[np.searchsorted(transitions, date_times, "right")]
+
+
+def _to_utc(calculator: DueDateCalculator, date_times: np.ndarray) -> np.ndarray:
+    """
+    Move wall times of the calculator's time zone to UTC instants.
+
+    Ambiguous and nonexistent wall times are resolved like
+    ZoneTransitions.to_utc with fold 0: with the offset before the
+    transition.
+
+    Args:
+        calculator (DueDateCalculator): The calculator.
+        date_times (np.ndarray): int64 array of wall times in microseconds
+            since 1970-01-01.
+
+    Returns:
+        np.ndarray: int64 array of microseconds since 1970-01-01, in UTC if
+            the calculator has a time zone.
+    """
+
+    if calculator.time_zone is None or not date_times.size:
+        return date_times
+
+    # Wall times within a day of the turn of a year can be in either year
+    years = _get_years(date_times)
+    years = range(max(years.start - 1, MINYEAR), min(years.stop + 1, MAXYEAR + 1))
+    transitions, offsets = _get_zone_arrays(calculator.time_zone, years)
+
+    def offset_at(utc: np.ndarray) -> np.ndarray:
+        return offsets[np.searchsorted(transitions, utc, "right")]
+
+    # Transitions are more than a day apart, so the offsets a day before and
+    # after are the two candidates around a transition
+    before = np.maximum(
+        offset_at(date_times - MICROSECONDS_PER_DAY),
+        offset_at(date_times + MICROSECONDS_PER_DAY),
+    )
+
+    return date_times - offset_at(date_times - before)
+
+
+def _get_zone_arrays(time_zone: tzinfo, years: range) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get the UTC offset transitions of a time zone over some years as arrays.
+
+    Args:
+        time_zone (tzinfo): The time zone.
+        years (range): The years, not empty.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The UTC instants the offset changes at
+            and the offset before the first and after each of them, all in
+            microseconds.
+    """
+
+    zone_transitions = get_zone_transitions(time_zone)
+    first_offset = zone_transitions.get_year(years.start).offsets[0]
+    offsets = {}
+    for year in years:
+        zone_year = zone_transitions.get_year(year)
+        offsets.update(zip(zone_year.transitions, zone_year.offsets[1:]))
+    transitions = sorted(offsets)
+
+    return (
+        np.array(
+            [
+                (transition - UNIX_EPOCH) // ONE_MICROSECOND
+                for transition in transitions
+            ],
+            dtype=np.int64,
+        ),
+        np.array(
+            [first_offset // ONE_MICROSECOND]
+            + [offsets[transition] // ONE_MICROSECOND for transition in transitions],
+            dtype=np.int64,
+        ),
+    )
+
+
+def _get_reasons(
+    calculator: DueDateCalculator,
+    table: _WeekTable,
+    submit: np.ndarray,
+    turnaround: np.ndarray,
+) -> np.ndarray:
+    """
+    Get the reason codes for broadcast microsecond arrays.
+
+    Submit dates outside working hours are only reported when the
+    calculator's off-hours policy is raise.
+
+    Args:
+        calculator (DueDateCalculator): The calculator whose off-hours policy
+            is used.
+        table (_WeekTable): The weekly offset table.
+        submit (np.ndarray): int64 array of submit dates in microseconds.
+        turnaround (np.ndarray): int64 array of turnaround times in microseconds.
+
+    Returns:
+        np.ndarray: uint8 array of reason codes.
+    """
+
+    reasons = np.full(submit.shape, REASON_VALID, dtype=np.uint8)
+    reasons[turnaround < 0] = REASON_NEGATIVE_TURNAROUND
+    if calculator.off_hours_policy == OFF_HOURS_RAISE:
+        reasons[~_is_working(table, submit)] = REASON_OFF_HOURS
+
+    return reasons
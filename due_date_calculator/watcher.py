@@ -0,0 +1,403 @@
+"""
+Calendars reloaded from their source files while they are in use.
+
+A CalendarWatcher polls the files each calendar is built from, such as a
+TOML configuration, an iCalendar feed or a snapshot. When they change it
+builds a new calculator in its background thread and swaps it into the
+LiveCalculator handed out for that calendar. Nothing is changed in place:
+every call on a LiveCalculator reads the current calculator once and runs
+on it to the end, so a batch in flight during a swap finishes on the
+calendar it started with. Reading the current calculator is a single
+attribute read, with no lock on the hot path.
+
+Every result carries the version of the calendar it was computed with, a
+hash of the contents of the source files, so the workers of a fleet that
+loaded the same files report the same version.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .calculator import DueDateCalculator, Turnaround
+
+logger = logging.getLogger(__name__)
+
+INVALID_INTERVAL_MESSAGE = "Watch interval must be positive"
+
+# Hex digits of the content hash kept in version tags
+VERSION_LENGTH = 16
+
+Path = Union[str, os.PathLike]
+
+
+class CalendarVersion(NamedTuple):
+    """
+    A calculator and the version of the calendar it was built from.
+
+    Attributes:
+        calculator (DueDateCalculator): The calculator.
+        version (str): The version tag.
+    """
+
+    calculator: DueDateCalculator
+    version: str
+
+
+class Versioned(NamedTuple):
+    """
+    A result and the version of the calendar it was computed with.
+
+    Attributes:
+        result (Any): The result of the calculator method.
+        version (str): The version tag.
+    """
+
+    result: Any
+    version: str
+
+
+class LiveCalculator:
+    """
+    A calculator whose calendar is swapped for a new one when its sources
+    change.
+
+    Each method runs on the calculator that is current when it is called
+    and returns its result with that calculator's version. To run several
+    calls, or the vectorized API, on one version, read current once and use
+    its calculator.
+    """
+
+    def __init__(self, calculator: DueDateCalculator, version: str):
+        """
+        Args:
+            calculator (DueDateCalculator): The first calculator.
+            version (str): Its version tag.
+        """
+
+        self._current = CalendarVersion(calculator, version)
+        # The error of the last reload, None once a reload succeeds
+        self.error: Optional[Exception] = None
+
+    @property
+    def current(self) -> CalendarVersion:
+        """
+        CalendarVersion: The current calculator and its version.
+        """
+
+        return self._current
+
+    @property
+    def version(self) -> str:
+        """
+        str: The version tag of the current calculator.
+        """
+
+        return self._current.version
+
+    def swap(self, calculator: DueDateCalculator, version: str) -> None:
+        """
+        Make a calculator current. Calls already running finish on the
+        calculator they started with.
+
+        Args:
+            calculator (DueDateCalculator): The new calculator.
+            version (str): Its version tag.
+        """
+
+        self._current = CalendarVersion(calculator, version)
+
+    def calculate_due_date(
+        self, submit_date: datetime, turnaround_hours: Turnaround
+    ) -> Versioned:
+        """
+        Calculate a due date, see DueDateCalculator.calculate_due_date.
+
+        Returns:
+            Versioned: The due date and the calendar version.
+        """
+
+        calculator, version = self._current
+
+        return Versioned(
+            calculator.calculate_due_date(submit_date, turnaround_hours), version
+        )
+
+    def calculate_due_dates(
+        self, requests: Iterable[Tuple[datetime, Turnaround]]
+    ) -> Versioned:
+        """
+        Calculate many due dates on one version of the calendar, see
+        DueDateCalculator.calculate_due_dates.
+
+        Returns:
+            Versioned: The due dates or errors, and the calendar version.
+        """
+
+        calculator, version = self._current
+
+        return Versioned(calculator.calculate_due_dates(requests), version)
+
+    def validate_many(
+        self, submit_dates: Iterable[datetime], turnarounds: Iterable[Turnaround]
+    ) -> Versioned:
+        """
+        Check many submit dates and turnaround times, see
+        DueDateCalculator.validate_many.
+
+        Returns:
+            Versioned: The reason codes and the calendar version.
+        """
+
+        calculator, version = self._current
+
+        return Versioned(calculator.validate_many(submit_dates, turnarounds), version)
+
+    def working_time_between(self, start: datetime, end: datetime) -> Versioned:
+        """
+        Get the working time between two instants, see
+        DueDateCalculator.working_time_between.
+
+        Returns:
+            Versioned: The working time and the calendar version.
+        """
+
+        calculator, version = self._current
+
+        return Versioned(calculator.working_time_between(start, end), version)
+
+    def latest_submit_for(
+        self, due_date: datetime, turnaround_hours: Turnaround
+    ) -> Versioned:
+        """
+        Get the latest submit date for a due date, see
+        DueDateCalculator.latest_submit_for.
+
+        Returns:
+            Versioned: The submit date and the calendar version.
+        """
+
+        calculator, version = self._current
+
+        return Versioned(
+            calculator.latest_submit_for(due_date, turnaround_hours), version
+        )
+
+    def __repr__(self):
+        return "LiveCalculator({!r})".format(self.version)
+
+
+class _Watch(NamedTuple):
+    """
+    A calendar watched by a CalendarWatcher.
+
+    Attributes:
+        live (LiveCalculator): The calculator handed out for the calendar.
+        paths (Tuple[Path, ...]): Its source files.
+        loader (Callable[[], DueDateCalculator]): Builds it from the files.
+    """
+
+    live: LiveCalculator
+    paths: Tuple[Path, ...]
+    loader: Callable[[], DueDateCalculator]
+
+
+class CalendarWatcher:
+    """
+    Polls the source files of calendars and reloads the ones that changed.
+
+    Files are compared by modification time, size and inode first, and only
+    read to hash them when one of those changed, so a touched but unchanged
+    file is not reloaded. A reload that fails keeps the current calculator;
+    its error is logged and kept on the LiveCalculator, and it is tried
+    again once the files change. Files that cannot be read, e.g. while they
+    are replaced, or that change during a reload are tried on the next poll.
+    """
+
+    def __init__(self, interval: float = 1.0):
+        """
+        Args:
+            interval (float): Seconds between polls of the background thread.
+
+        Raises:
+            ValueError: If interval is not positive.
+        """
+
+        if interval <= 0:
+            raise ValueError(INVALID_INTERVAL_MESSAGE)
+
+        self.interval = interval
+        self._watches: List[_Watch] = []
+        # File signatures of every watch as of its last reload attempt
+        self._signatures: List[Tuple] = []
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def watch(
+        self, paths: Sequence[Path], loader: Callable[[], DueDateCalculator]
+    ) -> LiveCalculator:
+        """
+        Load a calendar and reload it whenever its source files change.
+
+        Args:
+            paths (Sequence[Path]): The files the calendar is built from.
+            loader (Callable[[], DueDateCalculator]): Builds the calculator
+                from the files, e.g. lambda: CalendarConfig.load(path).build(name).
+
+        Returns:
+            LiveCalculator: The calculator to use, kept up to date.
+
+        Raises:
+            OSError: If a file cannot be read.
+            Exception: Whatever loader raises for the first load.
+        """
+
+        paths = tuple(paths)
+        signature = _get_signature(paths)
+        version = _get_version(paths)
+        live = LiveCalculator(loader(), version)
+
+        # The background thread reads the signature of every watch it sees
+        self._signatures.append(signature)
+        self._watches.append(_Watch(live, paths, loader))
+
+        return live
+
+    def check(self) -> List[LiveCalculator]:
+        """
+        Poll the files once and reload the calendars that changed.
+
+        Returns:
+            List[LiveCalculator]: The calculators that were swapped.
+        """
+
+        swapped = []
+        for position, (live, paths, loader) in enumerate(list(self._watches)):
+            try:
+                signature = _get_signature(paths)
+                if signature == self._signatures[position]:
+                    continue
+                version = _get_version(paths)
+            except OSError as error:
+                live.error = error
+                continue
+
+            try:
+                if version != live.version:
+                    calculator = loader()
+                    # Files changed while loading are reloaded on the next poll
+                    if _get_signature(paths) != signature:
+                        continue
+                    live.swap(calculator, version)
+                    swapped.append(live)
+                live.error = None
+            except Exception as error:
+                logger.exception("Reloading calendar from %s failed", paths)
+                live.error = error
+            self._signatures[position] = signature
+
+        return swapped
+
+    def start(self) -> None:
+        """
+        Poll the files every interval seconds in a background thread.
+        """
+
+        if self._thread is not None:
+            return
+
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="CalendarWatcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the background thread, waiting for a poll in progress to end.
+        """
+
+        if self._thread is None:
+            return
+
+        self._stopped.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        """
+        Poll until stopped.
+        """
+
+        while not self._stopped.wait(self.interval):
+            self.check()
+
+    def __enter__(self) -> "CalendarWatcher":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def __len__(self) -> int:
+        return len(self._watches)
+
+
+def _get_signature(paths: Sequence[Path]) -> Tuple:
+    """
+    Get what identifies the current state of files without reading them.
+
+    Args:
+        paths (Sequence[Path]): The files.
+
+    Returns:
+        Tuple: The modification time, size and inode of every file.
+
+    Raises:
+        OSError: If a file does not exist.
+    """
+
+    signature = []
+    for path in paths:
+        stat = os.stat(path)
+        signature.append((stat.st_mtime_ns, stat.st_size, stat.st_ino))
+
+    return tuple(signature)
+
+
+def _get_version(paths: Sequence[Path]) -> str:
+    """
+    Hash the contents of files into a version tag.
+
+    Args:
+        paths (Sequence[Path]): The files.
+
+    Returns:
+        str: The first VERSION_LENGTH hex digits of a SHA-256 of the files.
+
+    Raises:
+        OSError: If a file cannot be read.
+    """
+
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as source:
+            for chunk in iter(lambda: source.read(1 << 20), b""):
+                digest.update(chunk)
+        # Keep the boundaries between files in the hash
+        digest.update(b"\0")
+
+    return digest.hexdigest()[:VERSION_LENGTH]
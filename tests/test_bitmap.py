@@ -0,0 +1,108 @@
+import unittest
+import datetime
+from due_date_calculator import (
+    ENGINE_BITMAP,
+    DueDateCalculator,
+    HolidayCalendar,
+    WorkSchedule,
+)
+from due_date_calculator.bitmap import MinuteBitmap
+
+
+class TestMinuteBitmap(unittest.TestCase):
+    def test_rank_and_select(self):
+        """Test rank and select over several blocks of words."""
+        minutes = [0, 5, 63, 64, 600, 1000, 1439]
+        bitmap = MinuteBitmap(
+            sum(1 << minute for minute in minutes).to_bytes(184, "little")
+        )
+        self.assertEqual(bitmap.count, len(minutes))
+        for rank, minute in enumerate(minutes):
+            self.assertEqual(bitmap.rank(minute), rank)
+            self.assertEqual(bitmap.select(rank), minute)
+            self.assertTrue(bitmap.is_set(minute))
+        self.assertEqual(bitmap.rank(601), 5)
+        self.assertFalse(bitmap.is_set(601))
+
+
+class TestBitmapEngine(unittest.TestCase):
+    def setUp(self):
+        self.holidays = HolidayCalendar(
+            [datetime.date(2025, 4, 18), datetime.date(2025, 4, 21)],
+            {datetime.date(2025, 4, 17): [(datetime.time(12), datetime.time(13))]},
+        )
+        self.calculator = DueDateCalculator(
+            holidays=self.holidays, engine=ENGINE_BITMAP
+        )
+
+    def test_matches_weekly_engine(self):
+        """Test the bitmap engine gives the same due dates as the weekly one."""
+        weekly = DueDateCalculator(holidays=self.holidays)
+        submit_date = datetime.datetime(2025, 4, 16, 9, 30, 15)  # Wednesday
+        for turnaround in range(0, 60):
+            self.assertEqual(
+                self.calculator.calculate_due_date(submit_date, turnaround / 4),
+                weekly.calculate_due_date(submit_date, turnaround / 4),
+            )
+
+    def test_due_date_skips_closures(self):
+        """Test due dates skip partial-day and full-day closures."""
+        # Submit Thursday 11:30 AM, due 5 hours later (Tuesday 9:30 AM)
+        submit_date = datetime.datetime(2025, 4, 17, 11, 30)
+        due_date = self.calculator.calculate_due_date(submit_date, 5)
+        self.assertEqual(due_date, datetime.datetime(2025, 4, 22, 9, 30))
+
+        # Submit Thursday 9 AM, due 7 hours later (Thursday 5 PM)
+        submit_date = datetime.datetime(2025, 4, 17, 9, 0)
+        due_date = self.calculator.calculate_due_date(submit_date, 7)
+        self.assertEqual(due_date, datetime.datetime(2025, 4, 17, 17, 0))
+
+    def test_work_ordinals_match_weekly_engine(self):
+        """Test both engines agree on work ordinals."""
+        weekly = DueDateCalculator(holidays=self.holidays)
+        for date_time in (
+            datetime.datetime(2025, 4, 17, 12, 30),  # Thursday lunch closure
+            datetime.datetime(2025, 4, 19, 10, 0),  # Saturday
+            datetime.datetime(2026, 1, 1, 0, 0),  # New Year
+        ):
+            self.assertEqual(
+                self.calculator.to_work_ordinal(date_time),
+                weekly.to_work_ordinal(date_time),
+            )
+
+    def test_unaligned_schedule(self):
+        """Test the bitmap engine with working hours not on whole minutes."""
+        schedule = WorkSchedule({0: [(datetime.time(9, 0, 30), datetime.time(17))]})
+        with self.assertRaises(ValueError) as cm:
+            DueDateCalculator(schedule, engine=ENGINE_BITMAP)
+        self.assertEqual(
+            str(cm.exception), "Bitmap engine requires working hours on whole minutes"
+        )
+
+    def test_prebuilt_engine(self):
+        """Test calculators take a prebuilt engine of their own calendar only."""
+        engine = self.calculator.bitmap_engine
+        calculator = DueDateCalculator(
+            holidays=self.holidays, engine=ENGINE_BITMAP, bitmap_engine=engine
+        )
+        self.assertIs(calculator.bitmap_engine, engine)
+        with self.assertRaises(ValueError) as cm:
+            DueDateCalculator(
+                holidays=HolidayCalendar(), engine=ENGINE_BITMAP, bitmap_engine=engine
+            )
+        self.assertEqual(
+            str(cm.exception),
+            "Bitmap engine must be of the calculator's schedule and holidays",
+        )
+
+    def test_invalid_engine(self):
+        """Test with an unknown engine."""
+        with self.assertRaises(ValueError) as cm:
+            DueDateCalculator(engine="monthly")
+        self.assertEqual(
+            str(cm.exception), "Engine must be one of: weekly, bitmap, daily"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
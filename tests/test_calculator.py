@@ -1,6 +1,16 @@
 import unittest
 import datetime
-from due_date_calculator import DueDateCalculator
+from fractions import Fraction
+from due_date_calculator import (
+    OFF_HOURS_ROLL_BACKWARD,
+    OFF_HOURS_ROLL_FORWARD,
+    REASON_NEGATIVE_TURNAROUND,
+    REASON_OFF_HOURS,
+    REASON_VALID,
+    DueDateCalculator,
+    HolidayCalendar,
+    WorkSchedule,
+)
 
 
 class TestDueDateCalculator(unittest.TestCase):
@@ -84,6 +94,49 @@ class TestDueDateCalculator(unittest.TestCase):
             "Submit date must be during working hours (9AM to 5PM, Monday to Friday)",
         )
 
+    def test_roll_forward_off_hours_policy(self):
+        """Test off-hours submit dates rolled forward to the next working instant."""
+        calculator = DueDateCalculator(off_hours_policy=OFF_HOURS_ROLL_FORWARD)
+        # Submit Monday 8 AM, rolled to Monday 9 AM
+        submit_date = datetime.datetime(2025, 3, 10, 8, 0)
+        due_date = calculator.calculate_due_date(submit_date, 4)
+        self.assertEqual(due_date, datetime.datetime(2025, 3, 10, 13, 0))
+
+        # Submit Friday 8 PM, rolled to Monday 9 AM
+        submit_date = datetime.datetime(2025, 3, 14, 20, 0)
+        due_date = calculator.calculate_due_date(submit_date, 4)
+        self.assertEqual(due_date, datetime.datetime(2025, 3, 17, 13, 0))
+
+    def test_roll_backward_off_hours_policy(self):
+        """Test off-hours submit dates rolled back to the previous working instant."""
+        calculator = DueDateCalculator(off_hours_policy=OFF_HOURS_ROLL_BACKWARD)
+        # Submit Saturday 10 AM, rolled to Friday 5 PM
+        submit_date = datetime.datetime(2025, 3, 15, 10, 0)
+        due_date = calculator.calculate_due_date(submit_date, 4)
+        self.assertEqual(due_date, datetime.datetime(2025, 3, 17, 13, 0))
+
+        # Submit Monday 8 AM, rolled to Friday 5 PM
+        submit_date = datetime.datetime(2025, 3, 10, 8, 0)
+        due_date = calculator.calculate_due_date(submit_date, 0)
+        self.assertEqual(due_date, datetime.datetime(2025, 3, 7, 17, 0))
+
+    def test_off_hours_policy_in_batch(self):
+        """Test batch calculation and validation follow the off-hours policy."""
+        calculator = DueDateCalculator(off_hours_policy=OFF_HOURS_ROLL_FORWARD)
+        submit_date = datetime.datetime(2025, 3, 15, 10, 0)  # Saturday 10 AM
+        due_dates = calculator.calculate_due_dates([(submit_date, 8)])
+        self.assertEqual(due_dates, [datetime.datetime(2025, 3, 17, 17, 0)])
+        self.assertEqual(list(calculator.validate_many([submit_date], [8])), [0])
+
+    def test_invalid_off_hours_policy(self):
+        """Test with an unknown off-hours policy."""
+        with self.assertRaises(ValueError) as cm:
+            DueDateCalculator(off_hours_policy="ignore")
+        self.assertEqual(
+            str(cm.exception),
+            "Off-hours policy must be one of: raise, roll_forward, roll_backward",
+        )
+
     def test_negative_turnaround_time(self):
         """Test with negative turnaround time."""
         submit_date = datetime.datetime(2025, 3, 10, 14, 0)  # Monday 2 PM
@@ -99,6 +152,268 @@ class TestDueDateCalculator(unittest.TestCase):
         expected = datetime.datetime(2025, 3, 24, 10, 0)  # Monday after 2 weeks, 10 AM
         self.assertEqual(due_date, expected)
 
+    def test_turnaround_ending_on_day_boundary(self):
+        """Test a turnaround that uses up whole working days exactly."""
+        # Submit Monday 9 AM, due 16 hours later (start of Wednesday)
+        submit_date = datetime.datetime(2025, 3, 10, 9, 0)  # Monday 9 AM
+        due_date = self.calculator.calculate_due_date(submit_date, 16)
+        expected = datetime.datetime(2025, 3, 12, 9, 0)  # Wednesday 9 AM
+        self.assertEqual(due_date, expected)
+
+    def test_very_long_turnaround_time(self):
+        """Test with a turnaround time spanning most of a year."""
+        # Submit Monday 10 AM, due 2000 hours later (250 working days)
+        submit_date = datetime.datetime(2025, 3, 10, 10, 0)  # Monday 10 AM
+        due_date = self.calculator.calculate_due_date(submit_date, 2000)
+        expected = datetime.datetime(2026, 2, 23, 10, 0)  # Monday 10 AM
+        self.assertEqual(due_date, expected)
+
+    def test_due_date_near_latest_supported_date(self):
+        """Test due dates up to datetime.max and past it."""
+        # Submit Friday 9999-12-31 4 PM, due 1 hour later (5 PM)
+        submit_date = datetime.datetime(9999, 12, 31, 16, 0)
+        due_date = self.calculator.calculate_due_date(submit_date, 1)
+        self.assertEqual(due_date, datetime.datetime(9999, 12, 31, 17, 0))
+
+        # Due 2 hours later would be in year 10000
+        with self.assertRaises(OverflowError) as cm:
+            self.calculator.calculate_due_date(submit_date, 2)
+        self.assertEqual(str(cm.exception), "Date is after the latest supported date")
+
+        results = self.calculator.calculate_due_dates([(submit_date, 10**9)])
+        self.assertIsInstance(results[0], OverflowError)
+
+    def test_timedelta_turnaround_time(self):
+        """Test with a turnaround time given as a timedelta."""
+        # Submit Monday 4:30 PM, due 90 minutes later (Tuesday 10 AM)
+        submit_date = datetime.datetime(2025, 3, 10, 16, 30)  # Monday 4:30 PM
+        due_date = self.calculator.calculate_due_date(
+            submit_date, datetime.timedelta(minutes=90)
+        )
+        expected = datetime.datetime(2025, 3, 11, 10, 0)  # Tuesday 10 AM
+        self.assertEqual(due_date, expected)
+
+    def test_fractional_turnaround_time(self):
+        """Test fractional turnaround times are exact to the microsecond."""
+        submit_date = datetime.datetime(2025, 3, 10, 9, 0, 0, 250)  # Monday 9 AM
+        due_date = self.calculator.calculate_due_date(submit_date, Fraction(49, 3))
+        # 16 hours and 20 minutes later (Wednesday 9:20 AM)
+        expected = datetime.datetime(2025, 3, 12, 9, 20, 0, 250)
+        self.assertEqual(due_date, expected)
+
+        due_date = self.calculator.calculate_due_date(submit_date, 0.1)
+        expected = datetime.datetime(2025, 3, 10, 9, 6, 0, 250)
+        self.assertEqual(due_date, expected)
+
+    def test_batch_calculation(self):
+        """Test batch calculation returns due dates in input order."""
+        requests = [
+            (datetime.datetime(2025, 3, 10, 9, 0), 4),  # Monday 9 AM
+            (datetime.datetime(2025, 3, 14, 14, 0), 9),  # Friday 2 PM
+            (datetime.datetime(2025, 3, 10, 10, 0), 80),  # Monday 10 AM
+        ]
+        due_dates = self.calculator.calculate_due_dates(iter(requests))
+        expected = [
+            datetime.datetime(2025, 3, 10, 13, 0),  # Monday 1 PM
+            datetime.datetime(2025, 3, 17, 15, 0),  # Monday 3 PM
+            datetime.datetime(2025, 3, 24, 10, 0),  # Monday after 2 weeks, 10 AM
+        ]
+        self.assertEqual(due_dates, expected)
+
+    def test_batch_calculation_reports_errors(self):
+        """Test batch calculation reports invalid items without raising."""
+        requests = [
+            (datetime.datetime(2025, 3, 15, 10, 0), 8),  # Saturday 10 AM
+            (datetime.datetime(2025, 3, 11, 14, 12), 16),  # Tuesday 2:12 PM
+            (datetime.datetime(2025, 3, 10, 14, 0), -5),  # Monday 2 PM
+        ]
+        results = self.calculator.calculate_due_dates(requests)
+        self.assertEqual(len(results), 3)
+        self.assertIsInstance(results[0], ValueError)
+        self.assertEqual(
+            str(results[0]),
+            "Submit date must be during working hours (9AM to 5PM, Monday to Friday)",
+        )
+        self.assertEqual(results[1], datetime.datetime(2025, 3, 13, 14, 12))
+        self.assertIsInstance(results[2], ValueError)
+        self.assertEqual(str(results[2]), "Turnaround time cannot be negative")
+
+    def test_validate_many(self):
+        """Test bulk validation returns one reason code per row."""
+        submit_dates = [
+            datetime.datetime(2025, 3, 10, 9, 0),  # Monday 9 AM
+            datetime.datetime(2025, 3, 10, 8, 0),  # Monday 8 AM
+            datetime.datetime(2025, 3, 15, 10, 0),  # Saturday 10 AM
+            datetime.datetime(2025, 3, 10, 14, 0),  # Monday 2 PM
+        ]
+        reasons = self.calculator.validate_many(iter(submit_dates), [4, 8, -1, -5])
+        self.assertEqual(
+            list(reasons),
+            [
+                REASON_VALID,
+                REASON_OFF_HOURS,
+                REASON_OFF_HOURS,
+                REASON_NEGATIVE_TURNAROUND,
+            ],
+        )
+
+    def test_validate_many_length_mismatch(self):
+        """Test bulk validation rejects columns of different lengths."""
+        submit_dates = [datetime.datetime(2025, 3, 10, 9, 0)] * 3
+        for turnarounds in ([4, 8], [4, 8, 1, 2]):
+            with self.assertRaises(ValueError) as cm:
+                self.calculator.validate_many(iter(submit_dates), iter(turnarounds))
+            self.assertEqual(
+                str(cm.exception),
+                "Submit dates and turnaround times must have the same length",
+            )
+
+    def test_work_ordinal_round_trip(self):
+        """Test converting to a work ordinal and back gives the same instant."""
+        submit_date = datetime.datetime(2025, 3, 11, 14, 12, 30)  # Tuesday 2:12 PM
+        ordinal = self.calculator.to_work_ordinal(submit_date)
+        self.assertEqual(self.calculator.from_work_ordinal(ordinal), submit_date)
+
+    def test_work_ordinal_arithmetic(self):
+        """Test due dates and elapsed time can be computed on work ordinals."""
+        submit_date = datetime.datetime(2025, 3, 11, 14, 12)  # Tuesday 2:12 PM
+        ordinal = self.calculator.to_work_ordinal(submit_date)
+        due_date = self.calculator.from_work_ordinal(ordinal + 16 * 3600)
+        self.assertEqual(due_date, datetime.datetime(2025, 3, 13, 14, 12))
+
+        # Friday 2 PM to Monday 3 PM is 9 working hours
+        start = self.calculator.to_work_ordinal(datetime.datetime(2025, 3, 14, 14, 0))
+        end = self.calculator.to_work_ordinal(datetime.datetime(2025, 3, 17, 15, 0))
+        self.assertEqual(end - start, 9 * 3600)
+
+    def test_work_ordinal_outside_working_hours(self):
+        """Test off-hours instants map to the next working instant."""
+        saturday = datetime.datetime(2025, 3, 15, 10, 0)  # Saturday 10 AM
+        monday = datetime.datetime(2025, 3, 17, 9, 0)  # Monday 9 AM
+        self.assertEqual(
+            self.calculator.to_work_ordinal(saturday),
+            self.calculator.to_work_ordinal(monday),
+        )
+        # The end of a working day is the start of the next one
+        friday_end = datetime.datetime(2025, 3, 14, 17, 0)  # Friday 5 PM
+        ordinal = self.calculator.to_work_ordinal(friday_end)
+        self.assertEqual(self.calculator.from_work_ordinal(ordinal), monday)
+
+    def test_negative_work_ordinal(self):
+        """Test with a negative work ordinal."""
+        with self.assertRaises(ValueError) as cm:
+            self.calculator.from_work_ordinal(-1)
+        self.assertEqual(str(cm.exception), "Work ordinal cannot be negative")
+
+    def test_working_time_between(self):
+        """Test working time elapsed between two dates."""
+        # Tuesday 2:12 PM to Thursday 2:12 PM is 16 working hours
+        start = datetime.datetime(2025, 3, 11, 14, 12)
+        end = datetime.datetime(2025, 3, 13, 14, 12)
+        self.assertEqual(
+            self.calculator.working_time_between(start, end),
+            datetime.timedelta(hours=16),
+        )
+        self.assertEqual(
+            self.calculator.working_time_between(end, start),
+            datetime.timedelta(hours=-16),
+        )
+
+    def test_working_time_between_outside_working_hours(self):
+        """Test working time only counts working hours."""
+        # Friday 8 PM to Monday 8 AM contains no working time
+        start = datetime.datetime(2025, 3, 14, 20, 0)
+        end = datetime.datetime(2025, 3, 17, 8, 0)
+        self.assertEqual(
+            self.calculator.working_time_between(start, end), datetime.timedelta(0)
+        )
+
+    def test_latest_submit_for(self):
+        """Test the latest submit date that meets a due date."""
+        # Due Thursday 2:12 PM with 16 hours turnaround
+        due_date = datetime.datetime(2025, 3, 13, 14, 12)
+        submit_date = self.calculator.latest_submit_for(due_date, 16)
+        self.assertEqual(submit_date, datetime.datetime(2025, 3, 11, 14, 12))
+        self.assertEqual(self.calculator.calculate_due_date(submit_date, 16), due_date)
+
+    def test_latest_submit_for_across_weekend(self):
+        """Test the latest submit date when the due date is on a weekend."""
+        # Due Saturday 10 AM with 9 hours turnaround, submitting Thursday 4 PM
+        # would end at the start of Monday, so the turnaround must end on Friday
+        due_date = datetime.datetime(2025, 3, 15, 10, 0)
+        submit_date = self.calculator.latest_submit_for(due_date, 9)
+        self.assertEqual(
+            submit_date, datetime.datetime(2025, 3, 13, 15, 59, 59, 999999)
+        )
+        self.assertEqual(
+            self.calculator.calculate_due_date(submit_date, 9),
+            datetime.datetime(2025, 3, 14, 16, 59, 59, 999999),
+        )
+
+        # Due Monday 3 PM with 6 hours turnaround, submit Monday 9 AM
+        due_date = datetime.datetime(2025, 3, 17, 15, 0)
+        submit_date = self.calculator.latest_submit_for(due_date, 6)
+        self.assertEqual(submit_date, datetime.datetime(2025, 3, 17, 9, 0))
+
+    def test_latest_submit_for_due_date_before_working_hours(self):
+        """Test the latest submit date when the due date is before 9 AM."""
+        # Due Thursday 8:15 AM with 16 hours turnaround must end on Wednesday
+        due_date = datetime.datetime(2025, 3, 13, 8, 15)
+        submit_date = self.calculator.latest_submit_for(due_date, 16)
+        self.assertEqual(
+            submit_date, datetime.datetime(2025, 3, 10, 16, 59, 59, 999999)
+        )
+        self.assertLessEqual(
+            self.calculator.calculate_due_date(submit_date, 16), due_date
+        )
+
+        # With no turnaround the end of Wednesday itself is in time
+        submit_date = self.calculator.latest_submit_for(due_date, 0)
+        self.assertEqual(submit_date, datetime.datetime(2025, 3, 12, 17, 0))
+
+    def test_latest_submit_for_zero_turnaround_across_closure(self):
+        """Test zero turnaround submit dates before a closure are accepted."""
+        holidays = HolidayCalendar(
+            [datetime.date(2025, 3, 18)],
+            {datetime.date(2025, 3, 12): [(datetime.time(12), datetime.time(13))]},
+        )
+        # 10 PM to 6 AM every night, closed all day on Tuesday the 18th
+        night_shift = WorkSchedule(
+            {day: [(datetime.time(22), datetime.time(6))] for day in range(7)}
+        )
+        cases = [
+            # Due during the lunch closure on Wednesday the 12th
+            (WorkSchedule.from_hours(9, 17), datetime.datetime(2025, 3, 12, 12, 30)),
+            # Due in the closed night after Monday the 17th
+            (night_shift, datetime.datetime(2025, 3, 18, 3, 0)),
+        ]
+        for engine in ("weekly", "bitmap", "daily"):
+            for schedule, due_date in cases:
+                calculator = DueDateCalculator(
+                    schedule, holidays=holidays, engine=engine
+                )
+                submit_date = calculator.latest_submit_for(due_date, 0)
+                self.assertLessEqual(
+                    calculator.calculate_due_date(submit_date, 0), due_date
+                )
+                self.assertEqual(calculator.latest_submit_for(due_date, 0), submit_date)
+        self.assertEqual(
+            submit_date, datetime.datetime(2025, 3, 17, 23, 59, 59, 999999)
+        )
+
+    def test_latest_submits_for_batch(self):
+        """Test batch latest submit dates report invalid items without raising."""
+        requests = [
+            (datetime.datetime(2025, 3, 13, 14, 12), 16),  # Thursday 2:12 PM
+            (datetime.datetime(2025, 3, 17, 15, 0), -5),  # Monday 3 PM
+            (datetime.datetime(2025, 3, 24, 10, 0), 80),  # Monday 10 AM
+        ]
+        results = self.calculator.latest_submits_for(iter(requests))
+        self.assertEqual(results[0], datetime.datetime(2025, 3, 11, 14, 12))
+        self.assertIsInstance(results[1], ValueError)
+        self.assertEqual(str(results[1]), "Turnaround time cannot be negative")
+        self.assertEqual(results[2], datetime.datetime(2025, 3, 10, 10, 0))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,215 @@
+import unittest
+import datetime
+import json
+import os
+import sys
+import tempfile
+from unittest import mock
+from due_date_calculator import CalendarConfig, CalendarLayer, DueDateCalculator
+
+try:
+    import tomllib
+except ImportError:  # pragma: no cover - Python 3.10 and earlier
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+CONFIG = {
+    "calendars": {
+        "company": {
+            "hours": ["09:00", "17:00"],
+            "days": ["mon", "tue", "wed", "thu", "fri"],
+            "rules": [{"month": 12, "day": 25, "observed": "nearest"}, {"easter": 1}],
+            "years": [2000, 2100],
+            "off_hours_policy": "roll_forward",
+        },
+        "support": {
+            "parent": "company",
+            "schedule": {
+                "monday": [["08:00", "12:00"], ["13:00", "17:00"]],
+                "sat": [["09:00", "13:00"]],
+            },
+            "holidays": ["2025-12-22"],
+            "engine": "daily",
+        },
+    }
+}
+
+# The same calendars in TOML
+TOML_CONFIG = """
+[calendars.company]
+hours = ["09:00", "17:00"]
+days = ["mon", "tue", "wed", "thu", "fri"]
+rules = [{ month = 12, day = 25, observed = "nearest" }, { easter = 1 }]
+years = [2000, 2100]
+off_hours_policy = "roll_forward"
+
+[calendars.support]
+parent = "company"
+schedule = { monday = [["08:00", "12:00"], ["13:00", "17:00"]], sat = [["09:00", "13:00"]] }
+holidays = [2025-12-22]
+engine = "daily"
+"""
+
+
+class TestCalendarConfig(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, "calendars.json")
+        with open(self.path, "w") as config_file:
+            json.dump(CONFIG, config_file)
+        self.cache_dir = os.path.join(self.directory.name, "cache")
+        self.config = CalendarConfig.load(self.path, cache_dir=self.cache_dir)
+
+    def write_toml(self):
+        path = os.path.join(self.directory.name, "calendars.toml")
+        with open(path, "w") as config_file:
+            config_file.write(TOML_CONFIG)
+        return path
+
+    @unittest.skipIf(tomllib is None, "tomllib and tomli are not installed")
+    def test_load_toml(self):
+        """Test calendars are built from a TOML file."""
+        config = CalendarConfig.load(self.write_toml())
+        self.assertEqual(list(config), ["company", "support"])
+        company = config.build("company")
+        self.assertEqual(company.off_hours_policy, "roll_forward")
+        # Christmas on Thursday, due Friday 10 AM
+        self.assertEqual(
+            company.calculate_due_date(datetime.datetime(2025, 12, 24, 16, 0), 2),
+            datetime.datetime(2025, 12, 26, 10, 0),
+        )
+
+    def test_inherited_settings(self):
+        """Test calendars inherit the settings their parent sets."""
+        support = self.config.build("support")
+        self.assertEqual(support.engine, "daily")
+        self.assertEqual(support.off_hours_policy, "roll_forward")
+        self.assertIsInstance(support.holidays, CalendarLayer)
+        self.assertIs(support.holidays.parent, self.config.get_holidays("company"))
+        # Saturday noon, an hour that day, Monday the 22nd is off, then the
+        # next Saturday
+        submit_date = datetime.datetime(2025, 12, 20, 12, 0)
+        self.assertEqual(
+            support.calculate_due_date(submit_date, 2),
+            datetime.datetime(2025, 12, 27, 10, 0),
+        )
+
+    def test_inherited_hours_and_days(self):
+        """Test calendars inherit the hours and days they do not set."""
+        config = CalendarConfig(
+            {
+                "office": {"hours": ["08:00", "16:00"]},
+                "weekend": {"parent": "office", "days": ["sat", "sun"]},
+                "support": {"parent": "weekend", "hours": ["10:00", "14:00"]},
+            }
+        )
+        self.assertEqual(
+            config.get_schedule("weekend").describe(), "8AM to 4PM, Saturday, Sunday"
+        )
+        self.assertEqual(
+            config.get_schedule("support").describe(),
+            "10AM to 2PM, Saturday, Sunday",
+        )
+        # The off-hours message names the hours of schedules without a description
+        with self.assertRaises(ValueError) as cm:
+            config.build("weekend").calculate_due_date(
+                datetime.datetime(2025, 3, 15, 17, 0), 1
+            )
+        self.assertEqual(
+            str(cm.exception),
+            "Submit date must be during working hours (8AM to 4PM, Saturday, Sunday)",
+        )
+
+    def test_load_json(self):
+        """Test calendars are built from a JSON file."""
+        path = os.path.join(self.directory.name, "calendars.json")
+        with open(path, "w") as config_file:
+            json.dump(
+                {
+                    "calendars": {
+                        "weekend": {"hours": ["10:00", "14:00"], "days": [5, 6]}
+                    }
+                },
+                config_file,
+            )
+        weekend = CalendarConfig.load(path).build("weekend")
+        self.assertEqual(
+            weekend.calculate_due_date(datetime.datetime(2025, 3, 15, 13, 0), 2),
+            datetime.datetime(2025, 3, 16, 11, 0),
+        )
+
+    def test_day_index_cache(self):
+        """Test day indexes are read back from the cache until a calendar changes."""
+        self.config.build("support")
+        (cached,) = os.listdir(self.cache_dir)
+
+        config = CalendarConfig.load(self.path, cache_dir=self.cache_dir)
+        support = config.build("support")
+        self.assertEqual(os.listdir(self.cache_dir), [cached])
+        self.assertEqual(
+            support.day_index.index,
+            DueDateCalculator(
+                support.schedule, holidays=support.holidays, engine="daily"
+            ).day_index.index,
+        )
+
+        config.calendars["company"]["years"] = [2000, 2050]
+        config.build("support")
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+
+    def test_toml_without_parser(self):
+        """Test TOML files need tomllib or tomli, JSON files do not."""
+        with mock.patch.dict(sys.modules, {"tomllib": None, "tomli": None}):
+            with self.assertRaises(ImportError) as cm:
+                CalendarConfig.load(self.write_toml())
+            self.assertEqual(list(CalendarConfig.load(self.path)), list(self.config))
+        self.assertEqual(
+            str(cm.exception),
+            "Reading TOML needs Python 3.11 or later, or the tomli package",
+        )
+
+    def test_invalid_config(self):
+        """Test with unknown settings and parents."""
+        with self.assertRaises(ValueError) as cm:
+            CalendarConfig({"team": {"hour": ["09:00", "17:00"]}})
+        self.assertEqual(str(cm.exception), "Unknown setting of calendar team: hour")
+        with self.assertRaises(ValueError) as cm:
+            CalendarConfig({"team": {"parent": "region"}})
+        self.assertEqual(str(cm.exception), "Unknown parent of calendar team: region")
+        with self.assertRaises(ValueError) as cm:
+            CalendarConfig({"a": {"parent": "b"}, "b": {"parent": "a"}})
+        self.assertEqual(str(cm.exception), "Calendar a inherits from itself")
+
+    def test_invalid_inheritance(self):
+        """Test with open days and hours that cannot apply to the parent."""
+        config = CalendarConfig(
+            {
+                "office": {"hours": ["08:00", "16:00"]},
+                "team": {"parent": "office", "open_days": ["2025-12-24"]},
+                "solo": {"open_days": ["2025-12-24"]},
+                "shifts": {"schedule": {"mon": [["06:00", "14:00"]]}},
+                "late": {"parent": "shifts", "hours": ["14:00", "22:00"]},
+            }
+        )
+        with self.assertRaises(ValueError) as cm:
+            config.get_holidays("team")
+        self.assertEqual(
+            str(cm.exception),
+            "Calendar team has open days but its ancestors have no holidays or closures",
+        )
+        with self.assertRaises(ValueError) as cm:
+            config.get_holidays("solo")
+        self.assertEqual(str(cm.exception), "Calendar solo has open days but no parent")
+        with self.assertRaises(ValueError) as cm:
+            config.get_schedule("late")
+        self.assertEqual(
+            str(cm.exception),
+            "Calendar late must set both hours and days to replace an inherited schedule",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
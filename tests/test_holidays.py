@@ -0,0 +1,236 @@
+import unittest
+import datetime
+from due_date_calculator import DueDateCalculator, HolidayCalendar, WorkSchedule
+from due_date_calculator.holidays import HolidayYear
+
+# Good Friday and Easter Monday, Christmas and New Year 2025
+HOLIDAYS = [
+    datetime.date(2025, 4, 18),
+    datetime.date(2025, 4, 21),
+    datetime.date(2025, 12, 25),
+    datetime.date(2025, 12, 26),
+    datetime.date(2026, 1, 1),
+]
+
+# Christmas Eve afternoon is closed
+CLOSURES = {datetime.date(2025, 12, 24): [(datetime.time(13), datetime.time(17))]}
+
+
+class NewYearCalendar(HolidayCalendar):
+    """New Year's Day and Independence Day of every year, compiled on use."""
+
+    @property
+    def year_range(self):
+        return range(1, 10000)
+
+    def _compile_year(self, year):
+        independence_day = datetime.date(year, 7, 4).timetuple().tm_yday - 1
+        return HolidayYear(year, 1 | 1 << independence_day, {})
+
+
+class CyclicNewYearCalendar(NewYearCalendar):
+    """The same calendar, declared to repeat every 400 years."""
+
+    cycle_years = 400
+
+
+class TestHolidayCalendar(unittest.TestCase):
+    def setUp(self):
+        self.holidays = HolidayCalendar(HOLIDAYS, CLOSURES)
+        self.calculator = DueDateCalculator(holidays=self.holidays)
+
+    def test_is_holiday(self):
+        """Test full-day and partial-day closures are looked up per day."""
+        self.assertTrue(self.holidays.is_holiday(datetime.date(2025, 4, 18)))
+        self.assertFalse(self.holidays.is_holiday(datetime.date(2025, 4, 17)))
+        self.assertFalse(self.holidays.is_holiday(datetime.date(2025, 12, 24)))
+        self.assertTrue(self.holidays.is_closed(datetime.datetime(2025, 12, 24, 13, 0)))
+        self.assertFalse(
+            self.holidays.is_closed(datetime.datetime(2025, 12, 24, 12, 59))
+        )
+        self.assertEqual(self.holidays.year_range, range(2025, 2027))
+
+    def test_working_time_lost_per_year(self):
+        """Test the working time lost to closures in whole years."""
+        table = self.holidays.compile(self.calculator.schedule)
+        self.assertIs(table, self.holidays.compile(self.calculator.schedule))
+        # Four weekday holidays and a half day in 2025
+        self.assertEqual(table.lost_before_year(2026), 36 * 3600 * 1_000_000)
+        self.assertEqual(table.lost_before_year(2030), 44 * 3600 * 1_000_000)
+
+    def test_due_date_skips_holidays(self):
+        """Test due dates skip holidays next to a weekend."""
+        # Submit Thursday 2 PM, due 9 hours later (Tuesday 3 PM after Easter)
+        submit_date = datetime.datetime(2025, 4, 17, 14, 0)
+        due_date = self.calculator.calculate_due_date(submit_date, 9)
+        self.assertEqual(due_date, datetime.datetime(2025, 4, 22, 15, 0))
+
+    def test_due_date_at_end_of_day_before_holiday(self):
+        """Test a turnaround ending the day before a holiday is due that day."""
+        # Submit Thursday 2 PM, due 3 hours later (Thursday 5 PM)
+        submit_date = datetime.datetime(2025, 4, 17, 14, 0)
+        due_date = self.calculator.calculate_due_date(submit_date, 3)
+        self.assertEqual(due_date, datetime.datetime(2025, 4, 17, 17, 0))
+
+    def test_due_date_across_partial_closure(self):
+        """Test due dates skip a partial-day closure."""
+        # Submit Christmas Eve 11 AM, due 4 hours later (Monday 11 AM)
+        submit_date = datetime.datetime(2025, 12, 24, 11, 0)
+        due_date = self.calculator.calculate_due_date(submit_date, 4)
+        self.assertEqual(due_date, datetime.datetime(2025, 12, 29, 11, 0))
+
+    def test_due_date_across_new_year(self):
+        """Test due dates across holidays at the turn of the year."""
+        # Submit Wednesday 4 PM, due 2 hours later (Friday 10 AM)
+        submit_date = datetime.datetime(2025, 12, 31, 16, 0)
+        due_date = self.calculator.calculate_due_date(submit_date, 2)
+        self.assertEqual(due_date, datetime.datetime(2026, 1, 2, 10, 0))
+
+    def test_holiday_is_off_hours(self):
+        """Test submit dates during closures are outside working hours."""
+        for submit_date in (
+            datetime.datetime(2025, 4, 18, 10, 0),  # Good Friday
+            datetime.datetime(2025, 12, 24, 14, 0),  # Christmas Eve afternoon
+        ):
+            with self.assertRaises(ValueError) as cm:
+                self.calculator.calculate_due_date(submit_date, 8)
+            self.assertEqual(
+                str(cm.exception),
+                "Submit date must be during working hours (9AM to 5PM, Monday to Friday)",
+            )
+
+    def test_roll_off_hours_over_holidays(self):
+        """Test off-hours submit dates roll past holidays."""
+        submit_date = datetime.datetime(2025, 4, 18, 10, 0)  # Good Friday
+        calculator = DueDateCalculator(
+            off_hours_policy="roll_forward", holidays=self.holidays
+        )
+        self.assertEqual(
+            calculator.calculate_due_date(submit_date, 0),
+            datetime.datetime(2025, 4, 22, 9, 0),
+        )
+        calculator = DueDateCalculator(
+            off_hours_policy="roll_backward", holidays=self.holidays
+        )
+        self.assertEqual(
+            calculator.calculate_due_date(submit_date, 0),
+            datetime.datetime(2025, 4, 17, 17, 0),
+        )
+
+    def test_working_time_between_across_holidays(self):
+        """Test elapsed working time does not count closures."""
+        # Thursday 2 PM to Tuesday 3 PM is 9 working hours over Easter
+        start = datetime.datetime(2025, 4, 17, 14, 0)
+        end = datetime.datetime(2025, 4, 22, 15, 0)
+        self.assertEqual(
+            self.calculator.working_time_between(start, end),
+            datetime.timedelta(hours=9),
+        )
+
+    def test_latest_submit_for_across_holidays(self):
+        """Test the latest submit date skips holidays."""
+        due_date = datetime.datetime(2025, 4, 22, 15, 0)  # Tuesday 3 PM
+        submit_date = self.calculator.latest_submit_for(due_date, 9)
+        self.assertEqual(submit_date, datetime.datetime(2025, 4, 17, 14, 0))
+
+    def test_generated_closures_skip_whole_cycles(self):
+        """Test calendars repeating every 400 years give the same results."""
+        cyclic = DueDateCalculator(holidays=CyclicNewYearCalendar())
+        linear = DueDateCalculator(holidays=NewYearCalendar())
+        submit_date = datetime.datetime(2025, 3, 10, 10, 0)  # Monday 10 AM
+        for turnaround in (1000, 10**5, 10**6, 10**7):
+            self.assertEqual(
+                cyclic.calculate_due_date(submit_date, turnaround),
+                linear.calculate_due_date(submit_date, turnaround),
+            )
+        # Only the years of the submit and due dates are compiled
+        self.assertLessEqual(len(cyclic.holidays.compiled_years), 5)
+        self.assertLessEqual(len(linear.holidays.compiled_years), 5)
+
+    def test_due_date_after_latest_supported_date(self):
+        """Test due dates after datetime.max raise OverflowError."""
+        submit_date = datetime.datetime(2025, 3, 10, 10, 0)  # Monday 10 AM
+        with self.assertRaises(OverflowError) as cm:
+            self.calculator.calculate_due_date(submit_date, 2 * 10**7)
+        self.assertEqual(str(cm.exception), "Date is after the latest supported date")
+
+    def test_union_of_calendars(self):
+        """Test a union of calendars is closed whenever either calendar is."""
+        half_days = HolidayCalendar(
+            [datetime.date(2025, 12, 24)],
+            {
+                datetime.date(2025, 12, 23): [(datetime.time(9), datetime.time(11))],
+                datetime.date(2025, 12, 25): [(datetime.time(9), datetime.time(11))],
+            },
+        )
+        union = self.holidays | half_days
+        self.assertTrue(union.is_holiday(datetime.date(2025, 12, 24)))
+        self.assertTrue(union.is_holiday(datetime.date(2025, 12, 25)))
+        self.assertTrue(union.is_closed(datetime.datetime(2025, 12, 23, 10, 0)))
+        self.assertFalse(union.is_closed(datetime.datetime(2025, 12, 23, 11, 0)))
+        self.assertEqual(
+            union.get_year(2025).closures, {356: [[32400000000, 39600000000]]}
+        )
+        # Unions of calendars repeating together repeat too
+        self.assertEqual(
+            (CyclicNewYearCalendar() | CyclicNewYearCalendar()).cycle_years, 400
+        )
+        self.assertIsNone((CyclicNewYearCalendar() | self.holidays).cycle_years)
+
+    def test_only_used_years_compiled(self):
+        """Test the years before the ones used are counted, not compiled."""
+        holidays = NewYearCalendar() | self.holidays
+        calculator = DueDateCalculator(holidays=holidays)
+        # Submit Wednesday noon, 1 hour before the Christmas Eve closure, due
+        # 2 hours later (Monday 10 AM after Christmas)
+        submit_date = datetime.datetime(2025, 12, 24, 12, 0)
+        self.assertEqual(
+            calculator.calculate_due_date(submit_date, 2),
+            datetime.datetime(2025, 12, 29, 10, 0),
+        )
+        self.assertEqual(holidays.compiled_years, [2025])
+        self.assertEqual(holidays.calendars[0].compiled_years, [2025])
+        self.assertEqual(self.holidays.compiled_years, [2025])
+
+    def test_intersection_of_calculators(self):
+        """Test time only counts when both calculators are open."""
+        # The customer works 7 AM to 3 PM Monday to Saturday, and is closed on
+        # the Tuesday after Easter
+        customer = DueDateCalculator(
+            WorkSchedule.from_hours(7, 15, range(6)),
+            holidays=HolidayCalendar([datetime.date(2025, 4, 22)]),
+        )
+        for engine in ("weekly", "bitmap", "daily"):
+            calculator = DueDateCalculator(
+                holidays=self.holidays, engine=engine
+            ).intersection(customer)
+            self.assertEqual(calculator.engine, engine)
+            # Submit Thursday 2 PM, 1 hour that day and 2 hours on Wednesday
+            submit_date = datetime.datetime(2025, 4, 17, 14, 0)
+            self.assertEqual(
+                calculator.calculate_due_date(submit_date, 3),
+                datetime.datetime(2025, 4, 23, 11, 0),
+            )
+            self.assertEqual(
+                calculator.working_time_between(
+                    datetime.datetime(2025, 4, 17, 9, 0),
+                    datetime.datetime(2025, 4, 23, 17, 0),
+                ),
+                datetime.timedelta(hours=12),
+            )
+
+    def test_invalid_closure(self):
+        """Test with a closure that ends before it starts."""
+        with self.assertRaises(ValueError) as cm:
+            HolidayCalendar(
+                closures={
+                    datetime.date(2025, 12, 24): [
+                        (datetime.time(17), datetime.time(13))
+                    ]
+                }
+            )
+        self.assertEqual(str(cm.exception), "Working interval must end after it starts")
+
+
+if __name__ == "__main__":
+    unittest.main()
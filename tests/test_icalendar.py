@@ -0,0 +1,211 @@
+import io
+import os
+import tempfile
+import unittest
+import datetime
+from due_date_calculator import DueDateCalculator, ICalendar
+from due_date_calculator.icalendar import Recurrence
+
+FEED = """BEGIN:VCALENDAR
+VERSION:2.0
+BEGIN:VTIMEZONE
+TZID:America/New_York
+BEGIN:STANDARD
+DTSTART:19701101T020000
+TZOFFSETFROM:-0400
+TZOFFSETTO:-0500
+END:STANDARD
+END:VTIMEZONE
+BEGIN:VEVENT
+UID:christmas
+SUMMARY:Christmas break
+DTSTART;VALUE=DATE:20201224
+DTEND;VALUE=DATE:20201227
+RRULE:FREQ=YEARLY
+EXDATE;VALUE=DATE:20241224
+END:VEVENT
+BEGIN:VEVENT
+UID:all-hands
+SUMMARY:All hands
+DESCRIPTION:Quarterly all hands meeting\\, the whole company attends. No
+  tickets are worked on.
+DTSTART;TZID=America/New_York:20250106T090000
+DURATION:PT2H
+RRULE:FREQ=MONTHLY;INTERVAL=3;BYDAY=1MO;COUNT=4
+END:VEVENT
+BEGIN:VEVENT
+UID:move
+SUMMARY:Office move
+DTSTART:20250314T140000Z
+DTEND:20250317T120000Z
+END:VEVENT
+BEGIN:VEVENT
+UID:cancelled
+DTSTART;VALUE=DATE:20250501
+STATUS:CANCELLED
+END:VEVENT
+END:VCALENDAR
+"""
+
+
+class TestRecurrence(unittest.TestCase):
+    def occurrences(self, rule, start, first, last):
+        return list(Recurrence(rule, start).between(first, last))
+
+    def test_nth_weekday(self):
+        """Test yearly rules on the nth and last weekday of a month."""
+        self.assertEqual(
+            self.occurrences(
+                "FREQ=YEARLY;BYMONTH=11;BYDAY=4TH",
+                datetime.datetime(2020, 11, 26),
+                datetime.date(2025, 1, 1),
+                datetime.date(2026, 12, 31),
+            ),
+            [datetime.datetime(2025, 11, 27), datetime.datetime(2026, 11, 26)],
+        )
+        self.assertEqual(
+            self.occurrences(
+                "FREQ=YEARLY;BYMONTH=5;BYDAY=-1MO",
+                datetime.datetime(2020, 5, 25),
+                datetime.date(2025, 1, 1),
+                datetime.date(2025, 12, 31),
+            ),
+            [datetime.datetime(2025, 5, 26)],
+        )
+
+    def test_weekly_interval(self):
+        """Test every other week counts weeks from the first occurrence."""
+        self.assertEqual(
+            self.occurrences(
+                "FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,FR",
+                datetime.datetime(2025, 1, 6, 13, 0),
+                datetime.date(2025, 3, 1),
+                datetime.date(2025, 3, 16),
+            ),
+            [
+                datetime.datetime(2025, 3, 3, 13, 0),
+                datetime.datetime(2025, 3, 7, 13, 0),
+            ],
+        )
+
+    def test_count_and_until(self):
+        """Test counted rules skip missing days and stop at UNTIL."""
+        # There is no 31st in February and April
+        self.assertEqual(
+            self.occurrences(
+                "FREQ=MONTHLY;COUNT=3",
+                datetime.datetime(2025, 1, 31),
+                datetime.date(2025, 3, 1),
+                datetime.date(2026, 12, 31),
+            ),
+            [datetime.datetime(2025, 3, 31), datetime.datetime(2025, 5, 31)],
+        )
+        self.assertEqual(
+            self.occurrences(
+                "FREQ=DAILY;INTERVAL=3;UNTIL=20250110",
+                datetime.datetime(2025, 1, 1),
+                datetime.date(2025, 1, 1),
+                datetime.date(2025, 12, 31),
+            ),
+            [
+                datetime.datetime(2025, 1, 1),
+                datetime.datetime(2025, 1, 4),
+                datetime.datetime(2025, 1, 7),
+                datetime.datetime(2025, 1, 10),
+            ],
+        )
+
+    def test_unsupported_frequency(self):
+        """Test rules more frequent than daily are rejected."""
+        with self.assertRaises(ValueError) as cm:
+            Recurrence("FREQ=HOURLY", datetime.datetime(2025, 1, 1))
+        self.assertEqual(
+            str(cm.exception),
+            "Recurrence frequency must be one of: DAILY, WEEKLY, MONTHLY, YEARLY",
+        )
+
+
+class TestICalendar(unittest.TestCase):
+    def setUp(self):
+        self.calendar = ICalendar.load(io.StringIO(FEED), time_zone="Europe/Budapest")
+
+    def test_recurring_all_day_events(self):
+        """Test yearly all-day events close every day they cover."""
+        for day in (24, 25, 26):
+            self.assertTrue(self.calendar.is_holiday(datetime.date(2025, 12, day)))
+            self.assertTrue(self.calendar.is_holiday(datetime.date(2040, 12, day)))
+        self.assertFalse(self.calendar.is_holiday(datetime.date(2025, 12, 27)))
+        # The 2024 occurrence is excluded
+        self.assertFalse(self.calendar.is_holiday(datetime.date(2024, 12, 25)))
+
+    def test_timed_events_in_calendar_time_zone(self):
+        """Test timed events close parts of days in the calendar's time zone."""
+        # 9 to 11 AM in New York is 3 to 5 PM in Budapest, on the first
+        # Monday of every third month, four times
+        self.assertTrue(self.calendar.is_closed(datetime.datetime(2025, 1, 6, 15, 0)))
+        self.assertFalse(self.calendar.is_closed(datetime.datetime(2025, 1, 6, 9, 0)))
+        self.assertTrue(self.calendar.is_closed(datetime.datetime(2025, 10, 6, 16, 0)))
+        self.assertFalse(self.calendar.is_closed(datetime.datetime(2026, 1, 5, 16, 0)))
+        # The office move closes from Friday 3 PM to Monday 1 PM
+        self.assertFalse(self.calendar.is_closed(datetime.datetime(2025, 3, 14, 14, 0)))
+        self.assertTrue(self.calendar.is_holiday(datetime.date(2025, 3, 15)))
+        self.assertTrue(self.calendar.is_closed(datetime.datetime(2025, 3, 17, 12, 0)))
+        self.assertFalse(self.calendar.is_closed(datetime.datetime(2025, 3, 17, 13, 0)))
+
+    def test_timed_event_moved_into_next_year(self):
+        """Test timed events that convert into the next year are kept."""
+        calendar = ICalendar.load(
+            [
+                "BEGIN:VEVENT\n",
+                "DTSTART:20251231T230000Z\n",
+                "DTEND:20251231T235900Z\n",
+                "END:VEVENT\n",
+            ],
+            time_zone="Europe/Budapest",
+        )
+        # Midnight to 12:59 AM on New Year's Day in Budapest
+        self.assertEqual(calendar.get_year(2026).closures, {0: [[0, 3540000000]]})
+        self.assertTrue(calendar.is_closed(datetime.datetime(2026, 1, 1, 0, 30)))
+        self.assertFalse(calendar.is_closed(datetime.datetime(2025, 12, 31, 23, 30)))
+
+    def test_cancelled_events(self):
+        """Test cancelled events are skipped."""
+        self.assertFalse(self.calendar.is_holiday(datetime.date(2025, 5, 1)))
+
+    def test_due_date(self):
+        """Test calculators skip the imported closures."""
+        calculator = DueDateCalculator(holidays=self.calendar)
+        # Friday 2 PM, one hour before the office move, resumes Monday 1 PM
+        self.assertEqual(
+            calculator.calculate_due_date(datetime.datetime(2025, 3, 14, 14, 0), 2),
+            datetime.datetime(2025, 3, 17, 14, 0),
+        )
+
+    def test_only_used_years_compiled(self):
+        """Test recurring events are only expanded into the years used."""
+        calculator = DueDateCalculator(holidays=self.calendar)
+        # The Christmas break recurs every year from 2020 with no end
+        self.assertEqual(self.calendar.year_range.stop, 10000)
+        calculator.calculate_due_date(datetime.datetime(2025, 12, 23, 16, 0), 2)
+        self.assertEqual(self.calendar.compiled_years, [2025])
+
+    def test_load_file(self):
+        """Test feeds are read from a path with folded lines."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "closures.ics")
+            with open(path, "w", encoding="utf-8", newline="") as file:
+                file.write(FEED.replace("\n", "\r\n"))
+            calendar = ICalendar.load(path)
+        # Without a time zone, times are taken as wall time
+        self.assertTrue(calendar.is_closed(datetime.datetime(2025, 1, 6, 10, 0)))
+        self.assertTrue(calendar.is_holiday(datetime.date(2030, 12, 26)))
+
+    def test_invalid_line(self):
+        """Test lines without a value are rejected."""
+        with self.assertRaises(ValueError) as cm:
+            ICalendar.load(["BEGIN:VEVENT\n", "DTSTART\n"])
+        self.assertEqual(str(cm.exception), "Invalid iCalendar line: DTSTART")
+
+
+if __name__ == "__main__":
+    unittest.main()
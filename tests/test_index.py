@@ -0,0 +1,74 @@
+import unittest
+import datetime
+from due_date_calculator import (
+    ENGINE_DAILY,
+    DueDateCalculator,
+    HolidayCalendar,
+    WorkSchedule,
+)
+from due_date_calculator.index import get_day_index
+
+
+class TestDayIndex(unittest.TestCase):
+    def setUp(self):
+        self.holidays = HolidayCalendar(
+            [datetime.date(2025, 4, 18), datetime.date(2025, 4, 21)],
+            {datetime.date(2025, 4, 17): [(datetime.time(12), datetime.time(13))]},
+        )
+        self.calculator = DueDateCalculator(holidays=self.holidays, engine=ENGINE_DAILY)
+
+    def test_index_is_shared(self):
+        """Test calculators with the same calendar share one day index."""
+        other = DueDateCalculator(holidays=self.holidays, engine=ENGINE_DAILY)
+        self.assertIs(self.calculator.day_index, other.day_index)
+
+    def test_index_entries(self):
+        """Test the index holds the work ordinal at the start of every day."""
+        index = get_day_index(
+            self.calculator.schedule, self.holidays, DueDateCalculator.INDEX_YEARS
+        )
+        self.assertEqual(len(index.index), 47847 + 1)
+        weekly = DueDateCalculator(holidays=self.holidays)
+        for day in range(14, 24):
+            midnight = datetime.datetime(2025, 4, day)
+            self.assertEqual(
+                index.index[midnight.toordinal() - index.first_day],
+                weekly._to_work_microseconds(midnight),
+            )
+
+    def test_matches_weekly_engine(self):
+        """Test the daily engine gives the same due dates as the weekly one."""
+        weekly = DueDateCalculator(holidays=self.holidays)
+        submit_date = datetime.datetime(2025, 4, 16, 9, 30, 15)  # Wednesday
+        for turnaround in range(0, 60):
+            self.assertEqual(
+                self.calculator.calculate_due_date(submit_date, turnaround / 4),
+                weekly.calculate_due_date(submit_date, turnaround / 4),
+            )
+
+    def test_due_date_skips_closures(self):
+        """Test due dates skip partial-day and full-day closures."""
+        # Submit Thursday 11:30 AM, due 5 hours later (Tuesday 9:30 AM)
+        submit_date = datetime.datetime(2025, 4, 17, 11, 30)
+        due_date = self.calculator.calculate_due_date(submit_date, 5)
+        self.assertEqual(due_date, datetime.datetime(2025, 4, 22, 9, 30))
+
+        # Submit Thursday 9 AM, due 7 hours later (Thursday 5 PM)
+        submit_date = datetime.datetime(2025, 4, 17, 9, 0)
+        due_date = self.calculator.calculate_due_date(submit_date, 7)
+        self.assertEqual(due_date, datetime.datetime(2025, 4, 17, 17, 0))
+
+    def test_outside_index_years(self):
+        """Test dates outside the index fall back to the weekly engine."""
+        schedule = WorkSchedule.from_hours(9, 17)
+        weekly = DueDateCalculator(schedule)
+        calculator = DueDateCalculator(schedule, engine=ENGINE_DAILY)
+        # Submit Friday 3 PM, due 4 hours later in the first week of 2101
+        submit_date = datetime.datetime(2100, 12, 31, 15, 0)
+        due_date = calculator.calculate_due_date(submit_date, 4)
+        self.assertEqual(due_date, datetime.datetime(2101, 1, 3, 11, 0))
+        self.assertEqual(due_date, weekly.calculate_due_date(submit_date, 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
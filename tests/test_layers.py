@@ -0,0 +1,90 @@
+import unittest
+import datetime
+from due_date_calculator import (
+    CalendarLayer,
+    DueDateCalculator,
+    FixedDate,
+    HolidayCalendar,
+    RuleCalendar,
+)
+
+# Submit Friday March 14th 2025 at 4 PM, due 2 hours later
+SUBMIT_DATE = datetime.datetime(2025, 3, 14, 16, 0)
+
+
+class TestCalendarLayer(unittest.TestCase):
+    def setUp(self):
+        # The company closes on March 17th and 18th, the region also on the
+        # 19th but works on the 18th, the team closes the morning of the 20th
+        self.company = HolidayCalendar(
+            [datetime.date(2025, 3, 17), datetime.date(2025, 3, 18)]
+        )
+        self.region = CalendarLayer(
+            self.company,
+            holidays=[datetime.date(2025, 3, 19)],
+            open_days=[datetime.date(2025, 3, 18)],
+        )
+        self.team = CalendarLayer(
+            self.region,
+            closures={
+                datetime.date(2025, 3, 20): [(datetime.time(9), datetime.time(12))]
+            },
+        )
+
+    def test_inherited_closures(self):
+        """Test layers add to and reopen the closures of their ancestors."""
+        self.assertTrue(self.team.is_holiday(datetime.date(2025, 3, 17)))
+        self.assertFalse(self.team.is_holiday(datetime.date(2025, 3, 18)))
+        self.assertTrue(self.team.is_holiday(datetime.date(2025, 3, 19)))
+        self.assertTrue(self.team.is_closed(datetime.datetime(2025, 3, 20, 11, 0)))
+        self.assertFalse(self.region.is_closed(datetime.datetime(2025, 3, 20, 11, 0)))
+
+        calculator = DueDateCalculator(holidays=self.team)
+        self.assertEqual(
+            calculator.calculate_due_date(SUBMIT_DATE, 2),
+            datetime.datetime(2025, 3, 18, 10, 0),
+        )
+        self.assertEqual(
+            calculator.calculate_due_date(SUBMIT_DATE, 10),
+            datetime.datetime(2025, 3, 20, 13, 0),
+        )
+
+    def test_unchanged_years_are_shared(self):
+        """Test years a layer does not change are its parent's own."""
+        rules = RuleCalendar([FixedDate(1, 1)])
+        layer = CalendarLayer(rules, holidays=[datetime.date(2025, 3, 17)])
+        self.assertIs(layer.get_year(2024), rules.get_year(2024))
+        self.assertIsNot(layer.get_year(2025), rules.get_year(2025))
+
+        table = layer.compile(DueDateCalculator().schedule)
+        self.assertIs(
+            table._get_year_table(2024), table.parent_table._get_year_table(2024)
+        )
+        # One more 8 hour day lost in 2025 than in the rules
+        self.assertEqual(
+            table.lost_before_year(2030) - table.parent_table.lost_before_year(2030),
+            8 * 3600 * 1_000_000,
+        )
+
+    def test_invalidated_when_ancestor_changes(self):
+        """Test calculators see changes to any ancestor of their calendar."""
+        for engine in ("weekly", "bitmap", "daily"):
+            calculator = DueDateCalculator(holidays=self.team, engine=engine)
+            self.assertEqual(
+                calculator.calculate_due_date(SUBMIT_DATE, 2),
+                datetime.datetime(2025, 3, 18, 10, 0),
+            )
+            # The company also closes on the 20th, the region on the 18th after
+            # all
+            self.company.update(holidays=[datetime.date(2025, 3, 20)])
+            self.region.update(removed=[datetime.date(2025, 3, 18)])
+            self.assertEqual(
+                calculator.calculate_due_date(SUBMIT_DATE, 2),
+                datetime.datetime(2025, 3, 21, 10, 0),
+            )
+            self.company.update(removed=[datetime.date(2025, 3, 20)])
+            self.region.update(open_days=[datetime.date(2025, 3, 18)])
+
+
+if __name__ == "__main__":
+    unittest.main()
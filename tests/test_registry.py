@@ -0,0 +1,122 @@
+import gc
+import threading
+import unittest
+import weakref
+import datetime
+from due_date_calculator import CalendarRegistry, DueDateCalculator, HolidayCalendar
+
+# Each tenant's office is closed on a different day of March 2025
+TENANTS = {tenant: [datetime.date(2025, 3, 10 + tenant)] for tenant in range(5)}
+
+
+class TestCalendarRegistry(unittest.TestCase):
+    def setUp(self):
+        self.loaded = []
+        self.registry = CalendarRegistry(self.load, max_entries=3)
+
+    def load(self, tenant):
+        self.loaded.append(tenant)
+        return DueDateCalculator(holidays=HolidayCalendar(TENANTS[tenant]))
+
+    def test_loaded_on_first_use(self):
+        """Test calculators are loaded once and then served from the registry."""
+        calculator = self.registry.get(0)
+        self.assertIs(self.registry[0], calculator)
+        self.assertEqual(self.loaded, [0])
+        self.assertEqual(self.registry.stats[:3], (1, 1, 0))
+        # Submit Friday 4 PM, the tenant is closed on Monday so it is due Tuesday
+        self.assertEqual(
+            calculator.calculate_due_date(datetime.datetime(2025, 3, 7, 16, 0), 2),
+            datetime.datetime(2025, 3, 11, 10, 0),
+        )
+
+    def test_least_recently_used_evicted(self):
+        """Test the least recently used calculator is evicted first."""
+        for tenant in (0, 1, 2, 0, 3):
+            self.registry.get(tenant)
+        self.assertNotIn(1, self.registry)
+        self.assertEqual(len(self.registry), 3)
+        self.assertEqual(self.registry.stats[:3], (1, 4, 1))
+        self.registry.get(1)
+        self.assertEqual(self.loaded, [0, 1, 2, 3, 1])
+
+    def test_memory_accounting(self):
+        """Test entries are measured and evicted past the memory limit."""
+        calculator = self.registry.get(0)
+        calculator.calculate_due_date(datetime.datetime(2025, 3, 7, 16, 0), 2)
+        self.registry.get(0)
+        self.assertGreater(self.registry.nbytes, 0)
+        self.assertEqual(self.registry.nbytes, calculator.nbytes)
+
+        self.registry.max_bytes = calculator.nbytes
+        self.registry.get(1).calculate_due_date(datetime.datetime(2025, 3, 7, 16), 2)
+        self.registry.get(1)
+        self.assertNotIn(0, self.registry)
+        self.assertIn(1, self.registry)
+        self.assertEqual(self.registry.stats[2:4], (1, 1))
+
+    def test_shared_parts_counted_once(self):
+        """Test calendars shared by several calculators are counted once."""
+        holidays = HolidayCalendar(TENANTS[0])
+        registry = CalendarRegistry(
+            lambda tenant: DueDateCalculator(holidays=holidays, engine="daily")
+        )
+        first = registry.get(0)
+        second = registry.get(1)
+        self.assertIsNot(first, second)
+        self.assertEqual(registry.nbytes, first.nbytes)
+        self.assertGreater(registry.nbytes, 0)
+
+        registry.discard(0)
+        self.assertEqual(registry.nbytes, second.nbytes)
+        registry.discard(1)
+        self.assertEqual(registry.nbytes, 0)
+
+    def test_evicted_calendars_are_freed(self):
+        """Test nothing keeps the calendar of an evicted calculator alive."""
+        registry = CalendarRegistry(
+            lambda tenant: DueDateCalculator(
+                holidays=HolidayCalendar(TENANTS[tenant]), engine="daily"
+            ),
+            max_entries=1,
+        )
+        holidays = weakref.ref(registry.get(0).holidays)
+        registry.get(1)
+        gc.collect()
+        self.assertIsNone(holidays())
+
+    def test_shared_between_threads(self):
+        """Test concurrent lookups load each calendar once and keep counts."""
+        registry = CalendarRegistry(self.load, max_entries=5)
+
+        def look_up():
+            for _ in range(50):
+                for tenant in TENANTS:
+                    registry.get(tenant)
+
+        threads = [threading.Thread(target=look_up) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(self.loaded), sorted(TENANTS))
+        self.assertEqual(registry.stats[:4], (8 * 50 * 5 - 5, 5, 0, 5))
+
+    def test_discard(self):
+        """Test discarded calculators are loaded again on their next use."""
+        self.registry.get(0)
+        self.registry.discard(0)
+        self.registry.discard(4)
+        self.assertEqual(self.registry.stats[3:], (0, 0))
+        self.registry.get(0)
+        self.assertEqual(self.loaded, [0, 0])
+
+    def test_invalid_size(self):
+        """Test with a registry that cannot hold any calendar."""
+        with self.assertRaises(ValueError) as cm:
+            CalendarRegistry(self.load, max_entries=0)
+        self.assertEqual(str(cm.exception), "Registry must hold at least one calendar")
+
+
+if __name__ == "__main__":
+    unittest.main()
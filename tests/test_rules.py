@@ -0,0 +1,123 @@
+import unittest
+import datetime
+from due_date_calculator import (
+    DueDateCalculator,
+    EasterOffset,
+    FixedDate,
+    NthWeekday,
+    RuleCalendar,
+)
+from due_date_calculator.rules import easter
+
+# Federal holidays of the United States, observed on the nearest weekday
+US_RULES = [
+    FixedDate(1, 1, observed="nearest"),
+    NthWeekday(1, 0, 3),  # Martin Luther King Jr. Day
+    NthWeekday(5, 0, -1),  # Memorial Day
+    FixedDate(7, 4, observed="nearest"),
+    NthWeekday(11, 3, 4),  # Thanksgiving
+    FixedDate(12, 25, observed="nearest"),
+]
+
+# Easter and Christmas bank holidays of England, observed on Mondays
+UK_RULES = [
+    EasterOffset(-2),  # Good Friday
+    EasterOffset(1),  # Easter Monday
+    FixedDate(12, 25, observed="monday"),
+    FixedDate(12, 26, observed="monday"),
+]
+
+
+class TestRuleCalendar(unittest.TestCase):
+    def setUp(self):
+        self.us = RuleCalendar(US_RULES, years=range(2000, 2101))
+        self.uk = RuleCalendar(UK_RULES, years=range(2000, 2101))
+
+    def test_easter(self):
+        """Test the date of Easter Sunday."""
+        self.assertEqual(easter(2000), datetime.date(2000, 4, 23))
+        self.assertEqual(easter(2025), datetime.date(2025, 4, 20))
+        self.assertEqual(easter(2038), datetime.date(2038, 4, 25))
+
+    def test_nth_weekday(self):
+        """Test holidays on the nth and the last weekday of a month."""
+        self.assertTrue(self.us.is_holiday(datetime.date(2024, 1, 15)))
+        self.assertTrue(self.us.is_holiday(datetime.date(2024, 5, 27)))
+        self.assertTrue(self.us.is_holiday(datetime.date(2024, 11, 28)))
+        self.assertFalse(self.us.is_holiday(datetime.date(2024, 11, 21)))
+        self.assertIsNone(NthWeekday(2, 0, 5).get_date(2025))
+
+    def test_easter_offset(self):
+        """Test holidays relative to Easter Sunday."""
+        self.assertTrue(self.uk.is_holiday(datetime.date(2024, 3, 29)))
+        self.assertTrue(self.uk.is_holiday(datetime.date(2024, 4, 1)))
+        self.assertFalse(self.uk.is_holiday(datetime.date(2025, 3, 29)))
+
+    def test_observed_nearest_weekday(self):
+        """Test holidays on a weekend are observed on the nearest weekday."""
+        # July 4th 2026 is a Saturday, New Year's Day 2022 too
+        self.assertTrue(self.us.is_holiday(datetime.date(2026, 7, 3)))
+        self.assertFalse(self.us.is_holiday(datetime.date(2026, 7, 4)))
+        self.assertTrue(self.us.is_holiday(datetime.date(2021, 12, 31)))
+        # Christmas 2022 is a Sunday
+        self.assertTrue(self.us.is_holiday(datetime.date(2022, 12, 26)))
+
+    def test_observed_monday(self):
+        """Test holidays on a weekend move to the next free weekday."""
+        # Christmas 2021 is a Saturday and Boxing Day a Sunday
+        self.assertTrue(self.uk.is_holiday(datetime.date(2021, 12, 27)))
+        self.assertTrue(self.uk.is_holiday(datetime.date(2021, 12, 28)))
+        self.assertFalse(self.uk.is_holiday(datetime.date(2021, 12, 29)))
+
+    def test_years_compiled_on_use(self):
+        """Test only the years that are used are generated and kept."""
+        calculator = DueDateCalculator(holidays=self.uk)
+        self.assertEqual(self.uk.compiled_years, [])
+        # Submit Thursday 4 PM, due 2 hours later (Tuesday 10 AM after Easter)
+        submit_date = datetime.datetime(2024, 3, 28, 16, 0)
+        self.assertEqual(
+            calculator.calculate_due_date(submit_date, 2),
+            datetime.datetime(2024, 4, 2, 10, 0),
+        )
+        self.assertEqual(self.uk.compiled_years, [2024])
+
+        # Calendars of every year keep only the years used too
+        for rules in (UK_RULES, US_RULES):
+            holidays = RuleCalendar(rules)
+            DueDateCalculator(holidays=holidays).calculate_due_date(submit_date, 2)
+            self.assertEqual(holidays.compiled_years, [2024])
+            self.assertLess(holidays.nbytes, 1000)
+
+    def test_gregorian_cycle(self):
+        """Test only calendars without Easter rules repeat every 400 years."""
+        self.assertEqual(RuleCalendar(US_RULES).cycle_years, 400)
+        self.assertIsNone(RuleCalendar(UK_RULES).cycle_years)
+
+    def test_engines_agree(self):
+        """Test every engine gives the same due dates with a rule calendar."""
+        # Submit Wednesday 3 PM, due 3 hours later (Friday 10 AM after Thanksgiving)
+        submit_date = datetime.datetime(2024, 11, 27, 15, 0)
+        due_dates = {
+            DueDateCalculator(holidays=self.us, engine=engine).calculate_due_date(
+                submit_date, 3
+            )
+            for engine in ("weekly", "bitmap", "daily")
+        }
+        self.assertEqual(due_dates, {datetime.datetime(2024, 11, 29, 10, 0)})
+
+    def test_invalid_rules(self):
+        """Test with an unknown observed rule and an invalid nth weekday."""
+        with self.assertRaises(ValueError) as cm:
+            FixedDate(1, 1, observed="friday")
+        self.assertEqual(
+            str(cm.exception), "Observed rule must be one of: monday, nearest"
+        )
+        with self.assertRaises(ValueError) as cm:
+            NthWeekday(5, 0, 0)
+        self.assertEqual(
+            str(cm.exception), "Nth weekday must be 1 to 5, or -1 to -5 from the end"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
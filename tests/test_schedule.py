@@ -0,0 +1,263 @@
+import unittest
+import datetime
+from zoneinfo import ZoneInfo
+from due_date_calculator import (
+    REASON_OFF_HOURS,
+    REASON_VALID,
+    DueDateCalculator,
+    WorkSchedule,
+)
+
+HOUR = 3600 * 1_000_000
+
+LUNCH_BREAK = [
+    (datetime.time(9), datetime.time(12)),
+    (datetime.time(13), datetime.time(17)),
+]
+
+
+class TestWorkSchedule(unittest.TestCase):
+    def setUp(self):
+        # Lunch break Monday to Thursday, short Friday
+        self.schedule = WorkSchedule(
+            {
+                0: LUNCH_BREAK,
+                1: LUNCH_BREAK,
+                2: LUNCH_BREAK,
+                3: LUNCH_BREAK,
+                4: [(datetime.time(9), datetime.time(13))],
+            }
+        )
+        self.calculator = DueDateCalculator(self.schedule)
+
+    def test_default_schedule(self):
+        """Test the default schedule matches the class constants."""
+        schedule = WorkSchedule.from_hours(9, 17)
+        self.assertEqual(DueDateCalculator().schedule, schedule)
+        self.assertEqual(schedule.week_length, 40 * 3600 * 1_000_000)
+        self.assertEqual(schedule.description, "9AM to 5PM, Monday to Friday")
+
+    def test_week_length(self):
+        """Test the working time in a week."""
+        self.assertEqual(self.schedule.week_length, 32 * 3600 * 1_000_000)
+
+    def test_overlapping_intervals_are_merged(self):
+        """Test overlapping intervals are merged into one."""
+        schedule = WorkSchedule(
+            {
+                0: [
+                    (datetime.time(9), datetime.time(13)),
+                    (datetime.time(12), datetime.time(17)),
+                ]
+            }
+        )
+        self.assertEqual(schedule, WorkSchedule.from_hours(9, 17, [0]))
+
+    def test_lunch_break(self):
+        """Test due dates skip the lunch break."""
+        # Submit Monday 11 AM, due 2 hours later (Monday 2 PM)
+        submit_date = datetime.datetime(2025, 3, 10, 11, 0)
+        due_date = self.calculator.calculate_due_date(submit_date, 2)
+        self.assertEqual(due_date, datetime.datetime(2025, 3, 10, 14, 0))
+
+        # Submit Monday 10 AM, due 2 hours later (end of the morning)
+        submit_date = datetime.datetime(2025, 3, 10, 10, 0)
+        due_date = self.calculator.calculate_due_date(submit_date, 2)
+        self.assertEqual(due_date, datetime.datetime(2025, 3, 10, 12, 0))
+
+    def test_lunch_break_is_off_hours(self):
+        """Test submit dates during the lunch break are rejected."""
+        submit_date = datetime.datetime(2025, 3, 10, 12, 30)  # Monday 12:30 PM
+        with self.assertRaises(ValueError) as cm:
+            self.calculator.calculate_due_date(submit_date, 1)
+        # Schedules without a description are described by their hours
+        self.assertEqual(
+            str(cm.exception),
+            "Submit date must be during working hours "
+            "(9AM to 12PM, 1PM to 5PM, Monday to Thursday; 9AM to 1PM, Friday)",
+        )
+
+    def test_short_friday(self):
+        """Test due dates on a short Friday."""
+        # Submit Friday 11 AM, due 4 hours later (Monday 11 AM)
+        submit_date = datetime.datetime(2025, 3, 14, 11, 0)
+        due_date = self.calculator.calculate_due_date(submit_date, 4)
+        self.assertEqual(due_date, datetime.datetime(2025, 3, 17, 11, 0))
+
+    def test_long_turnaround_time(self):
+        """Test a turnaround time spanning multiple weeks."""
+        # Submit Monday 10 AM, due 64 hours (two weeks) later
+        submit_date = datetime.datetime(2025, 3, 10, 10, 0)
+        due_date = self.calculator.calculate_due_date(submit_date, 64)
+        self.assertEqual(due_date, datetime.datetime(2025, 3, 24, 10, 0))
+        self.assertEqual(
+            self.calculator.working_time_between(submit_date, due_date),
+            datetime.timedelta(hours=64),
+        )
+
+    def test_sunday_to_thursday_week(self):
+        """Test a Sunday to Thursday working week."""
+        calculator = DueDateCalculator(WorkSchedule.from_hours(8, 16, [6, 0, 1, 2, 3]))
+        # Submit Thursday 2 PM, due 4 hours later (Sunday 10 AM)
+        submit_date = datetime.datetime(2025, 3, 13, 14, 0)
+        due_date = calculator.calculate_due_date(submit_date, 4)
+        self.assertEqual(due_date, datetime.datetime(2025, 3, 16, 10, 0))
+
+        # Submit Friday 10 AM is off-hours
+        with self.assertRaises(ValueError) as cm:
+            calculator.calculate_due_date(datetime.datetime(2025, 3, 14, 10, 0), 4)
+        self.assertEqual(
+            str(cm.exception),
+            "Submit date must be during working hours (8AM to 4PM, Sunday to Thursday)",
+        )
+
+    def test_overnight_shift(self):
+        """Test intervals ending at or before their start run past midnight."""
+        calculator = DueDateCalculator(WorkSchedule.from_hours(22, 6))
+        self.assertEqual(
+            repr(calculator.schedule), "WorkSchedule('10PM to 6AM, Monday to Friday')"
+        )
+        # Submit Monday 11 PM, due 7 hours later at the end of the shift
+        submit_date = datetime.datetime(2025, 3, 10, 23, 0)
+        self.assertEqual(
+            calculator.calculate_due_date(submit_date, 7),
+            datetime.datetime(2025, 3, 11, 6, 0),
+        )
+        # One more hour is due an hour into the next shift
+        self.assertEqual(
+            calculator.calculate_due_date(submit_date, 8),
+            datetime.datetime(2025, 3, 11, 23, 0),
+        )
+        # The Friday night shift ends on Saturday morning
+        submit_date = datetime.datetime(2025, 3, 15, 5, 0)
+        self.assertEqual(
+            calculator.calculate_due_date(submit_date, 2),
+            datetime.datetime(2025, 3, 17, 23, 0),
+        )
+
+    def test_shift_across_end_of_week(self):
+        """Test a Sunday night shift is split at the end of the week."""
+        schedule = WorkSchedule({6: [(datetime.time(20), datetime.time(8))]})
+        self.assertEqual(
+            schedule.intervals,
+            [(0, 8 * HOUR), ((6 * 24 + 20) * HOUR, 7 * 24 * HOUR)],
+        )
+        calculator = DueDateCalculator(schedule)
+        submit_date = datetime.datetime(2025, 3, 16, 21, 0)  # Sunday 9 PM
+        self.assertEqual(
+            calculator.calculate_due_date(submit_date, 11),
+            datetime.datetime(2025, 3, 17, 8, 0),
+        )
+
+    def test_continuous(self):
+        """Test a 24/7 schedule adds the turnaround time as elapsed time."""
+        calculator = DueDateCalculator(WorkSchedule.continuous())
+        self.assertTrue(calculator.schedule.is_continuous)
+        self.assertFalse(WorkSchedule.from_hours(9, 17).is_continuous)
+        submit_date = datetime.datetime(2025, 3, 15, 3, 17)  # Saturday
+        self.assertEqual(
+            calculator.calculate_due_date(submit_date, 50),
+            submit_date + datetime.timedelta(hours=50),
+        )
+        self.assertEqual(
+            calculator.working_time_between(
+                submit_date, submit_date + datetime.timedelta(days=9)
+            ),
+            datetime.timedelta(days=9),
+        )
+
+    def test_union_and_intersection(self):
+        """Test combining schedules into a single merged table."""
+        early = WorkSchedule.from_hours(7, 15)
+        late = WorkSchedule.from_hours(11, 19)
+        self.assertEqual(early | late, WorkSchedule.from_hours(7, 19))
+        self.assertEqual(early & late, WorkSchedule.from_hours(11, 15))
+        self.assertEqual(
+            (early & late).description,
+            "7AM to 3PM, Monday to Friday and 11AM to 7PM, Monday to Friday",
+        )
+        with self.assertRaises(ValueError) as cm:
+            early & WorkSchedule.from_hours(9, 17, [5, 6])
+        self.assertEqual(str(cm.exception), "Work schedule must contain working time")
+
+    def test_shift(self):
+        """Test moving working hours wraps around the end of the week."""
+        schedule = WorkSchedule.from_hours(9, 17).shift(datetime.timedelta(hours=-10))
+        # Sunday 11 PM to Monday 7 AM is split at the end of the week
+        self.assertEqual(
+            schedule.intervals,
+            [(0, 7 * HOUR)]
+            + [((24 * day - 1) * HOUR, (24 * day + 7) * HOUR) for day in range(1, 5)]
+            + [((6 * 24 + 23) * HOUR, 7 * 24 * HOUR)],
+        )
+
+    def test_follow_the_sun(self):
+        """Test the union of regional schedules in UTC."""
+        winter = datetime.date(2025, 1, 15)
+        regions = [
+            WorkSchedule.from_hours(9, 17).to_utc(time_zone, winter)
+            for time_zone in ("Asia/Singapore", "Europe/London", "America/New_York")
+        ]
+        coverage = regions[0] | regions[1] | regions[2]
+        # 1 AM to 10 PM UTC, Monday to Friday
+        self.assertEqual(coverage, WorkSchedule.from_hours(1, 22))
+        calculator = DueDateCalculator(coverage, time_zone=datetime.timezone.utc)
+        # Friday 4 PM in New York, handed over to Singapore on Monday morning
+        new_york = ZoneInfo("America/New_York")
+        submit_date = datetime.datetime(2025, 1, 17, 16, 0, tzinfo=new_york)
+        self.assertEqual(
+            calculator.calculate_due_date(submit_date, 3),
+            datetime.datetime(2025, 1, 19, 22, 0, tzinfo=new_york),
+        )
+
+    def test_to_utc_around_daylight_saving_change(self):
+        """Test schedules moved to UTC use the offset of their day only."""
+        london = WorkSchedule.from_hours(9, 17)
+        # London moves to summer time on Sunday March 30th 2025
+        before = london.to_utc("Europe/London", datetime.date(2025, 3, 29))
+        after = london.to_utc("Europe/London", datetime.date(2025, 3, 31))
+        self.assertEqual(before, WorkSchedule.from_hours(9, 17))
+        self.assertEqual(after, WorkSchedule.from_hours(8, 16))
+
+        # 8:30 AM UTC is 8:30 AM in London on Friday the 28th, before opening,
+        # and 9:30 AM on Monday the 31st. Each schedule is only right on its
+        # own side of the change
+        utc = datetime.timezone.utc
+        submit_dates = [
+            datetime.datetime(2025, 3, 28, 8, 30, tzinfo=utc),
+            datetime.datetime(2025, 3, 31, 8, 30, tzinfo=utc),
+        ]
+        self.assertEqual(
+            list(
+                DueDateCalculator(before, time_zone=utc).validate_many(
+                    submit_dates, [1, 1]
+                )
+            ),
+            [REASON_OFF_HOURS, REASON_OFF_HOURS],
+        )
+        self.assertEqual(
+            list(
+                DueDateCalculator(after, time_zone=utc).validate_many(
+                    submit_dates, [1, 1]
+                )
+            ),
+            [REASON_VALID, REASON_VALID],
+        )
+
+    def test_invalid_weekday(self):
+        """Test with a weekday out of range."""
+        with self.assertRaises(ValueError) as cm:
+            WorkSchedule({7: [(datetime.time(9), datetime.time(17))]})
+        self.assertEqual(
+            str(cm.exception), "Weekday must be between 0 (Monday) and 6 (Sunday)"
+        )
+
+    def test_empty_schedule(self):
+        """Test with a schedule without working time."""
+        with self.assertRaises(ValueError) as cm:
+            WorkSchedule({})
+        self.assertEqual(str(cm.exception), "Work schedule must contain working time")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import os
+import tempfile
+import unittest
+import datetime
+from due_date_calculator import (
+    CalendarLayer,
+    CalendarSnapshot,
+    DueDateCalculator,
+    FixedDate,
+    RuleCalendar,
+    WorkSchedule,
+)
+
+
+class TestCalendarSnapshot(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, "calendar.snapshot")
+        cls.holidays = CalendarLayer(
+            RuleCalendar([FixedDate(12, 25)], years=range(1970, 2101)),
+            closures={
+                datetime.date(2025, 3, 19): [(datetime.time(12), datetime.time(14))]
+            },
+        )
+        cls.calculator = DueDateCalculator(
+            WorkSchedule.from_hours(8, 16),
+            holidays=cls.holidays,
+            engine="daily",
+            time_zone="Europe/Budapest",
+        )
+        CalendarSnapshot.write(cls.calculator, cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def setUp(self):
+        self.snapshot = CalendarSnapshot.load(self.path)
+
+    def test_same_results_with_every_engine(self):
+        """Test calculators built from a snapshot match the original."""
+        submit_date = datetime.datetime(2025, 3, 18, 10, 0)
+        for engine in ("weekly", "bitmap", "daily"):
+            calculator = self.snapshot.build(engine)
+            for hours in (1, 8, 12, 500):
+                self.assertEqual(
+                    calculator.calculate_due_date(submit_date, hours),
+                    self.calculator.calculate_due_date(submit_date, hours),
+                )
+            self.assertEqual(
+                calculator.to_work_ordinal(submit_date),
+                self.calculator.to_work_ordinal(submit_date),
+            )
+
+    def test_options(self):
+        """Test the working hours and options of the calculator are kept."""
+        calculator = self.snapshot.build()
+        self.assertEqual(calculator.schedule, self.calculator.schedule)
+        self.assertEqual(
+            calculator.schedule.description, "8AM to 4PM, Monday to Friday"
+        )
+        self.assertEqual(calculator.engine, "daily")
+        self.assertEqual(calculator.time_zone.key, "Europe/Budapest")
+        self.assertTrue(calculator.holidays.is_holiday(datetime.date(2030, 12, 25)))
+
+    def test_shared_between_calculators(self):
+        """Test calculators of a snapshot share its day index and bitmaps."""
+        first, second = self.snapshot.build(), self.snapshot.build()
+        self.assertIsNot(first, second)
+        self.assertIs(first.day_index, second.day_index)
+        self.assertIs(first.holidays, self.snapshot.holidays)
+        self.assertIsInstance(self.snapshot.day_index.index, memoryview)
+
+    def test_bitmaps_skipped(self):
+        """Test snapshots of working hours off whole minutes say they have no bitmaps."""
+        path = os.path.join(self.directory.name, "seconds.snapshot")
+        schedule = WorkSchedule({0: [(datetime.time(9, 0, 30), datetime.time(17))]})
+        CalendarSnapshot.write(DueDateCalculator(schedule), path)
+        snapshot = CalendarSnapshot.load(path)
+        message = "Bitmap engine requires working hours on whole minutes"
+        self.assertEqual(snapshot.bitmaps_skipped, message)
+        self.assertIsNone(snapshot.bitmap_engine)
+        self.assertIsNone(self.snapshot.bitmaps_skipped)
+        with self.assertRaises(ValueError) as cm:
+            snapshot.build("bitmap")
+        self.assertEqual(str(cm.exception), message)
+        self.assertEqual(
+            snapshot.build("daily").calculate_due_date(
+                datetime.datetime(2025, 3, 10, 16, 0), 2
+            ),
+            datetime.datetime(2025, 3, 17, 10, 0, 30),
+        )
+
+    def test_read_only(self):
+        """Test snapshot calendars change through layers only."""
+        with self.assertRaises(ValueError) as cm:
+            self.snapshot.holidays.update([datetime.date(2025, 3, 20)])
+        self.assertEqual(
+            str(cm.exception),
+            "Snapshot calendars cannot change, layer the changes on them instead",
+        )
+        layer = CalendarLayer(
+            self.snapshot.holidays, holidays=[datetime.date(2025, 3, 20)]
+        )
+        self.assertEqual(
+            DueDateCalculator(
+                WorkSchedule.from_hours(8, 16), holidays=layer
+            ).calculate_due_date(datetime.datetime(2025, 3, 19, 15, 0), 2),
+            datetime.datetime(2025, 3, 21, 9, 0),
+        )
+
+    def test_invalid_file(self):
+        """Test files that are not snapshots are rejected."""
+        path = os.path.join(self.directory.name, "other.snapshot")
+        with open(path, "wb") as snapshot_file:
+            snapshot_file.write(b"not a snapshot")
+        with self.assertRaises(ValueError) as cm:
+            CalendarSnapshot.load(path)
+        self.assertEqual(str(cm.exception), "File is not a calendar snapshot")
+
+    def test_unsupported_version(self):
+        """Test snapshots of other format versions are rejected."""
+        path = os.path.join(self.directory.name, "version.snapshot")
+        CalendarSnapshot.write(self.calculator, path)
+        with open(path, "r+b") as snapshot_file:
+            snapshot_file.seek(8)
+            snapshot_file.write((99).to_bytes(4, "little"))
+        with self.assertRaises(ValueError) as cm:
+            CalendarSnapshot.load(path)
+        self.assertEqual(
+            str(cm.exception), "Calendar snapshot version 99 is not supported"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+import unittest
+import datetime
+from zoneinfo import ZoneInfo
+from due_date_calculator import DueDateCalculator, WorkSchedule
+from due_date_calculator.timezones import ZoneTransitions
+
+BUDAPEST = ZoneInfo("Europe/Budapest")
+NEW_YORK = ZoneInfo("America/New_York")
+
+
+class TestZoneTransitions(unittest.TestCase):
+    def setUp(self):
+        self.transitions = ZoneTransitions(BUDAPEST)
+
+    def test_transitions_of_year(self):
+        """Test the transitions of a year are found to the second."""
+        zone_year = self.transitions.get_year(2025)
+        self.assertEqual(
+            zone_year.transitions,
+            [
+                datetime.datetime(2025, 3, 30, 1, 0),
+                datetime.datetime(2025, 10, 26, 1, 0),
+            ],
+        )
+        self.assertIs(zone_year, self.transitions.get_year(2025))
+
+    def test_matches_zoneinfo(self):
+        """Test conversions agree with aware datetimes around transitions."""
+        start = datetime.datetime(2025, 3, 29, 22, 0)
+        for minutes in range(0, 8 * 60, 15):
+            for wall in (
+                start + datetime.timedelta(minutes=minutes),
+                start + datetime.timedelta(days=210, minutes=minutes),
+            ):
+                for fold in (0, 1):
+                    expected = (
+                        wall.replace(tzinfo=BUDAPEST, fold=fold)
+                        .astimezone(datetime.timezone.utc)
+                        .replace(tzinfo=None)
+                    )
+                    utc = self.transitions.to_utc(wall, fold)
+                    self.assertEqual(utc, expected)
+                    aware = utc.replace(tzinfo=datetime.timezone.utc).astimezone(
+                        BUDAPEST
+                    )
+                    self.assertEqual(
+                        self.transitions.to_local(utc),
+                        (aware.replace(tzinfo=None), aware.fold),
+                    )
+
+
+class TestTimeZoneCalculator(unittest.TestCase):
+    def setUp(self):
+        self.calculator = DueDateCalculator(time_zone="Europe/Budapest")
+        self.always = DueDateCalculator(WorkSchedule.from_hours(0, 24, range(7)))
+
+    def test_aware_submit_date_in_other_time_zone(self):
+        """Test working hours apply in the calculator's time zone."""
+        # The US is already on summer time, Europe is not: 10 AM in New York
+        # is 3 PM in Budapest, due 2 hours later at 5 PM (noon in New York)
+        submit_date = datetime.datetime(2025, 3, 14, 10, 0, tzinfo=NEW_YORK)
+        due_date = self.calculator.calculate_due_date(submit_date, 2)
+        self.assertEqual(
+            due_date, datetime.datetime(2025, 3, 14, 12, 0, tzinfo=NEW_YORK)
+        )
+        self.assertIs(due_date.tzinfo, NEW_YORK)
+
+    def test_off_hours_in_calculator_time_zone(self):
+        """Test aware submit dates outside local working hours are rejected."""
+        # 4 AM in New York is 9 AM in Budapest, due at 5 PM (noon in New
+        # York), 3 AM is 8 AM
+        results = self.calculator.calculate_due_dates(
+            [
+                (datetime.datetime(2025, 3, 14, 4, 0, tzinfo=NEW_YORK), 8),
+                (datetime.datetime(2025, 3, 14, 3, 0, tzinfo=NEW_YORK), 8),
+            ]
+        )
+        self.assertEqual(
+            results[0], datetime.datetime(2025, 3, 14, 12, 0, tzinfo=NEW_YORK)
+        )
+        self.assertIsInstance(results[1], ValueError)
+
+    def test_working_hours_in_wall_time_across_transition(self):
+        """Test a working day has the same hours on a day the clocks change."""
+        # Friday 9 AM to Monday 9 AM after the clocks went forward on Sunday
+        start = datetime.datetime(2025, 3, 28, 9, 0, tzinfo=BUDAPEST)
+        end = datetime.datetime(2025, 3, 31, 9, 0, tzinfo=BUDAPEST)
+        self.assertEqual(
+            self.calculator.working_time_between(start, end),
+            datetime.timedelta(hours=8),
+        )
+        self.assertEqual(
+            self.always.working_time_between(start, end),
+            datetime.timedelta(hours=72),
+        )
+
+    def test_nonexistent_due_date(self):
+        """Test due dates in the gap of a forward transition move forward."""
+        # 2:30 AM does not exist on March 30th 2025 in Budapest
+        submit_date = datetime.datetime(2025, 3, 30, 1, 30, tzinfo=BUDAPEST)
+        due_date = self.always.calculate_due_date(submit_date, 1)
+        self.assertEqual(
+            due_date, datetime.datetime(2025, 3, 30, 3, 30, tzinfo=BUDAPEST)
+        )
+        self.assertEqual(due_date.utcoffset(), datetime.timedelta(hours=2))
+
+    def test_ambiguous_due_date(self):
+        """Test ambiguous due dates are the first of the two instants."""
+        # 2:30 AM happens twice on October 26th 2025 in Budapest
+        submit_date = datetime.datetime(2025, 10, 26, 1, 30, tzinfo=BUDAPEST)
+        due_date = self.always.calculate_due_date(submit_date, 1)
+        self.assertEqual(due_date.fold, 0)
+        self.assertEqual(due_date.utcoffset(), datetime.timedelta(hours=2))
+        # The second 2:30 AM is a different submit date
+        submit_date = submit_date.replace(hour=2, minute=30, fold=1)
+        due_date = self.always.calculate_due_date(submit_date, 1)
+        self.assertEqual(
+            due_date, datetime.datetime(2025, 10, 26, 3, 30, tzinfo=BUDAPEST)
+        )
+
+    def test_latest_submit_for_aware_due_date(self):
+        """Test the latest submit date is in the time zone of the due date."""
+        due_date = datetime.datetime(2025, 3, 17, 10, 0, tzinfo=NEW_YORK)
+        self.assertEqual(
+            self.calculator.latest_submit_for(due_date, 8),
+            datetime.datetime(2025, 3, 14, 10, 0, tzinfo=NEW_YORK),
+        )
+
+    def test_work_ordinal_in_calculator_time_zone(self):
+        """Test work ordinals convert back to aware dates and times."""
+        submit_date = datetime.datetime(2025, 3, 14, 10, 0, tzinfo=NEW_YORK)
+        ordinal = self.calculator.to_work_ordinal(submit_date)
+        self.assertEqual(
+            self.calculator.from_work_ordinal(ordinal),
+            datetime.datetime(2025, 3, 14, 15, 0, tzinfo=BUDAPEST),
+        )
+
+    def test_intersection_in_different_time_zones(self):
+        """Test calculators in different time zones cannot be intersected."""
+        new_york = DueDateCalculator(time_zone=NEW_YORK)
+        with self.assertRaises(ValueError) as cm:
+            self.calculator.intersection(new_york)
+        self.assertEqual(
+            str(cm.exception),
+            "Calculators in different time zones must be moved to UTC to be intersected",
+        )
+        self.assertIs(self.always.intersection(new_york).time_zone, NEW_YORK)
+
+    def test_naive_dates_are_wall_time(self):
+        """Test naive dates and times are taken as wall time."""
+        submit_date = datetime.datetime(2025, 3, 14, 15, 0)
+        self.assertEqual(
+            self.calculator.calculate_due_date(submit_date, 2),
+            datetime.datetime(2025, 3, 14, 17, 0),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,305 @@
+import time
+import unittest
+import datetime
+from fractions import Fraction
+from zoneinfo import ZoneInfo
+from due_date_calculator import (
+    REASON_NEGATIVE_TURNAROUND,
+    REASON_OFF_HOURS,
+    REASON_VALID,
+    DueDateCalculator,
+    HolidayCalendar,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+else:
+    from due_date_calculator import vectorized
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestVectorizedCalculator(unittest.TestCase):
+    def setUp(self):
+        self.calculator = DueDateCalculator()
+
+    def test_matches_scalar_engine(self):
+        """Test the vectorized engine gives the same due dates as the scalar one."""
+        submit_dates = [
+            datetime.datetime(2025, 3, 10, 9, 0),  # Monday 9 AM
+            datetime.datetime(2025, 3, 10, 14, 0),  # Monday 2 PM
+            datetime.datetime(2025, 3, 11, 14, 12),  # Tuesday 2:12 PM
+            datetime.datetime(2025, 3, 14, 14, 0),  # Friday 2 PM
+            datetime.datetime(2025, 3, 10, 16, 59, 30),  # Monday 4:59:30 PM
+            datetime.datetime(2025, 3, 10, 17, 0),  # Monday 5 PM
+            datetime.datetime(2025, 3, 10, 10, 0),  # Monday 10 AM
+        ]
+        turnarounds = [4, 6, 16, 9, 8, 3, 2000]
+        due_dates = vectorized.calculate_due_dates(
+            np.array(submit_dates, dtype="datetime64[s]"), np.array(turnarounds)
+        )
+        expected = [
+            self.calculator.calculate_due_date(submit_date, turnaround)
+            for submit_date, turnaround in zip(submit_dates, turnarounds)
+        ]
+        self.assertEqual(due_dates.tolist(), expected)
+
+    def test_fractional_turnaround(self):
+        """Test with fractional turnaround times."""
+        submit_dates = np.array(["2025-03-10T14:00"] * 2, dtype="datetime64[s]")
+        due_dates = vectorized.calculate_due_dates(submit_dates, np.array([1.5, 8.25]))
+        expected = np.array(
+            ["2025-03-10T15:30", "2025-03-11T14:15"], dtype="datetime64[us]"
+        )
+        np.testing.assert_array_equal(due_dates, expected)
+
+    def test_timedelta_turnaround(self):
+        """Test with turnaround times given as timedelta64."""
+        submit_dates = np.array(["2025-03-10T16:30:00.000250"], dtype="datetime64[us]")
+        due_dates = vectorized.calculate_due_dates(
+            submit_dates, np.array([90], dtype="timedelta64[m]")
+        )
+        expected = np.array(["2025-03-11T10:00:00.000250"], dtype="datetime64[us]")
+        np.testing.assert_array_equal(due_dates, expected)
+
+    def test_invalid_entries_are_nat(self):
+        """Test off-hours submits and negative turnarounds give NaT."""
+        submit_dates = np.array(
+            [
+                "2025-03-10T08:00",  # Monday 8 AM
+                "2025-03-15T10:00",  # Saturday 10 AM
+                "2025-03-10T14:00",  # Monday 2 PM
+                "2025-03-10T14:00",  # Monday 2 PM
+            ],
+            dtype="datetime64[s]",
+        )
+        due_dates = vectorized.calculate_due_dates(
+            submit_dates, np.array([8, 8, -5, 2])
+        )
+        self.assertEqual(np.isnat(due_dates).tolist(), [True, True, True, False])
+        self.assertEqual(due_dates[3], np.datetime64("2025-03-10T16:00"))
+
+    def test_due_date_after_latest_supported_date_is_nat(self):
+        """Test due dates after datetime.max give NaT."""
+        submit_dates = np.array(["9999-12-31T16:00"] * 2, dtype="datetime64[s]")
+        due_dates = vectorized.calculate_due_dates(submit_dates, np.array([1, 2]))
+        self.assertEqual(due_dates[0], np.datetime64("9999-12-31T17:00"))
+        self.assertTrue(np.isnat(due_dates[1]))
+
+    def test_off_hours_policy(self):
+        """Test off-hours submit dates are rolled like in the scalar engine."""
+        submit_dates = [
+            datetime.datetime(2025, 3, 10, 8, 0),  # Monday 8 AM
+            datetime.datetime(2025, 3, 10, 18, 0),  # Monday 6 PM
+            datetime.datetime(2025, 3, 15, 10, 0),  # Saturday 10 AM
+        ]
+        for policy in ("roll_forward", "roll_backward"):
+            calculator = DueDateCalculator(off_hours_policy=policy)
+            due_dates = vectorized.calculate_due_dates(
+                np.array(submit_dates, dtype="datetime64[s]"), 4, calculator
+            )
+            expected = [
+                calculator.calculate_due_date(submit_date, 4)
+                for submit_date in submit_dates
+            ]
+            self.assertEqual(due_dates.tolist(), expected)
+
+    def test_holidays(self):
+        """Test holidays are skipped like in the scalar engine."""
+        holidays = HolidayCalendar(
+            [datetime.date(2025, 4, 18), datetime.date(2025, 4, 21)],
+            {datetime.date(2025, 4, 17): [(datetime.time(12), datetime.time(13))]},
+        )
+        calculator = DueDateCalculator(holidays=holidays)
+        submit_dates = [
+            datetime.datetime(2025, 4, 17, 9, 0),  # Thursday 9 AM
+            datetime.datetime(2025, 4, 17, 14, 0),  # Thursday 2 PM
+            datetime.datetime(2025, 4, 17, 12, 30),  # Thursday lunch closure
+            datetime.datetime(2025, 4, 18, 10, 0),  # Good Friday
+            datetime.datetime(2025, 4, 16, 16, 0),  # Wednesday 4 PM
+        ]
+        due_dates = vectorized.calculate_due_dates(
+            np.array(submit_dates, dtype="datetime64[s]"), 8, calculator
+        )
+        expected = calculator.calculate_due_dates(
+            [(submit_date, 8) for submit_date in submit_dates]
+        )
+        self.assertEqual(
+            due_dates[[0, 1, 4]].tolist(), [expected[i] for i in (0, 1, 4)]
+        )
+        self.assertEqual(np.isnat(due_dates[[2, 3]]).tolist(), [True, True])
+
+    def test_validate_many(self):
+        """Test array validation returns the same reason codes as the scalar one."""
+        submit_dates = np.array(
+            [
+                "2025-03-10T09:00",  # Monday 9 AM
+                "2025-03-10T17:00:30",  # Monday 5:00:30 PM
+                "2025-03-10T17:01",  # Monday 5:01 PM
+                "2025-03-15T10:00",  # Saturday 10 AM
+                "2025-03-10T14:00",  # Monday 2 PM
+            ],
+            dtype="datetime64[s]",
+        )
+        turnarounds = np.array([4, 1, 1, -1, -5])
+        reasons = vectorized.validate_many(submit_dates, turnarounds)
+        self.assertEqual(reasons.dtype, np.uint8)
+        self.assertEqual(
+            reasons.tolist(),
+            [
+                REASON_VALID,
+                REASON_VALID,
+                REASON_OFF_HOURS,
+                REASON_OFF_HOURS,
+                REASON_NEGATIVE_TURNAROUND,
+            ],
+        )
+        self.assertEqual(
+            reasons.tolist(),
+            list(
+                self.calculator.validate_many(
+                    submit_dates.tolist(), turnarounds.tolist()
+                )
+            ),
+        )
+
+    def test_to_work_ordinals_matches_scalar_engine(self):
+        """Test array work ordinals match the scalar conversion."""
+        date_times = [
+            datetime.datetime(2025, 3, 10, 9, 0),  # Monday 9 AM
+            datetime.datetime(2025, 3, 11, 14, 12, 30),  # Tuesday 2:12:30 PM
+            datetime.datetime(2025, 3, 14, 20, 0),  # Friday 8 PM
+            datetime.datetime(2025, 3, 15, 10, 0),  # Saturday 10 AM
+            datetime.datetime(1969, 12, 31, 12, 0),  # Wednesday noon
+        ]
+        ordinals = vectorized.to_work_ordinals(
+            np.array(date_times, dtype="datetime64[s]")
+        )
+        expected = [
+            self.calculator.to_work_ordinal(date_time) for date_time in date_times
+        ]
+        self.assertEqual(ordinals.tolist(), expected)
+
+    def test_working_time_between(self):
+        """Test working time elapsed between arrays of dates."""
+        starts = np.array(
+            ["2025-03-11T14:12", "2025-03-14T14:00"], dtype="datetime64[s]"
+        )
+        ends = np.array(["2025-03-13T14:12", "2025-03-17T15:00"], dtype="datetime64[s]")
+        elapsed = vectorized.working_time_between(starts, ends)
+        expected = np.array([16 * 3600, 9 * 3600], dtype="timedelta64[s]")
+        np.testing.assert_array_equal(elapsed, expected)
+
+    def test_time_zone(self):
+        """Test arrays are UTC instants for calculators with a time zone."""
+        calculator = DueDateCalculator(time_zone="Europe/Budapest")
+        submit_dates = [
+            datetime.datetime(2025, 3, 28, 14, 0),  # Friday 3 PM, before DST
+            datetime.datetime(2025, 10, 24, 13, 30),  # Friday 3:30 PM, in DST
+            datetime.datetime(2025, 3, 28, 8, 0),  # Friday 9 AM
+            datetime.datetime(2025, 12, 31, 15, 0),  # Wednesday 4 PM
+        ]
+        turnarounds = [8, 4, 100, 3]
+        utc_dates = np.array(submit_dates, dtype="datetime64[s]")
+        aware_dates = [
+            submit_date.replace(tzinfo=datetime.timezone.utc)
+            for submit_date in submit_dates
+        ]
+        due_dates = vectorized.calculate_due_dates(
+            utc_dates, np.array(turnarounds), calculator
+        )
+        expected = [
+            calculator.calculate_due_date(submit_date, turnaround)
+            .astimezone(datetime.timezone.utc)
+            .replace(tzinfo=None)
+            for submit_date, turnaround in zip(aware_dates, turnarounds)
+        ]
+        self.assertEqual(due_dates.tolist(), expected)
+        self.assertEqual(
+            vectorized.to_work_ordinals(utc_dates, calculator).tolist(),
+            [calculator.to_work_ordinal(date_time) for date_time in aware_dates],
+        )
+        # 4:01 PM UTC is 5:01 PM in Budapest in winter
+        self.assertEqual(
+            vectorized.validate_many(
+                np.array(["2025-03-10T15:00", "2025-03-10T16:01"], "datetime64[s]"),
+                1,
+                calculator,
+            ).tolist(),
+            [REASON_VALID, REASON_OFF_HOURS],
+        )
+
+    def test_huge_turnaround(self):
+        """Test turnaround times too long for int64 microseconds do not wrap."""
+        submit_dates = np.array(["2025-03-10T14:00"] * 3, dtype="datetime64[s]")
+        for turnarounds in (
+            np.array([2**62, -(2**62), 2]),
+            np.array([1e30, -1e30, 2.0]),
+            np.array([2**62, -(2**62), 7200], dtype="timedelta64[s]"),
+        ):
+            due_dates = vectorized.calculate_due_dates(submit_dates, turnarounds)
+            self.assertEqual(np.isnat(due_dates).tolist(), [True, True, False])
+            self.assertEqual(due_dates[2], np.datetime64("2025-03-10T16:00"))
+            self.assertEqual(
+                vectorized.validate_many(submit_dates, turnarounds).tolist(),
+                [REASON_VALID, REASON_NEGATIVE_TURNAROUND, REASON_VALID],
+            )
+
+    def test_batch_calculation_matches_scalar_engine(self):
+        """Test large batches give the same results and errors as single calls."""
+        calculator = DueDateCalculator(time_zone="Europe/Budapest")
+        zones = [None, ZoneInfo("Europe/Budapest"), ZoneInfo("America/New_York")]
+        turnarounds = [1, 8, Fraction(49, 3), 0.1, -5, 10**30, 2000]
+        requests = [
+            (
+                datetime.datetime(2025, 3, 24, 7, 0, tzinfo=zones[i % 3])
+                + datetime.timedelta(minutes=97 * i),
+                turnarounds[i % 7],
+            )
+            for i in range(3 * calculator.VECTORIZED_BATCH_SIZE)
+        ]
+        requests.append((datetime.datetime(9999, 12, 31, 16, 0), 2))
+
+        results = calculator.calculate_due_dates(requests)
+        self.assertEqual(len(results), len(requests))
+        for result, (submit_date, turnaround) in zip(results, requests):
+            try:
+                expected = calculator.calculate_due_date(submit_date, turnaround)
+            except (ValueError, OverflowError) as error:
+                self.assertIsInstance(result, type(error))
+                self.assertEqual(str(result), str(error))
+            else:
+                self.assertEqual(result, expected)
+                self.assertIs(result.tzinfo, expected.tzinfo)
+
+    def test_batch_calculation_is_faster(self):
+        """Test large batches are faster with the vectorized engine."""
+        # Every working hour of 500 weeks from Monday March 10th 2025
+        requests = [
+            (
+                datetime.datetime(2025, 3, 10, 9, 0)
+                + datetime.timedelta(weeks=i // 40, days=i // 8 % 5, hours=i % 8),
+                20,
+            )
+            for i in range(20000)
+        ]
+        looping = DueDateCalculator()
+        looping.VECTORIZED_BATCH_SIZE = len(requests) + 1
+
+        def best_of_three(calculator):
+            times = []
+            for _ in range(3):
+                start = time.perf_counter()
+                results = calculator.calculate_due_dates(requests)
+                times.append(time.perf_counter() - start)
+            return min(times), results
+
+        vectorized_time, results = best_of_three(self.calculator)
+        loop_time, expected = best_of_three(looping)
+        self.assertEqual(results, expected)
+        self.assertLess(vectorized_time * 2, loop_time)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import os
+import tempfile
+import time
+import unittest
+import datetime
+import json
+from due_date_calculator import CalendarConfig, CalendarWatcher
+
+# Submit Friday March 14th 2025 at 4 PM, due 2 hours later on Monday
+SUBMIT_DATE = datetime.datetime(2025, 3, 14, 16, 0)
+MONDAY_DUE_DATE = datetime.datetime(2025, 3, 17, 10, 0)
+TUESDAY_DUE_DATE = datetime.datetime(2025, 3, 18, 10, 0)
+
+
+class TestCalendarWatcher(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, "calendars.json")
+        self.write_config("2025-01-01")
+        self.watcher = CalendarWatcher(interval=0.01)
+        self.live = self.watcher.watch(
+            [self.path], lambda: CalendarConfig.load(self.path).build("company")
+        )
+
+    def write_config(self, holidays):
+        # Replace the file like deployment tools do, with a new inode
+        temporary_path = self.path + ".tmp"
+        with open(temporary_path, "w") as config_file:
+            json.dump(
+                {
+                    "calendars": {
+                        "company": {"hours": ["09:00", "17:00"], "holidays": [holidays]}
+                    }
+                },
+                config_file,
+            )
+        os.replace(temporary_path, self.path)
+
+    def test_reload_changed_calendar(self):
+        """Test a changed source is reloaded with a new version."""
+        first = self.live.calculate_due_date(SUBMIT_DATE, 2)
+        self.assertEqual(first.result, MONDAY_DUE_DATE)
+        self.assertEqual(self.watcher.check(), [])
+
+        # An emergency closure on Monday
+        self.write_config("2025-03-17")
+        self.assertEqual(self.watcher.check(), [self.live])
+        second = self.live.calculate_due_date(SUBMIT_DATE, 2)
+        self.assertEqual(second.result, TUESDAY_DUE_DATE)
+        self.assertNotEqual(second.version, first.version)
+        self.assertEqual(len(second.version), 16)
+
+    def test_unchanged_contents(self):
+        """Test rewriting the same contents keeps the calculator."""
+        calculator, version = self.live.current
+        self.write_config("2025-01-01")
+        self.assertEqual(self.watcher.check(), [])
+        self.assertIs(self.live.current.calculator, calculator)
+        self.assertEqual(self.live.version, version)
+
+    def test_batch_in_flight_during_swap(self):
+        """Test a batch running during a swap finishes on its version."""
+
+        def requests():
+            yield SUBMIT_DATE, 2
+            self.write_config("2025-03-17")
+            self.watcher.check()
+            yield SUBMIT_DATE, 2
+
+        version = self.live.version
+        results = self.live.calculate_due_dates(requests())
+        self.assertEqual(results.result, [MONDAY_DUE_DATE, MONDAY_DUE_DATE])
+        self.assertEqual(results.version, version)
+        self.assertNotEqual(self.live.version, version)
+
+    def test_failed_reload(self):
+        """Test an invalid source keeps the last good calendar."""
+        version = self.live.version
+        with self.assertLogs("due_date_calculator.watcher", "ERROR"):
+            self.write_config("not a date")
+            self.assertEqual(self.watcher.check(), [])
+        self.assertEqual(self.live.version, version)
+        self.assertIsInstance(self.live.error, ValueError)
+
+        self.write_config("2025-03-17")
+        self.assertEqual(self.watcher.check(), [self.live])
+        self.assertIsNone(self.live.error)
+
+    def test_background_thread(self):
+        """Test the background thread swaps changed calendars."""
+        with self.watcher:
+            self.write_config("2025-03-17")
+            deadline = time.monotonic() + 5
+            while (
+                self.live.calculate_due_date(SUBMIT_DATE, 2).result != TUESDAY_DUE_DATE
+                and time.monotonic() < deadline
+            ):
+                time.sleep(0.01)
+        self.assertEqual(
+            self.live.calculate_due_date(SUBMIT_DATE, 2).result, TUESDAY_DUE_DATE
+        )
+
+    def test_invalid_interval(self):
+        """Test watchers must poll after a positive interval."""
+        with self.assertRaises(ValueError) as cm:
+            CalendarWatcher(interval=0)
+        self.assertEqual(str(cm.exception), "Watch interval must be positive")
+
+
+if __name__ == "__main__":
+    unittest.main()